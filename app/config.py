@@ -15,10 +15,26 @@ class Settings(BaseSettings):
     challenge_ttl_seconds: int = 10
     challenge_default_difficulty: int = 2
     tick_hz: int = 5
+    path_mode: str = "astar"
+    path_planning_workers: int = 0
+    path_planning_pool_min_batch: int = 32
+    path_reservation_window: int = 16
+    path_block_wait_ticks: int = 0
+    path_block_detour_steps: int = 0
+    path_flow_field_ttl_ticks: int = 25
+    path_landmarks: int = 0
+    path_landmark_max_bytes: int = 0
+    tick_overrun_policy: str = "catch_up"
+    tick_max_catch_up: int = 3
     chunk_width: int = 50
     chunk_height: int = 50
     chunk_gc_ttl_seconds: int = 60
     sse_replay_max_events: int = 300
+    chunk_pregeneration_workers: int = 0
+    chunk_pregeneration_band: int = 8
+    chunk_cache_max_bytes: int = 64 * 1024 * 1024
+    chunk_cache_spill_dir: str = ""
+    chunk_cache_spill_max_bytes: int = 256 * 1024 * 1024
     sse_keepalive_seconds: int = 15
     enable_demo_actors: bool = True
 
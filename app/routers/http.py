@@ -36,8 +36,14 @@ def _is_dev_test_token(request: Request, token: str) -> bool:
 
 
 @router.get("/healthz")
-async def healthz() -> dict:
-    return {"status": "ok"}
+async def healthz(request: Request) -> dict:
+    engine = _services(request).tick_engine
+    return {
+        "status": "ok",
+        "tick": engine.tick_stats(),
+        "chunk_cache": engine.chunk_cache_stats(),
+        "pathfinding": engine.pathfinding_stats(),
+    }
 
 
 @router.post("/v1/signup", response_model=SignupResponse)
@@ -143,6 +149,7 @@ async def dev_agent_move_to(payload: DevMoveToRequest, request: Request) -> DevM
             server_cmd_id=server_cmd_id,
             target_x=payload.x,
             target_y=payload.y,
+            target_chunk_id=payload.chunk_id,
         )
     except TickEngineError as exc:
         return DevMoveToResponse(
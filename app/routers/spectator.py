@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import secrets
-from typing import Any, AsyncIterator, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Union
 
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 from app.services.auth_store import AuthError
 from app.services.container import ServiceContainer
+from app.services.event_frames import (
+    AgentFrame,
+    SpectatorFrame,
+    dump_json,
+    sse_frame_text,
+    typed_payload_json,
+    ws_frame_text,
+)
 from app.services.tick_engine import TickEngineError
 
 router = APIRouter()
@@ -39,13 +46,7 @@ def _is_dev_test_token(request: Request, token: str) -> bool:
 
 
 def _sse_frame(*, event: str, data: Dict[str, Any], event_id: Optional[str] = None) -> str:
-    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
-    lines = []
-    if event_id:
-        lines.append(f"id: {event_id}")
-    lines.append(f"event: {event}")
-    lines.append(f"data: {payload}")
-    return "\n".join(lines) + "\n\n"
+    return sse_frame_text(event=event, data_json=dump_json(data), event_id=event_id)
 
 
 @router.get("/v1/spectate/stream")
@@ -79,7 +80,7 @@ async def spectate_stream(
     keepalive = max(5, int(request.app.state.settings.sse_keepalive_seconds))
     channel_id = f"sse-{secrets.token_hex(4)}"
 
-    async def stream() -> AsyncIterator[str]:
+    async def stream() -> AsyncIterator[Union[str, bytes]]:
         try:
             yield _sse_frame(
                 event="session_ready",
@@ -101,12 +102,9 @@ async def spectate_stream(
                         "snapshot_url": f"/v1/chunks/{stream_chunk_id}/snapshot",
                     },
                 )
-                yield _sse_frame(
+                yield sse_frame_text(
                     event="chunk_static",
-                    data={
-                        "type": "chunk_static",
-                        **bootstrap["chunk_static"],
-                    },
+                    data_json=typed_payload_json("chunk_static", bootstrap["chunk_static_json"]),
                 )
                 yield _sse_frame(
                     event="chunk_delta",
@@ -117,18 +115,11 @@ async def spectate_stream(
                 )
             elif replay_events:
                 for item in replay_events:
-                    yield _sse_frame(
-                        event=str(item["event"]),
-                        data=dict(item["data"]),
-                        event_id=str(item["id"]),
-                    )
+                    yield item.sse
             else:
-                yield _sse_frame(
+                yield sse_frame_text(
                     event="chunk_static",
-                    data={
-                        "type": "chunk_static",
-                        **bootstrap["chunk_static"],
-                    },
+                    data_json=typed_payload_json("chunk_static", bootstrap["chunk_static_json"]),
                 )
                 yield _sse_frame(
                     event="chunk_delta",
@@ -142,7 +133,7 @@ async def spectate_stream(
                 if await request.is_disconnected():
                     break
                 try:
-                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                    event: SpectatorFrame = await asyncio.wait_for(queue.get(), timeout=keepalive)
                 except asyncio.TimeoutError:
                     yield _sse_frame(
                         event="heartbeat",
@@ -154,15 +145,8 @@ async def spectate_stream(
                     )
                     continue
 
-                event_name = str(event.get("event", "message"))
-                event_data = dict(event.get("data", {}))
-                event_id = event.get("id")
-                yield _sse_frame(
-                    event=event_name,
-                    data=event_data,
-                    event_id=str(event_id) if event_id else None,
-                )
-                if event_name == "chunk_closed":
+                yield event.sse
+                if event["event"] == "chunk_closed":
                     break
         finally:
             await services.tick_engine.unregister_spectator_listener(stream_chunk_id, queue)
@@ -190,7 +174,7 @@ async def owner_stream(
 
     try:
         await services.tick_engine.ensure_agent(agent_id)
-        static_payload = await services.tick_engine.chunk_static_payload(agent_id=agent_id)
+        static_json = await services.tick_engine.chunk_static_json(agent_id=agent_id)
         delta_payload = await services.tick_engine.chunk_delta_payload(agent_id=agent_id)
     except TickEngineError as exc:
         if exc.reason in {"agent_not_found", "chunk_not_found"}:
@@ -200,9 +184,9 @@ async def owner_stream(
     queue = await services.tick_engine.register_owner_listener(agent_id)
     keepalive = max(5, int(request.app.state.settings.sse_keepalive_seconds))
     channel_id = f"owner-sse-{secrets.token_hex(4)}"
-    current_chunk_id = str(static_payload.get("chunk_id") or "")
+    current_chunk_id = str(delta_payload.get("chunk_id") or "")
 
-    async def stream() -> AsyncIterator[str]:
+    async def stream() -> AsyncIterator[Union[str, bytes]]:
         nonlocal current_chunk_id
         try:
             yield _sse_frame(
@@ -215,26 +199,15 @@ async def owner_stream(
                     "channel_id": channel_id,
                 },
             )
-            yield _sse_frame(
-                event="chunk_static",
-                data={
-                    "type": "chunk_static",
-                    **static_payload,
-                },
-            )
-            yield _sse_frame(
-                event="chunk_delta",
-                data={
-                    "type": "chunk_delta",
-                    **delta_payload,
-                },
-            )
+            # Agent frames keep their WebSocket envelope on the owner stream.
+            yield sse_frame_text(event="chunk_static", data_json=ws_frame_text("chunk_static", static_json))
+            yield sse_frame_text(event="chunk_delta", data_json=ws_frame_text("chunk_delta", dump_json(delta_payload)))
 
             while True:
                 if await request.is_disconnected():
                     break
                 try:
-                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                    frame: AgentFrame = await asyncio.wait_for(queue.get(), timeout=keepalive)
                 except asyncio.TimeoutError:
                     yield _sse_frame(
                         event="heartbeat",
@@ -247,20 +220,14 @@ async def owner_stream(
                     )
                     continue
 
-                event_name = str(event.get("type", "message"))
-                payload = dict(event.get("payload", {}))
+                event_name = frame["type"]
+                payload = frame["payload"]
                 if event_name == "chunk_transition":
                     current_chunk_id = str(payload.get("to_chunk_id") or current_chunk_id)
                 elif event_name in {"chunk_static", "chunk_delta"}:
                     current_chunk_id = str(payload.get("chunk_id") or current_chunk_id)
 
-                yield _sse_frame(
-                    event=event_name,
-                    data={
-                        "type": event_name,
-                        **payload,
-                    },
-                )
+                yield frame.sse
         finally:
             await services.tick_engine.unregister_owner_listener(agent_id, queue)
 
@@ -274,7 +241,7 @@ async def owner_stream(
 
 @router.get("/v1/chunks/{chunk_id}/snapshot")
 @router.get("/api/v1/chunks/{chunk_id}/snapshot", include_in_schema=False)
-async def chunk_snapshot(request: Request, chunk_id: str) -> JSONResponse:
+async def chunk_snapshot(request: Request, chunk_id: str) -> Response:
     services = _services(request)
     token = _extract_bearer_token(request)
     resolved_chunk_id = _resolve_chunk_id(request, chunk_id)
@@ -287,10 +254,10 @@ async def chunk_snapshot(request: Request, chunk_id: str) -> JSONResponse:
             raise HTTPException(status_code=403, detail="invalid_scope")
 
     try:
-        payload = await services.tick_engine.chunk_snapshot_payload(chunk_id=resolved_chunk_id)
+        payload_json = await services.tick_engine.chunk_snapshot_json(chunk_id=resolved_chunk_id)
     except TickEngineError as exc:
         if exc.reason == "chunk_not_found":
             raise HTTPException(status_code=404, detail=exc.reason) from exc
         raise HTTPException(status_code=400, detail=exc.reason) from exc
 
-    return JSONResponse(payload)
+    return Response(content=payload_json, media_type="application/json")
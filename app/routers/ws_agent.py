@@ -7,6 +7,7 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.schemas.ws import CommandAnswerPayload, CommandReqPayload, WsEnvelope
 from app.services.auth_store import AuthError
 from app.services.container import ServiceContainer
+from app.services.event_frames import AgentFrame, ws_frame_text
 from app.services.tick_engine import TickEngineError
 
 router = APIRouter()
@@ -23,6 +24,10 @@ async def _send(websocket: WebSocket, message_type: str, payload: Dict[str, Any]
     await websocket.send_json({"type": message_type, "payload": payload})
 
 
+async def _send_json_payload(websocket: WebSocket, message_type: str, payload_json: str) -> None:
+    await websocket.send_text(ws_frame_text(message_type, payload_json))
+
+
 async def _send_with_owner_mirror(
     *,
     websocket: WebSocket,
@@ -32,21 +37,16 @@ async def _send_with_owner_mirror(
     payload: Dict[str, Any],
     mirror_owner: bool,
 ) -> None:
-    await _send(websocket, message_type, payload)
+    frame = AgentFrame(message_type, dict(payload))
+    await websocket.send_text(frame.ws_text)
     if mirror_owner:
-        await services.tick_engine.emit_owner_event(
-            agent_id,
-            {
-                "type": message_type,
-                "payload": dict(payload),
-            },
-        )
+        await services.tick_engine.emit_owner_event(agent_id, frame)
 
 
 async def _wait_for_client_or_engine(
     websocket: WebSocket,
     event_queue: asyncio.Queue,
-) -> Tuple[str, Dict[str, Any]]:
+) -> Tuple[str, Any]:
     recv_task = asyncio.create_task(websocket.receive_json())
     event_task = asyncio.create_task(event_queue.get())
     done, pending = await asyncio.wait({recv_task, event_task}, return_when=asyncio.FIRST_COMPLETED)
@@ -90,10 +90,10 @@ async def agent_ws(websocket: WebSocket, agent_id: str) -> None:
             "role": "agent",
         },
     )
-    await _send(
+    await _send_json_payload(
         websocket,
         "chunk_static",
-        await services.tick_engine.chunk_static_payload(agent_id=agent_id),
+        await services.tick_engine.chunk_static_json(agent_id=agent_id),
     )
     await _send(
         websocket,
@@ -105,7 +105,7 @@ async def agent_ws(websocket: WebSocket, agent_id: str) -> None:
         while True:
             source, raw = await _wait_for_client_or_engine(websocket, event_queue)
             if source == "engine":
-                await websocket.send_json(raw)
+                await websocket.send_text(raw.ws_text)
                 continue
 
             envelope = WsEnvelope.model_validate(raw)
@@ -270,12 +270,14 @@ async def agent_ws(websocket: WebSocket, agent_id: str) -> None:
                     pending_commands.pop(answer.server_cmd_id, None)
                     continue
 
+                target_chunk_id = cmd_payload.get("chunk_id")
                 try:
                     started_tick = await services.tick_engine.submit_move_command(
                         agent_id=agent_id,
                         server_cmd_id=answer.server_cmd_id,
                         target_x=int(cmd_payload.get("x", -1)),
                         target_y=int(cmd_payload.get("y", -1)),
+                        target_chunk_id=str(target_chunk_id) if target_chunk_id is not None else None,
                     )
                 except (ValueError, TypeError):
                     pending_commands.pop(answer.server_cmd_id, None)
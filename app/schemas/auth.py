@@ -46,6 +46,7 @@ class DevMoveToRequest(BaseModel):
     agent_id: str = Field(min_length=1, max_length=128)
     x: int
     y: int
+    chunk_id: Optional[str] = Field(default=None, max_length=128)
 
 
 class DevMoveToResponse(BaseModel):
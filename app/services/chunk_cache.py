@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from app.services.chunk_generation_np import generate_chunk_mask
+
+# (width, height, seed, required_edges, root_layout): every input of generate_chunk_tiles.
+ChunkKey = Tuple[int, int, int, FrozenSet[str], bool]
+
+
+def chunk_key(
+    *,
+    width: int,
+    height: int,
+    seed: int,
+    required_edges: Iterable[str],
+    root_layout: bool = False,
+) -> ChunkKey:
+    return (width, height, seed, frozenset(required_edges), root_layout)
+
+
+@dataclass
+class ChunkCacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    spills: int = 0
+    spill_removals: int = 0
+
+
+class ChunkTileCache:
+    """
+    LRU cache of generated walkability masks, bounded by `max_bytes`.
+
+    Chunk generation is a pure function of the key, so a chunk that was
+    collected and is revisited can reuse its mask. With `spill_dir` set, evicted
+    masks are written there zlib-compressed (0/1 bytes shrink well) and read
+    back on a later miss instead of regenerating; the oldest files are removed
+    once the directory holds more than `spill_max_bytes`.
+
+    Inside a running event loop the cache never touches the disk on the
+    caller's stack: evictions are written after the current callback on a
+    spill thread, and spilled masks come back through `prefetch`. Without a
+    loop (scripts, tests) spill I/O happens inline.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        spill_dir: Optional[str] = None,
+        spill_max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self.spill_dir = spill_dir or None
+        self.spill_max_bytes = max(0, spill_max_bytes)
+        self.stats = ChunkCacheStats()
+        self._entries: "OrderedDict[ChunkKey, bytes]" = OrderedDict()
+        self._bytes = 0
+        # Evicted masks not written yet; still served from memory meanwhile.
+        self._unwritten: Dict[ChunkKey, bytes] = {}
+        self._flush_scheduled = False
+        self._prefetching: Set[ChunkKey] = set()
+        self._spill_executor: Optional[ThreadPoolExecutor] = None
+        # Spill file path -> compressed size, least recently used first. Shared
+        # with the spill thread, hence the lock.
+        self._spill_lock = threading.Lock()
+        self._spill_files: "OrderedDict[str, int]" = OrderedDict()
+        self._spill_bytes = 0
+        if self.spill_dir is not None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self._scan_spill_dir()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def get(self, key: ChunkKey) -> Optional[bytearray]:
+        mask = self._entries.get(key)
+        if mask is not None:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return bytearray(mask)
+
+        mask = self._unwritten.get(key)
+        if mask is not None:
+            self.stats.hits += 1
+        elif not _loop_running():
+            # Inside a loop, spilled masks come back only through prefetch.
+            mask = self._read_spill(key)
+            if mask is not None:
+                self.stats.disk_hits += 1
+        if mask is not None:
+            self._store(key, mask)
+            return bytearray(mask)
+
+        self.stats.misses += 1
+        return None
+
+    def prefetch(self, key: ChunkKey) -> bool:
+        """
+        Start reading a spilled mask back into memory on the spill thread.
+        Returns True if the mask is on disk and is (being) loaded, so the
+        caller can skip generating it; a later `get` then hits memory.
+        """
+        if key in self._entries or key in self._unwritten:
+            return False
+        path = self._spill_path(key)
+        if path is None:
+            return False
+        if key in self._prefetching:
+            return True
+        with self._spill_lock:
+            if path not in self._spill_files:
+                return False
+        self._prefetching.add(key)
+        future = asyncio.get_running_loop().run_in_executor(self._spill_thread(), self._read_spill, key)
+        future.add_done_callback(functools.partial(self._prefetched, key))
+        return True
+
+    def put(self, key: ChunkKey, mask: bytes) -> None:
+        self._store(key, bytes(mask))
+
+    def get_or_generate(
+        self,
+        *,
+        width: int,
+        height: int,
+        seed: int,
+        required_edges: Iterable[str],
+        root_layout: bool = False,
+    ) -> bytearray:
+        key = chunk_key(
+            width=width,
+            height=height,
+            seed=seed,
+            required_edges=required_edges,
+            root_layout=root_layout,
+        )
+        mask = self.get(key)
+        if mask is not None:
+            return mask
+        mask = generate_chunk_mask(
+            width=width,
+            height=height,
+            seed=seed,
+            required_edges=key[3],
+            root_layout=root_layout,
+        )
+        self.put(key, mask)
+        return mask
+
+    def close(self) -> None:
+        """
+        Finish every queued spill write and stop the spill thread. Evictions
+        not handed to the thread yet are written inline. A later spill starts
+        a new thread.
+        """
+        if self._spill_executor is not None:
+            self._spill_executor.shutdown(wait=True)
+            self._spill_executor = None
+        if self._unwritten:
+            self._write_spills(list(self._unwritten.items()))
+            self._unwritten.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = self.stats
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": stats.hits,
+            "disk_hits": stats.disk_hits,
+            "misses": stats.misses,
+            "evictions": stats.evictions,
+            "spills": stats.spills,
+            "spill_files": len(self._spill_files),
+            "spill_bytes": self._spill_bytes,
+            "spill_max_bytes": self.spill_max_bytes,
+            "spill_removals": stats.spill_removals,
+        }
+
+    def _store(self, key: ChunkKey, mask: bytes) -> None:
+        if len(mask) > self.max_bytes:
+            self._spill(key, mask)
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = mask
+        self._bytes += len(mask)
+        while self._bytes > self.max_bytes:
+            old_key, old_mask = self._entries.popitem(last=False)
+            self._bytes -= len(old_mask)
+            self.stats.evictions += 1
+            self._spill(old_key, old_mask)
+
+    def _spill(self, key: ChunkKey, mask: bytes) -> None:
+        if self.spill_dir is None:
+            return
+        if not _loop_running():
+            self._write_spills([(key, mask)])
+            return
+        self._unwritten[key] = mask
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush_spills)
+
+    def _flush_spills(self) -> None:
+        self._flush_scheduled = False
+        batch = list(self._unwritten.items())
+        if not batch:
+            return
+        future = asyncio.get_running_loop().run_in_executor(self._spill_thread(), self._write_spills, batch)
+        future.add_done_callback(functools.partial(self._spills_written, batch))
+
+    def _spills_written(self, batch: List[Tuple[ChunkKey, bytes]], future: "asyncio.Future[None]") -> None:
+        if not future.cancelled():
+            future.exception()
+        for key, mask in batch:
+            if self._unwritten.get(key) is mask:
+                del self._unwritten[key]
+
+    def _prefetched(self, key: ChunkKey, future: "asyncio.Future[Optional[bytes]]") -> None:
+        self._prefetching.discard(key)
+        if future.cancelled() or future.exception() is not None:
+            return
+        mask = future.result()
+        if mask is not None and key not in self._entries:
+            self.stats.disk_hits += 1
+            self._store(key, mask)
+
+    def _spill_thread(self) -> ThreadPoolExecutor:
+        # One thread keeps spill writes, removals and reads in order.
+        if self._spill_executor is None:
+            self._spill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunk-spill")
+        return self._spill_executor
+
+    def _spill_path(self, key: ChunkKey) -> Optional[str]:
+        if self.spill_dir is None:
+            return None
+        width, height, seed, edges, root_layout = key
+        name = f"{width}x{height}-{seed:016x}-{''.join(sorted(edges)) or '_'}-{int(root_layout)}.bin"
+        return os.path.join(self.spill_dir, name)
+
+    def _scan_spill_dir(self) -> None:
+        found = []
+        for name in os.listdir(self.spill_dir):
+            path = os.path.join(self.spill_dir, name)
+            try:
+                if name.endswith(".tmp"):
+                    os.remove(path)
+                elif name.endswith(".bin"):
+                    info = os.stat(path)
+                    found.append((info.st_mtime, path, info.st_size))
+            except OSError:
+                continue
+        for _mtime, path, size in sorted(found):
+            self._spill_files[path] = size
+            self._spill_bytes += size
+        self._trim_spill_dir()
+
+    def _write_spills(self, batch: List[Tuple[ChunkKey, bytes]]) -> None:
+        for key, mask in batch:
+            self._write_spill(key, mask)
+        self._trim_spill_dir()
+
+    def _write_spill(self, key: ChunkKey, mask: bytes) -> None:
+        path = self._spill_path(key)
+        if path is None:
+            return
+        with self._spill_lock:
+            if path in self._spill_files:
+                self._spill_files.move_to_end(path)
+                return
+        data = zlib.compress(mask, 6)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        with self._spill_lock:
+            self._spill_files[path] = len(data)
+            self._spill_bytes += len(data)
+            self.stats.spills += 1
+
+    def _trim_spill_dir(self) -> None:
+        removed = []
+        with self._spill_lock:
+            while self._spill_files and self._spill_bytes > self.spill_max_bytes:
+                path, size = self._spill_files.popitem(last=False)
+                self._spill_bytes -= size
+                removed.append(path)
+            self.stats.spill_removals += len(removed)
+        for path in removed:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _read_spill(self, key: ChunkKey) -> Optional[bytes]:
+        path = self._spill_path(key)
+        if path is None:
+            return None
+        with self._spill_lock:
+            if path in self._spill_files:
+                self._spill_files.move_to_end(path)
+        try:
+            with open(path, "rb") as handle:
+                mask = zlib.decompress(handle.read())
+        except (OSError, zlib.error):
+            return None
+        if len(mask) != key[0] * key[1]:
+            return None
+        return mask
+
+
+def _loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
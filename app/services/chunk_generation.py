@@ -8,6 +8,9 @@ Room = Tuple[int, int, int, int]
 DIRECTIONS = ("N", "E", "S", "W")
 EXIT_BAND_WIDTH = 4
 
+_TILE_TO_WALKABLE = bytes(1 if chr(code) == "." else 0 for code in range(256))
+_WALKABLE_TO_TILE = b"#." + b"#" * 254
+
 
 def _edge_anchor(width: int, height: int, direction: str) -> Cell:
     cx = width // 2
@@ -304,3 +307,13 @@ def generate_chunk_tiles(
             grid[1][1] = "."
 
     return ["".join(row) for row in grid]
+
+
+def tiles_to_walkable_mask(tiles: Sequence[str]) -> bytearray:
+    """Flatten tile rows into a row-major mask: 1 for floor, 0 for wall."""
+    return bytearray("".join(tiles).encode("ascii").translate(_TILE_TO_WALKABLE))
+
+
+def render_tiles(walkable: Sequence[int], *, width: int, height: int) -> List[str]:
+    rendered = bytes(walkable).translate(_WALKABLE_TO_TILE).decode("ascii")
+    return [rendered[y * width : (y + 1) * width] for y in range(height)]
@@ -0,0 +1,247 @@
+"""
+Array-backed variant of chunk_generation.
+
+Consumes the seeded RNG in exactly the same order as generate_chunk_tiles and
+carves with slice assignment on a uint8 grid (1 = floor), so its output is
+bit-identical. NumPy is optional: without it generate_chunk_mask falls back to
+the pure Python generator.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Iterable, List, Sequence, Set
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the "fast" extra
+    np = None
+
+from app.services.chunk_generation import (
+    DIRECTIONS,
+    EXIT_BAND_WIDTH,
+    Cell,
+    Room,
+    _centered_indices,
+    _choose_exit_directions,
+    _edge_band,
+    _nearest_center,
+    _room_center,
+    _rooms_overlap,
+    generate_chunk_tiles,
+    tiles_to_walkable_mask,
+)
+
+HAVE_NUMPY = np is not None
+
+
+def _carve_line(grid: "np.ndarray", start: Cell, end: Cell) -> None:
+    # _step_towards walks x first, then y: one row segment and one column segment.
+    sx, sy = start
+    ex, ey = end
+    grid[sy, min(sx, ex) : max(sx, ex) + 1] = 1
+    grid[min(sy, ey) : max(sy, ey) + 1, ex] = 1
+
+
+def _carve_l_corridor(grid: "np.ndarray", start: Cell, end: Cell, rng: random.Random) -> None:
+    sx, sy = start
+    ex, ey = end
+    if rng.random() < 0.5:
+        _carve_line(grid, (sx, sy), (ex, sy))
+        _carve_line(grid, (ex, sy), (ex, ey))
+    else:
+        _carve_line(grid, (sx, sy), (sx, ey))
+        _carve_line(grid, (sx, ey), (ex, ey))
+
+
+def _carve_room(grid: "np.ndarray", room: Room) -> None:
+    x, y, w, h = room
+    grid[y : y + h, x : x + w] = 1
+
+
+def _build_room_centers(*, grid: "np.ndarray", width: int, height: int, rng: random.Random) -> List[Cell]:
+    rooms: List[Room] = []
+    centers: List[Cell] = []
+
+    interior_w = max(0, width - 2)
+    interior_h = max(0, height - 2)
+    max_room_w = max(2, min(10, interior_w))
+    max_room_h = max(2, min(10, interior_h))
+    min_room_w = max(2, min(5, max_room_w))
+    min_room_h = max(2, min(5, max_room_h))
+
+    target_rooms = max(4, min(14, (width * height) // 180))
+    attempts = target_rooms * 10
+
+    for _ in range(attempts):
+        if len(rooms) >= target_rooms:
+            break
+        if interior_w < min_room_w or interior_h < min_room_h:
+            break
+
+        room_w = rng.randint(min_room_w, max_room_w)
+        room_h = rng.randint(min_room_h, max_room_h)
+        max_x = width - room_w - 1
+        max_y = height - room_h - 1
+        if max_x < 1 or max_y < 1:
+            continue
+
+        room_x = rng.randint(1, max_x)
+        room_y = rng.randint(1, max_y)
+        room = (room_x, room_y, room_w, room_h)
+        if any(_rooms_overlap(existing, room, padding=1) for existing in rooms):
+            continue
+
+        _carve_room(grid, room)
+        center = _room_center(room)
+        if centers:
+            _carve_l_corridor(grid, centers[-1], center, rng)
+        rooms.append(room)
+        centers.append(center)
+
+    if not centers:
+        fallback_w = max(2, min(4, interior_w))
+        fallback_h = max(2, min(4, interior_h))
+        fallback_x = max(1, (width - fallback_w) // 2)
+        fallback_y = max(1, (height - fallback_h) // 2)
+        fallback_room = (fallback_x, fallback_y, fallback_w, fallback_h)
+        _carve_room(grid, fallback_room)
+        centers.append(_room_center(fallback_room))
+
+    if len(centers) >= 3:
+        loop_count = max(1, len(centers) // 3)
+        for _ in range(loop_count):
+            a, b = rng.sample(centers, 2)
+            _carve_l_corridor(grid, a, b, rng)
+
+    return centers
+
+
+def _connect_exits(
+    *,
+    grid: "np.ndarray",
+    width: int,
+    height: int,
+    centers: Sequence[Cell],
+    active_dirs: Set[str],
+    rng: random.Random,
+) -> None:
+    for direction in sorted(active_dirs):
+        edge_band = _edge_band(width=width, height=height, direction=direction, inside=False)
+        inside_band = _edge_band(width=width, height=height, direction=direction, inside=True)
+
+        # Bands are straight runs, so carving each cell towards the band center
+        # covers exactly the band itself.
+        for band in (edge_band, inside_band):
+            _carve_line(grid, band[0], band[-1])
+
+        inside_center = inside_band[len(inside_band) // 2]
+        target = _nearest_center(inside_center, centers)
+        _carve_l_corridor(grid, inside_center, target, rng)
+
+
+def _root_layout_grid(*, width: int, height: int) -> "np.ndarray":
+    grid = np.zeros((height, width), dtype=np.uint8)
+    cx = width // 2
+    cy = height // 2
+    radius = max(6, min(width, height) // 4)
+
+    ys, xs = np.ogrid[1 : height - 1, 1 : width - 1]
+    grid[1 : height - 1, 1 : width - 1] = ((xs - cx) ** 2 + (ys - cy) ** 2) <= radius * radius
+
+    x_band = _centered_indices(width, EXIT_BAND_WIDTH)
+    y_band = _centered_indices(height, EXIT_BAND_WIDTH)
+    grid[:, x_band[0] : x_band[-1] + 1] = 1
+    grid[y_band[0] : y_band[-1] + 1, :] = 1
+    return grid
+
+
+def _generate_grid(
+    *,
+    width: int,
+    height: int,
+    seed: int,
+    required_edges: Iterable[str],
+    root_layout: bool,
+) -> "np.ndarray":
+    rng = random.Random(seed)
+    req: Set[str] = {d for d in required_edges if d in DIRECTIONS}
+
+    if root_layout and width >= 20 and height >= 20:
+        return _root_layout_grid(width=width, height=height)
+
+    grid = np.zeros((height, width), dtype=np.uint8)
+    centers = _build_room_centers(grid=grid, width=width, height=height, rng=rng)
+    exits = _choose_exit_directions(required=req, rng=rng)
+    _connect_exits(
+        grid=grid,
+        width=width,
+        height=height,
+        centers=centers,
+        active_dirs=exits,
+        rng=rng,
+    )
+
+    if width < 20 or height < 20:
+        grid[0, :] = 1
+        grid[height - 1, :] = 1
+        grid[:, 0] = 1
+        grid[:, width - 1] = 1
+        if width > 1 and height > 1:
+            grid[1, 1 : width - 1] = 1
+            grid[1 : height - 1, 1] = 1
+            grid[1, 1] = 1
+
+    return grid
+
+
+def generate_chunk_tiles_np(
+    *,
+    width: int,
+    height: int,
+    seed: int,
+    required_edges: Iterable[str],
+    root_layout: bool = False,
+) -> List[str]:
+    """Same contract and output as chunk_generation.generate_chunk_tiles; requires NumPy."""
+    if np is None:
+        raise RuntimeError("numpy is not installed")
+    if width <= 0 or height <= 0:
+        return []
+    grid = _generate_grid(
+        width=width,
+        height=height,
+        seed=seed,
+        required_edges=required_edges,
+        root_layout=root_layout,
+    )
+    chars = np.where(grid != 0, np.uint8(ord(".")), np.uint8(ord("#")))
+    return [row.tobytes().decode("ascii") for row in chars]
+
+
+def generate_chunk_mask(
+    *,
+    width: int,
+    height: int,
+    seed: int,
+    required_edges: Iterable[str],
+    root_layout: bool = False,
+) -> bytearray:
+    """Walkability mask of a generated chunk, using NumPy when it is installed."""
+    if np is None or width <= 0 or height <= 0:
+        tiles = generate_chunk_tiles(
+            width=width,
+            height=height,
+            seed=seed,
+            required_edges=required_edges,
+            root_layout=root_layout,
+        )
+        return tiles_to_walkable_mask(tiles)
+    grid = _generate_grid(
+        width=width,
+        height=height,
+        seed=seed,
+        required_edges=required_edges,
+        root_layout=root_layout,
+    )
+    return bytearray(grid.tobytes())
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from app.config import Settings
 from app.services.auth_store import InMemoryAuthStore
 from app.services.challenge_service import ChallengeService
+from app.services.chunk_cache import ChunkTileCache
 from app.services.tick_engine import InMemoryTickEngine
 
 
@@ -28,5 +29,23 @@ def build_container(settings: Settings) -> ServiceContainer:
             chunk_gc_ttl_seconds=settings.chunk_gc_ttl_seconds,
             sse_replay_max_events=settings.sse_replay_max_events,
             enable_demo_actors=settings.demo_actors_enabled,
+            path_mode=settings.path_mode,
+            reservation_window=settings.path_reservation_window,
+            block_wait_ticks=settings.path_block_wait_ticks,
+            block_detour_steps=settings.path_block_detour_steps,
+            flow_field_ttl_ticks=settings.path_flow_field_ttl_ticks,
+            landmark_count=settings.path_landmarks,
+            landmark_max_bytes=settings.path_landmark_max_bytes,
+            planning_workers=settings.path_planning_workers,
+            planning_pool_min_batch=settings.path_planning_pool_min_batch,
+            overrun_policy=settings.tick_overrun_policy,
+            max_catch_up_ticks=settings.tick_max_catch_up,
+            pregeneration_workers=settings.chunk_pregeneration_workers,
+            pregeneration_band=settings.chunk_pregeneration_band,
+            chunk_cache=ChunkTileCache(
+                max_bytes=settings.chunk_cache_max_bytes,
+                spill_dir=settings.chunk_cache_spill_dir or None,
+                spill_max_bytes=settings.chunk_cache_spill_max_bytes,
+            ),
         ),
     )
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterator, Mapping, Optional, Union
+
+
+def dump_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def typed_payload_json(message_type: str, payload_json: str) -> str:
+    """Splice {"type": message_type} in front of an already serialized payload object."""
+    if payload_json == "{}":
+        return f'{{"type":{dump_json(message_type)}}}'
+    return f'{{"type":{dump_json(message_type)},{payload_json[1:]}'
+
+
+def ws_frame_text(message_type: str, payload_json: str) -> str:
+    """{"type": message_type, "payload": ...} around an already serialized payload object."""
+    return f'{{"type":{dump_json(message_type)},"payload":{payload_json}}}'
+
+
+def sse_frame_text(*, event: str, data_json: str, event_id: Optional[str] = None) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {data_json}")
+    return "\n".join(lines) + "\n\n"
+
+
+class AgentFrame(Mapping[str, Any]):
+    """
+    An agent/owner channel message serialized once at emit time.
+
+    Every listener queue receives the same instance. It still reads like the
+    original {"type": ..., "payload": ...} message; `ws_text` is the agent
+    WebSocket text frame and `sse` the owner stream frame carrying that same
+    envelope as its data, encoded on first use since most frames never reach
+    an owner stream.
+    """
+
+    __slots__ = ("_message", "_sse", "ws_text")
+
+    def __init__(
+        self,
+        message_type: str,
+        payload: Dict[str, Any],
+        *,
+        payload_json: Optional[str] = None,
+    ) -> None:
+        if payload_json is None:
+            payload_json = dump_json(payload)
+        self._message = {"type": message_type, "payload": payload}
+        self._sse: Optional[bytes] = None
+        self.ws_text = ws_frame_text(message_type, payload_json)
+
+    @property
+    def sse(self) -> bytes:
+        if self._sse is None:
+            self._sse = sse_frame_text(event=self._message["type"], data_json=self.ws_text).encode("utf-8")
+        return self._sse
+
+    @classmethod
+    def from_message(cls, message: Union["AgentFrame", Mapping[str, Any]]) -> "AgentFrame":
+        if isinstance(message, AgentFrame):
+            return message
+        return cls(str(message.get("type", "message")), dict(message.get("payload", {})))
+
+    def __getitem__(self, key: str) -> Any:
+        return self._message[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._message)
+
+    def __len__(self) -> int:
+        return len(self._message)
+
+
+class SpectatorFrame(Mapping[str, Any]):
+    """
+    A spectator stream event serialized once; shared by listeners and replay history.
+
+    Reads like {"id": ..., "event": ..., "data": ...}; `sse` is the ready frame.
+    """
+
+    __slots__ = ("_message", "tick", "seq", "sse")
+
+    def __init__(
+        self,
+        *,
+        event_id: str,
+        event: str,
+        data: Dict[str, Any],
+        tick: int,
+        seq: int,
+        data_json: Optional[str] = None,
+    ) -> None:
+        if data_json is None:
+            data_json = dump_json(data)
+        self._message = {"id": event_id, "event": event, "data": data}
+        self.tick = tick
+        self.seq = seq
+        self.sse = sse_frame_text(event=event, data_json=data_json, event_id=event_id).encode("utf-8")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._message[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._message)
+
+    def __len__(self) -> int:
+        return len(self._message)
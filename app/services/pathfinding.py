@@ -1,10 +1,39 @@
 from __future__ import annotations
 
 import heapq
-from typing import Callable, Dict, List, Optional, Tuple
+import threading
+from array import array
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 Cell = Tuple[int, int]
 
+PATH_MODE_ASTAR = "astar"
+PATH_MODE_JPS = "jps"
+# Windowed cooperative A*: plans route around the (tick, cell) slots that
+# executing commands reserved, waiting in place where needed.
+PATH_MODE_WHCA = "whca"
+# Flow fields: moves to the same cell share one distance field and each step
+# is a lookup into it, taken around agents in the way where possible.
+PATH_MODE_FLOW = "flow"
+PATH_MODES = (PATH_MODE_ASTAR, PATH_MODE_JPS, PATH_MODE_WHCA, PATH_MODE_FLOW)
+
+# Distance field entry for cells that cannot reach the field's goal. Fields
+# over more than NO_PATH cells hold 4-byte entries and use NO_PATH_WIDE.
+NO_PATH = 0xFFFF
+NO_PATH_WIDE = 0xFFFFFFFF
+
+
+def field_typecode(cells: int) -> str:
+    """Array typecode for a distance field over `cells` cells."""
+    # A distance is always below the cell count, so 2 bytes hold it up to here.
+    return "H" if cells <= NO_PATH else "I"
+
+
+def field_no_path(cells: int) -> int:
+    """The unreachable entry of a distance field over `cells` cells."""
+    return NO_PATH if cells <= NO_PATH else NO_PATH_WIDE
+
 
 def _heuristic(a: Cell, b: Cell) -> int:
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -16,14 +45,774 @@ def _neighbors(cell: Cell, width: int, height: int) -> List[Cell]:
     return [(nx, ny) for nx, ny in candidates if 0 <= nx < width and 0 <= ny < height]
 
 
+class GridPathfinder:
+    """
+    A* over one width x height grid using flat cell indices (y * width + x).
+
+    Score and parent buffers are allocated once and reused: a cell's entries
+    only count when its stamp equals the current search generation, so a
+    search never clears or allocates them. Not thread-safe; see
+    `grid_pathfinder` for a per-thread instance.
+    """
+
+    _MAX_GENERATION = (1 << 32) - 1
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        # Sized for the padded (width + 2) x (height + 2) grid jump_search uses;
+        # `search` indexes only the first width * height entries.
+        size = (width + 2) * (height + 2)
+        self._g = array("l", bytes(array("l").itemsize * size))
+        self._parent = array("l", bytes(array("l").itemsize * size))
+        self._stamp = array("L", bytes(array("L").itemsize * size))
+        self._generation = 0
+        self._all_open = b"\x01" * (width * height)
+        self._padded = bytearray(size)
+        self.expanded = 0
+
+    def search(
+        self,
+        start: Cell,
+        goal: Cell,
+        *,
+        walkable: Optional[Sequence[int]] = None,
+        blocked: Optional[Sequence[int]] = None,
+        max_expanded: Optional[int] = None,
+        landmarks: Optional[Sequence[Sequence[int]]] = None,
+    ) -> Optional[List[Cell]]:
+        """
+        Same contract and tie-breaking as `astar_path`. `blocked` is an optional
+        row-major mask of dynamic obstacles (non-zero = occupied). With
+        `max_expanded` the search gives up (returns None) after expanding that
+        many cells. With `landmarks` (see `landmark_tables`) the heuristic is
+        ALT's: paths are as short, but ties may pick a different route.
+        """
+        if start == goal:
+            return []
+        if landmarks:
+            return self._alt_search(start, goal, walkable, blocked, max_expanded, landmarks)
+
+        width = self.width
+        height = self.height
+        if walkable is None:
+            walkable = self._all_open
+
+        generation = self._next_generation()
+        g_score = self._g
+        parent = self._parent
+        stamp = self._stamp
+
+        goal_x, goal_y = goal
+        source = start[1] * width + start[0]
+        target = goal_y * width + goal_x
+        stamp[source] = generation
+        g_score[source] = 0
+
+        push = heapq.heappush
+        pop = heapq.heappop
+        open_heap: List[Tuple[int, int, int]] = [(_heuristic(start, goal), 0, source)]
+        serial = 0
+        expanded = 0
+
+        while open_heap:
+            f_score, _order, current = pop(open_heap)
+            if current == target:
+                self.expanded = expanded
+                return self._walk_back(source, target)
+
+            cur_y, cur_x = divmod(current, width)
+            cur_g = g_score[current]
+            # A cell whose score improved after this entry was pushed has already
+            # been expanded from the better entry; expanding it again adds nothing.
+            if f_score - abs(cur_x - goal_x) - abs(cur_y - goal_y) > cur_g:
+                continue
+            if expanded == max_expanded:
+                break
+            expanded += 1
+            tentative = cur_g + 1
+
+            # Neighbor order matches astar_path: x+1, x-1, y+1, y-1.
+            for nxt, nx, ny in (
+                (current + 1, cur_x + 1, cur_y),
+                (current - 1, cur_x - 1, cur_y),
+                (current + width, cur_x, cur_y + 1),
+                (current - width, cur_x, cur_y - 1),
+            ):
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                    continue
+                if nxt != target:
+                    if not walkable[nxt]:
+                        continue
+                    if blocked is not None and blocked[nxt]:
+                        continue
+                if stamp[nxt] == generation and tentative >= g_score[nxt]:
+                    continue
+
+                stamp[nxt] = generation
+                g_score[nxt] = tentative
+                parent[nxt] = current
+                serial += 1
+                push(open_heap, (tentative + abs(nx - goal_x) + abs(ny - goal_y), serial, nxt))
+
+        self.expanded = expanded
+        return None
+
+    def _alt_search(
+        self,
+        start: Cell,
+        goal: Cell,
+        walkable: Optional[Sequence[int]],
+        blocked: Optional[Sequence[int]],
+        max_expanded: Optional[int],
+        landmarks: Sequence[Sequence[int]],
+    ) -> Optional[List[Cell]]:
+        # A*, Landmarks, Triangle inequality: the distance from any cell n to the
+        # goal is at least |d(L, n) - d(L, goal)| for every landmark L. Tables
+        # cover the walls-only grid, and walkable/blocked masks only make routes
+        # longer, so the bound stays admissible (and consistent).
+        width = self.width
+        height = self.height
+        if walkable is None:
+            walkable = self._all_open
+
+        generation = self._next_generation()
+        g_score = self._g
+        parent = self._parent
+        stamp = self._stamp
+
+        goal_x, goal_y = goal
+        source = start[1] * width + start[0]
+        target = goal_y * width + goal_x
+        no_path = field_no_path(width * height)
+        tables = [(table, table[target]) for table in landmarks if table[target] != no_path]
+
+        def heuristic(idx: int, x: int, y: int) -> int:
+            best = abs(x - goal_x) + abs(y - goal_y)
+            for table, to_goal in tables:
+                dist = table[idx]
+                if dist != no_path:
+                    bound = dist - to_goal if dist > to_goal else to_goal - dist
+                    if bound > best:
+                        best = bound
+            return best
+
+        stamp[source] = generation
+        g_score[source] = 0
+
+        push = heapq.heappush
+        pop = heapq.heappop
+        # Entries carry the g they were pushed with: a cell whose score improved
+        # since then has already been expanded from the better entry.
+        open_heap: List[Tuple[int, int, int, int, int]] = [(heuristic(source, start[0], start[1]), 0, 0, source, 0)]
+        serial = 0
+        expanded = 0
+
+        while open_heap:
+            _f_score, _depth, _order, current, pushed_g = pop(open_heap)
+            if current == target:
+                self.expanded = expanded
+                return self._walk_back(source, target)
+            if pushed_g > g_score[current]:
+                continue
+            if expanded == max_expanded:
+                break
+            expanded += 1
+            cur_y, cur_x = divmod(current, width)
+            tentative = pushed_g + 1
+
+            for nxt, nx, ny in (
+                (current + 1, cur_x + 1, cur_y),
+                (current - 1, cur_x - 1, cur_y),
+                (current + width, cur_x, cur_y + 1),
+                (current - width, cur_x, cur_y - 1),
+            ):
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                    continue
+                if nxt != target:
+                    if not walkable[nxt]:
+                        continue
+                    if blocked is not None and blocked[nxt]:
+                        continue
+                if stamp[nxt] == generation and tentative >= g_score[nxt]:
+                    continue
+
+                stamp[nxt] = generation
+                g_score[nxt] = tentative
+                parent[nxt] = current
+                serial += 1
+                push(open_heap, (tentative + heuristic(nxt, nx, ny), -tentative, serial, nxt, tentative))
+
+        self.expanded = expanded
+        return None
+
+    def jump_search(
+        self,
+        start: Cell,
+        goal: Cell,
+        *,
+        walkable: Optional[Sequence[int]] = None,
+        blocked: Optional[Sequence[int]] = None,
+    ) -> Optional[List[Cell]]:
+        """
+        Jump Point Search for 4-connected uniform-cost grids.
+
+        Vertical moves play the role diagonals play in 8-connected JPS: a
+        vertical jump also stops where a horizontal jump from it would find a
+        jump point, and horizontal jumps stop at forced neighbors. Only jump
+        points enter the open list; the result is expanded back to one entry
+        per cell and is as short as the `search` path (though ties may pick a
+        different route).
+        """
+        if start == goal:
+            return []
+
+        width = self.width
+        stride = width + 2
+        generation = self._next_generation()
+        g_score = self._g
+        parent = self._parent
+        stamp = self._stamp
+
+        # Work on a copy of the open cells with a closed one-cell border, so the
+        # jump loops below need no bounds checks. Indices are padded: (y+1)*stride+x+1.
+        cells = self._fill_padded(walkable, blocked)
+        goal_x, goal_y = goal
+        source = (start[1] + 1) * stride + start[0] + 1
+        target = (goal_y + 1) * stride + goal_x + 1
+        cells[target] = 1
+
+        def jump_horizontal(idx: int, dx: int) -> int:
+            while True:
+                idx += dx
+                if not cells[idx]:
+                    return -1
+                if idx == target:
+                    return idx
+                above = idx + stride
+                below = idx - stride
+                if (cells[above] and not cells[above - dx]) or (cells[below] and not cells[below - dx]):
+                    return idx
+
+        def jump_vertical(idx: int, step: int) -> int:
+            while True:
+                idx += step
+                if not cells[idx]:
+                    return -1
+                if idx == target:
+                    return idx
+                if (cells[idx - 1] and not cells[idx - 1 - step]) or (cells[idx + 1] and not cells[idx + 1 - step]):
+                    return idx
+                if jump_horizontal(idx, 1) >= 0 or jump_horizontal(idx, -1) >= 0:
+                    return idx
+
+        stamp[source] = generation
+        g_score[source] = 0
+        parent[source] = source
+        open_heap: List[Tuple[int, int, int]] = [(_heuristic(start, goal), 0, source)]
+        serial = 0
+        expanded = 0
+
+        while open_heap:
+            f_score, _order, current = heapq.heappop(open_heap)
+            if current == target:
+                self.expanded = expanded
+                return self._expand_jumps(source, target, stride)
+
+            cur_y, cur_x = divmod(current, stride)
+            cur_g = g_score[current]
+            if f_score - abs(cur_x - 1 - goal_x) - abs(cur_y - 1 - goal_y) > cur_g:
+                continue
+            expanded += 1
+
+            if current == source:
+                steps: Tuple[int, ...] = (1, -1, stride, -stride)
+            else:
+                delta = current - parent[current]
+                if -stride < delta < stride:
+                    forward = 1 if delta > 0 else -1
+                    steps = (forward, stride, -stride)
+                else:
+                    forward = stride if delta > 0 else -stride
+                    steps = (forward, 1, -1)
+
+            for step in steps:
+                if step == 1 or step == -1:
+                    jump = jump_horizontal(current, step)
+                else:
+                    jump = jump_vertical(current, step)
+                if jump < 0:
+                    continue
+                jump_y, jump_x = divmod(jump, stride)
+                tentative = cur_g + abs(jump_x - cur_x) + abs(jump_y - cur_y)
+                if stamp[jump] == generation and tentative >= g_score[jump]:
+                    continue
+                stamp[jump] = generation
+                g_score[jump] = tentative
+                parent[jump] = current
+                serial += 1
+                heapq.heappush(
+                    open_heap,
+                    (tentative + abs(jump_x - 1 - goal_x) + abs(jump_y - 1 - goal_y), serial, jump),
+                )
+
+        self.expanded = expanded
+        return None
+
+    def _next_generation(self) -> int:
+        self._generation += 1
+        if self._generation > self._MAX_GENERATION:
+            for idx in range(len(self._stamp)):
+                self._stamp[idx] = 0
+            self._generation = 1
+        return self._generation
+
+    def _fill_padded(self, walkable: Optional[Sequence[int]], blocked: Optional[Sequence[int]]) -> bytearray:
+        width = self.width
+        stride = width + 2
+        cells = self._padded
+        if walkable is None:
+            walkable = self._all_open
+        for y in range(self.height):
+            row = (y + 1) * stride + 1
+            cells[row : row + width] = walkable[y * width : (y + 1) * width]
+        if blocked is not None:
+            if not isinstance(blocked, (bytes, bytearray)):
+                blocked = bytes(blocked)
+            idx = blocked.find(1)
+            while idx >= 0:
+                cell_y, cell_x = divmod(idx, width)
+                cells[(cell_y + 1) * stride + cell_x + 1] = 0
+                idx = blocked.find(1, idx + 1)
+        return cells
+
+    def _expand_jumps(self, source: int, target: int, stride: int) -> List[Cell]:
+        parent = self._parent
+        path: List[Cell] = []
+        cursor = target
+        while cursor != source:
+            prev = parent[cursor]
+            step = 1 if abs(prev - cursor) < stride else stride
+            if prev < cursor:
+                step = -step
+            while cursor != prev:
+                y, x = divmod(cursor, stride)
+                path.append((x - 1, y - 1))
+                cursor += step
+        path.reverse()
+        return path
+
+    def _walk_back(self, source: int, target: int) -> List[Cell]:
+        width = self.width
+        parent = self._parent
+        path: List[Cell] = []
+        cursor = target
+        while cursor != source:
+            y, x = divmod(cursor, width)
+            path.append((x, y))
+            cursor = parent[cursor]
+        path.reverse()
+        return path
+
+
+_local = threading.local()
+
+
+def grid_pathfinder(width: int, height: int) -> GridPathfinder:
+    """The calling thread's reusable GridPathfinder for this grid size."""
+    cache: Optional[Dict[Tuple[int, int], GridPathfinder]] = getattr(_local, "pathfinders", None)
+    if cache is None:
+        cache = _local.pathfinders = {}
+    finder = cache.get((width, height))
+    if finder is None:
+        finder = cache[(width, height)] = GridPathfinder(width, height)
+    return finder
+
+
+def jps_path(
+    *,
+    width: int,
+    height: int,
+    start: Cell,
+    goal: Cell,
+    walkable: Optional[Sequence[int]] = None,
+    blocked: Optional[Sequence[int]] = None,
+) -> Optional[List[Cell]]:
+    """Jump Point Search counterpart of `astar_path`, expanded to per-cell steps."""
+    return grid_pathfinder(width, height).jump_search(start, goal, walkable=walkable, blocked=blocked)
+
+
+def plan_paths(
+    *,
+    width: int,
+    height: int,
+    jobs: Sequence[Tuple[Cell, Cell]],
+    walkable: Optional[Sequence[int]] = None,
+    blocked: Optional[Sequence[int]] = None,
+    mode: str = PATH_MODE_ASTAR,
+    landmarks: Optional[Sequence[Sequence[int]]] = None,
+) -> List[Optional[List[Cell]]]:
+    """
+    Solve several (start, goal) searches on one grid with the calling thread's
+    GridPathfinder. Module-level so a batch can be handed to a worker process.
+    `landmarks` only applies to A* searches.
+    """
+    finder = grid_pathfinder(width, height)
+    if mode == PATH_MODE_JPS:
+        return [finder.jump_search(start, goal, walkable=walkable, blocked=blocked) for start, goal in jobs]
+    return [finder.search(start, goal, walkable=walkable, blocked=blocked, landmarks=landmarks) for start, goal in jobs]
+
+
+def component_labels(walkable: Sequence[int], width: int, height: int) -> array:
+    """
+    Label the 4-connected floor regions of a row-major mask: two floor cells
+    share a non-zero label exactly when a path joins them. Walls are 0.
+    """
+    labels = array("I", bytes(array("I").itemsize * width * height))
+    label = 0
+    for seed, open_cell in enumerate(walkable):
+        if not open_cell or labels[seed]:
+            continue
+        label += 1
+        labels[seed] = label
+        stack = [seed]
+        while stack:
+            current = stack.pop()
+            cur_y, cur_x = divmod(current, width)
+            for nxt, inside in (
+                (current + 1, cur_x + 1 < width),
+                (current - 1, cur_x > 0),
+                (current + width, cur_y + 1 < height),
+                (current - width, cur_y > 0),
+            ):
+                if inside and walkable[nxt] and not labels[nxt]:
+                    labels[nxt] = label
+                    stack.append(nxt)
+    return labels
+
+
+def distance_field(*, width: int, height: int, goal: Cell, walkable: Sequence[int]) -> array:
+    """
+    Steps from every open cell to `goal` (NO_PATH where it cannot be reached),
+    one 2-byte entry per cell, or 4-byte with NO_PATH_WIDE on grids of more
+    than NO_PATH cells. Moves cost the same everywhere, so this breadth-first
+    pass is the Dijkstra field.
+    """
+    cells = width * height
+    no_path = field_no_path(cells)
+    field = array(field_typecode(cells), [no_path]) * cells
+    origin = goal[1] * width + goal[0]
+    field[origin] = 0
+    frontier = deque([origin])
+    while frontier:
+        current = frontier.popleft()
+        cur_y, cur_x = divmod(current, width)
+        dist = field[current] + 1
+        for nxt, inside in (
+            (current + 1, cur_x + 1 < width),
+            (current - 1, cur_x > 0),
+            (current + width, cur_y + 1 < height),
+            (current - width, cur_y > 0),
+        ):
+            if inside and walkable[nxt] and field[nxt] == no_path:
+                field[nxt] = dist
+                frontier.append(nxt)
+    return field
+
+
+def landmark_tables(
+    walkable: Sequence[int], width: int, height: int, count: int, labels: Optional[Sequence[int]] = None
+) -> List[array]:
+    """
+    Distance fields (see `distance_field`) from `count` landmarks for ALT
+    searches. Landmarks are picked farthest-first inside the largest floor
+    region: the first is the cell farthest from an arbitrary start, each next
+    one the cell farthest from all landmarks so far. `labels` reuses the
+    mask's `component_labels` if the caller already has them.
+    """
+    if count <= 0:
+        return []
+    if labels is None:
+        labels = component_labels(walkable, width, height)
+    sizes: Dict[int, int] = {}
+    for label in labels:
+        if label:
+            sizes[label] = sizes.get(label, 0) + 1
+    if not sizes:
+        return []
+    largest = max(sizes, key=lambda label: (sizes[label], -label))
+    seed = labels.index(largest)
+    cells = width * height
+    no_path = field_no_path(cells)
+
+    def farthest(nearest: Sequence[int]) -> int:
+        best, best_dist = seed, -1
+        for idx, dist in enumerate(nearest):
+            if dist != no_path and dist > best_dist:
+                best, best_dist = idx, dist
+        return best
+
+    def field_from(idx: int) -> array:
+        return distance_field(width=width, height=height, goal=(idx % width, idx // width), walkable=walkable)
+
+    landmark = farthest(field_from(seed))
+    tables: List[array] = []
+    nearest = array(field_typecode(cells), [no_path]) * cells
+    while len(tables) < count:
+        table = field_from(landmark)
+        tables.append(table)
+        if len(tables) == count:
+            break
+        for idx, dist in enumerate(table):
+            if dist < nearest[idx]:
+                nearest[idx] = dist
+        landmark = farthest(nearest)
+        if nearest[landmark] == 0:
+            # Every cell of the region already is a landmark.
+            break
+    return tables
+
+
+def field_steps(field: Sequence[int], cell: Cell, width: int, height: int) -> List[Cell]:
+    """
+    Neighbors of `cell` one step closer to the field's goal, in astar_path's
+    neighbor order; empty at the goal or where the goal cannot be reached. A
+    cell outside the field (a border cell an agent was handed off onto) steps
+    to its closest neighbors inside it.
+    """
+    x, y = cell
+    idx = y * width + x
+    neighbors = []
+    if x + 1 < width:
+        neighbors.append((idx + 1, (x + 1, y)))
+    if x > 0:
+        neighbors.append((idx - 1, (x - 1, y)))
+    if y + 1 < height:
+        neighbors.append((idx + width, (x, y + 1)))
+    if y > 0:
+        neighbors.append((idx - width, (x, y - 1)))
+    no_path = field_no_path(width * height)
+    dist = field[idx]
+    if dist == no_path:
+        dist = min((field[nxt] for nxt, _cell in neighbors), default=no_path)
+        if dist == no_path:
+            return []
+        dist += 1
+    return [nxt_cell for nxt, nxt_cell in neighbors if field[nxt] == dist - 1]
+
+
+def goal_distances(
+    *,
+    width: int,
+    height: int,
+    goal: Cell,
+    walkable: Optional[Sequence[int]] = None,
+    blocked: Optional[Sequence[int]] = None,
+) -> Dict[int, int]:
+    """Breadth-first step counts to `goal` by flat cell index, over open cells."""
+    target = goal[1] * width + goal[0]
+    distances = {target: 0}
+    frontier = deque([target])
+    while frontier:
+        current = frontier.popleft()
+        cur_y, cur_x = divmod(current, width)
+        dist = distances[current] + 1
+        for nxt, inside in (
+            (current + 1, cur_x + 1 < width),
+            (current - 1, cur_x > 0),
+            (current + width, cur_y + 1 < height),
+            (current - width, cur_y > 0),
+        ):
+            if not inside or nxt in distances:
+                continue
+            if walkable is not None and not walkable[nxt]:
+                continue
+            if blocked is not None and blocked[nxt]:
+                continue
+            distances[nxt] = dist
+            frontier.append(nxt)
+    return distances
+
+
+def cooperative_paths(
+    *,
+    width: int,
+    height: int,
+    jobs: Sequence[Tuple[Cell, Cell]],
+    walkable: Optional[Sequence[int]] = None,
+    blocked: Optional[Sequence[int]] = None,
+    reserved: Iterable[Tuple[int, int]] = (),
+    parked: Optional[Dict[int, int]] = None,
+    window: int = 16,
+) -> List[Optional[List[Cell]]]:
+    """
+    Windowed cooperative A* (WHCA*) for several agents on one grid, in priority
+    order. Each result becomes a reservation for the jobs after it.
+
+    Time is counted in ticks from the snapshot: an agent stands on its start
+    at tick 0 and on `path[i]` after tick i + 1. `reserved` holds the
+    (tick, cell index) slots other agents will occupy and `parked` the tick
+    from which an agent rests on a cell for good. Agents step in priority
+    order within a tick, so a cell is free at tick t unless it is reserved at
+    t, or at t + 1 by an agent that would find it still occupied.
+
+    For the first `window` ticks the search runs over (cell, tick) states
+    and may wait in place (a repeated cell in the path); after that it follows
+    the static distance field to the goal. The static distances also serve as
+    the heuristic, and a start they do not reach is unreachable. If no
+    conflict-free plan exists within the window, the static path is returned.
+    """
+    slots: Set[Tuple[int, int]] = set(reserved)
+    parked_from: Dict[int, int] = dict(parked or {})
+    results: List[Optional[List[Cell]]] = []
+    for start, goal in jobs:
+        path = _cooperative_search(
+            width=width,
+            height=height,
+            start=start,
+            goal=goal,
+            walkable=walkable,
+            blocked=blocked,
+            slots=slots,
+            parked=parked_from,
+            window=max(1, window),
+        )
+        results.append(path)
+        if path:
+            for tick, (x, y) in enumerate(path, start=1):
+                slots.add((tick, y * width + x))
+            last_x, last_y = path[-1]
+            parked_from[last_y * width + last_x] = len(path)
+    return results
+
+
+def _cooperative_search(
+    *,
+    width: int,
+    height: int,
+    start: Cell,
+    goal: Cell,
+    walkable: Optional[Sequence[int]],
+    blocked: Optional[Sequence[int]],
+    slots: Set[Tuple[int, int]],
+    parked: Dict[int, int],
+    window: int,
+) -> Optional[List[Cell]]:
+    if start == goal:
+        return []
+    distances = goal_distances(width=width, height=height, goal=goal, walkable=walkable, blocked=blocked)
+    source = start[1] * width + start[0]
+    target = goal[1] * width + goal[0]
+    if source not in distances:
+        # The start itself may be marked blocked (its own agent stands there).
+        best = None
+        for nxt in _flat_neighbors(source, width, height):
+            dist = distances.get(nxt)
+            if dist is not None and (best is None or dist < best):
+                best = dist
+        if best is None:
+            return None
+        distances[source] = best + 1
+
+    never = window + 2
+    # The goal can be kept for good only once every reservation on it has passed;
+    # if that is beyond the window (or never), arriving is as good as it gets.
+    goal_free_from = max([tick + 1 for tick, idx in slots if idx == target], default=0)
+    if target in parked or goal_free_from > window:
+        goal_free_from = 0
+
+    def free(idx: int, tick: int) -> bool:
+        if (tick, idx) in slots or (tick + 1, idx) in slots:
+            return False
+        return parked.get(idx, never) > tick + 1
+
+    # States are (tick, cell); every action, waiting included, costs one tick.
+    parents: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    seen = {(0, source)}
+    open_heap: List[Tuple[int, int, int, int]] = [(distances[source], 0, 0, source)]
+    serial = 0
+    while open_heap:
+        _f, _order, tick, current = heapq.heappop(open_heap)
+        if current == target and tick >= goal_free_from:
+            return _unwind_states(parents, (tick, current), width)
+        if tick >= window:
+            path = _unwind_states(parents, (tick, current), width)
+            path.extend(_descend(current, target, distances, width, height))
+            return path
+        nxt_tick = tick + 1
+        for nxt in (*_flat_neighbors(current, width, height), current):
+            if nxt not in distances or (nxt_tick, nxt) in seen:
+                continue
+            if not free(nxt, nxt_tick):
+                continue
+            seen.add((nxt_tick, nxt))
+            parents[(nxt_tick, nxt)] = (tick, current)
+            serial += 1
+            heapq.heappush(open_heap, (nxt_tick + distances[nxt], serial, nxt_tick, nxt))
+    # Boxed in by reservations for the whole window: the goal is still reachable,
+    # so take the static shortest path and leave the conflict to execution.
+    return _descend(source, target, distances, width, height)
+
+
+def _flat_neighbors(idx: int, width: int, height: int) -> List[int]:
+    # Same order as the A* searches: x+1, x-1, y+1, y-1.
+    cur_y, cur_x = divmod(idx, width)
+    out = []
+    if cur_x + 1 < width:
+        out.append(idx + 1)
+    if cur_x > 0:
+        out.append(idx - 1)
+    if cur_y + 1 < height:
+        out.append(idx + width)
+    if cur_y > 0:
+        out.append(idx - width)
+    return out
+
+
+def _unwind_states(parents: Dict[Tuple[int, int], Tuple[int, int]], state: Tuple[int, int], width: int) -> List[Cell]:
+    path: List[Cell] = []
+    while state in parents:
+        idx = state[1]
+        path.append((idx % width, idx // width))
+        state = parents[state]
+    path.reverse()
+    return path
+
+
+def _descend(current: int, target: int, distances: Dict[int, int], width: int, height: int) -> List[Cell]:
+    path: List[Cell] = []
+    while current != target:
+        dist = distances[current]
+        current = next(nxt for nxt in _flat_neighbors(current, width, height) if distances.get(nxt) == dist - 1)
+        path.append((current % width, current // width))
+    return path
+
+
 def astar_path(
     *,
     width: int,
     height: int,
     start: Cell,
     goal: Cell,
-    is_blocked: Callable[[Cell], bool],
+    is_blocked: Optional[Callable[[Cell], bool]] = None,
+    walkable: Optional[Sequence[int]] = None,
+    blocked: Optional[Sequence[int]] = None,
+    landmarks: Optional[Sequence[Sequence[int]]] = None,
 ) -> Optional[List[Cell]]:
+    """
+    Shortest 4-connected path from start to goal, excluding start.
+
+    `walkable` is a row-major mask (non-zero = floor) checked before
+    dynamic obstacles, given either as a row-major `blocked` mask or as an
+    `is_blocked` callback. The goal cell itself is never rejected. Without a
+    callback the search runs on the flat-index GridPathfinder, which can use
+    ALT `landmarks`.
+    """
+    if is_blocked is None:
+        return grid_pathfinder(width, height).search(
+            start, goal, walkable=walkable, blocked=blocked, landmarks=landmarks
+        )
+
     if start == goal:
         return []
 
@@ -46,8 +835,13 @@ def astar_path(
             return path
 
         for nxt in _neighbors(current, width, height):
-            if nxt != goal and is_blocked(nxt):
-                continue
+            if nxt != goal:
+                if walkable is not None and not walkable[nxt[1] * width + nxt[0]]:
+                    continue
+                if is_blocked(nxt):
+                    continue
+                if blocked is not None and blocked[nxt[1] * width + nxt[0]]:
+                    continue
 
             tentative = g_score[current] + 1
             prev = g_score.get(nxt)
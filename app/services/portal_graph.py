@@ -0,0 +1,287 @@
+"""
+Abstract graph over loaded chunks for move_to targets in another chunk.
+
+HPA*-style: every chunk edge linked to a loaded neighbor contributes one
+portal per contiguous run of crossable cells, and route planning runs
+Dijkstra over portals using intra-chunk distances that are cached per chunk.
+Only the chunk-level route is planned up front; the engine refines each leg
+into cells when the agent enters that chunk.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.services.chunk_generation import DIRECTIONS
+from app.services.pathfinding import Cell, distance_field, field_steps
+
+
+@dataclass(frozen=True)
+class Portal:
+    direction: str
+    # Interior cell the crossing step starts from, the edge cell it steps onto
+    # (which triggers the handoff) and the neighbor cell the agent lands on.
+    stand: Cell
+    edge: Cell
+    arrival: Cell
+
+
+@dataclass(frozen=True)
+class RouteLeg:
+    """Reach `waypoint` inside the current chunk, then step onto `edge` (None on the last leg)."""
+
+    waypoint: Cell
+    edge: Optional[Cell]
+
+
+def _edge_cells(width: int, height: int, direction: str) -> List[Tuple[Cell, Cell]]:
+    # (edge, stand) pairs along one edge, corners excluded: stepping onto a corner
+    # from its inward cell would start on another edge.
+    if direction == "W":
+        return [((0, y), (1, y)) for y in range(1, height - 1)]
+    if direction == "E":
+        return [((width - 1, y), (width - 2, y)) for y in range(1, height - 1)]
+    if direction == "S":
+        return [((x, 0), (x, 1)) for x in range(1, width - 1)]
+    if direction == "N":
+        return [((x, height - 1), (x, height - 2)) for x in range(1, width - 1)]
+    raise ValueError(f"invalid direction: {direction}")
+
+
+def _arrival_cell(edge: Cell, direction: str, width: int, height: int) -> Cell:
+    x, y = edge
+    if direction == "W":
+        return (width - 1, y)
+    if direction == "E":
+        return (0, y)
+    if direction == "S":
+        return (x, height - 1)
+    return (x, 0)
+
+
+class ChunkPortals:
+    """
+    Static exit data of one chunk. Layouts never change, so portal runs (per
+    linked neighbor), the distances from each entry cell and the distance
+    field towards each portal stand stay valid for the chunk's lifetime; they
+    live on ChunkState and go away with it.
+    """
+
+    def __init__(self, walkable: Sequence[int], width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        # Refined legs stay off the border so they never cross an edge early.
+        interior = bytearray(walkable)
+        for x in range(width):
+            interior[x] = 0
+            interior[(height - 1) * width + x] = 0
+        for y in range(height):
+            interior[y * width] = 0
+            interior[y * width + width - 1] = 0
+        self.interior = interior
+        self._crossable: Dict[str, List[Tuple[Cell, Cell]]] = {
+            direction: [
+                (edge, stand)
+                for edge, stand in (_edge_cells(width, height, direction) if width > 2 and height > 2 else [])
+                if walkable[edge[1] * width + edge[0]] and interior[stand[1] * width + stand[0]]
+            ]
+            for direction in DIRECTIONS
+        }
+        self._stands = [stand for direction in DIRECTIONS for _edge, stand in self._crossable[direction]]
+        self._edge_stands = {
+            edge: stand for direction in DIRECTIONS for edge, stand in self._crossable[direction]
+        }
+        self._portals: Dict[str, Tuple[str, List[Portal]]] = {}
+        self._stand_distances: Dict[Cell, Dict[Cell, int]] = {}
+        self._stand_fields: Dict[Cell, array] = {}
+
+    def portals(self, direction: str, neighbor_id: str, neighbor_walkable: Sequence[int]) -> List[Portal]:
+        cached = self._portals.get(direction)
+        if cached is not None and cached[0] == neighbor_id:
+            return cached[1]
+
+        width, height = self.width, self.height
+        runs: List[List[Portal]] = []
+        previous: Optional[Cell] = None
+        for edge, stand in self._crossable[direction]:
+            arrival = _arrival_cell(edge, direction, width, height)
+            if not neighbor_walkable[arrival[1] * width + arrival[0]]:
+                previous = None
+                continue
+            portal = Portal(direction=direction, stand=stand, edge=edge, arrival=arrival)
+            if previous is not None and abs(edge[0] - previous[0]) + abs(edge[1] - previous[1]) == 1:
+                runs[-1].append(portal)
+            else:
+                runs.append([portal])
+            previous = edge
+
+        portals = [run[len(run) // 2] for run in runs]
+        self._portals[direction] = (neighbor_id, portals)
+        return portals
+
+    def edge_stand(self, edge: Cell) -> Optional[Cell]:
+        """The interior cell a crossing onto `edge` steps from; None unless `edge` is crossable."""
+        return self._edge_stands.get(edge)
+
+    def stand_distances(self, source: Cell, *, cache: bool = True) -> Dict[Cell, int]:
+        """Distances from `source` to every portal stand cell it can reach."""
+        distances = self._stand_distances.get(source)
+        if distances is None:
+            distances = self.distances(source, self._stands)
+            if cache:
+                self._stand_distances[source] = distances
+        return distances
+
+    def stand_field(self, stand: Cell) -> array:
+        """
+        Steps from every interior cell to `stand` (NO_PATH where it cannot be
+        reached), as a `distance_field`. Built on first use per stand.
+        """
+        field = self._stand_fields.get(stand)
+        if field is None:
+            field = distance_field(width=self.width, height=self.height, goal=stand, walkable=self.interior)
+            self._stand_fields[stand] = field
+        return field
+
+    def descend(self, start: Cell, stand: Cell, *, blocked: Optional[Sequence[int]] = None) -> Optional[List[Cell]]:
+        """
+        A shortest interior path from `start` to `stand`, excluding start, read
+        off the stand's field in O(path length): each step goes to the first
+        unblocked neighbor one step closer. None if the field has no path or
+        every such neighbor is blocked at some point; callers then search.
+        """
+        width, height = self.width, self.height
+        field = self.stand_field(stand)
+        path: List[Cell] = []
+        current = start
+        while current != stand:
+            for nxt in field_steps(field, current, width, height):
+                if blocked is None or not blocked[nxt[1] * width + nxt[0]]:
+                    break
+            else:
+                return None
+            path.append(nxt)
+            current = nxt
+        return path
+
+    def field_bytes(self) -> int:
+        """Memory held by the stand fields built so far."""
+        return sum(field.itemsize * len(field) for field in self._stand_fields.values())
+
+    def distances(self, source: Cell, targets: Iterable[Cell]) -> Dict[Cell, int]:
+        """Breadth-first distances over interior cells; targets may lie on the border."""
+        width, height = self.width, self.height
+        interior = self.interior
+        remaining = {y * width + x for x, y in targets}
+        found: Dict[Cell, int] = {}
+        origin = source[1] * width + source[0]
+        if origin in remaining:
+            found[source] = 0
+            remaining.discard(origin)
+
+        seen = {origin}
+        frontier = deque([(origin, 0)])
+        while frontier and remaining:
+            current, dist = frontier.popleft()
+            cur_y, cur_x = divmod(current, width)
+            dist += 1
+            for nxt, inside in (
+                (current + 1, cur_x + 1 < width),
+                (current - 1, cur_x > 0),
+                (current + width, cur_y + 1 < height),
+                (current - width, cur_y > 0),
+            ):
+                if not inside or nxt in seen:
+                    continue
+                seen.add(nxt)
+                if nxt in remaining:
+                    remaining.discard(nxt)
+                    found[(nxt % width, nxt // width)] = dist
+                if interior[nxt]:
+                    frontier.append((nxt, dist))
+        return found
+
+    def entry_cells(self) -> List[Cell]:
+        """Border cells an agent can be handed off onto from a neighbor."""
+        return [edge for direction in DIRECTIONS for edge, _stand in self._crossable[direction]]
+
+
+def plan_route(
+    *,
+    start_chunk_id: str,
+    start: Cell,
+    goal_chunk_id: str,
+    goal: Cell,
+    portals_of: Callable[[str], Optional[ChunkPortals]],
+    exits_of: Callable[[str], Iterable[Tuple[str, List[Portal]]]],
+) -> Optional[List[RouteLeg]]:
+    """
+    Cheapest chunk-level route from `start` to `goal`, as one leg per chunk.
+
+    `portals_of` returns a loaded chunk's ChunkPortals (None if it is gone) and
+    `exits_of` its (neighbor_id, portals) pairs towards loaded neighbors.
+    Cost is the number of steps, each crossing counting as one.
+    """
+    goal_portals = portals_of(goal_chunk_id)
+    start_portals = portals_of(start_chunk_id)
+    if goal_portals is None or start_portals is None:
+        return None
+    goal_targets = goal_portals.entry_cells()
+    if start_chunk_id == goal_chunk_id:
+        goal_targets.append(start)
+    goal_distances = goal_portals.distances(goal, goal_targets)
+
+    Node = Tuple[str, Cell]
+    best: Dict[Node, int] = {(start_chunk_id, start): 0}
+    came_from: Dict[Node, Tuple[Node, Portal]] = {}
+    goal_cost: Optional[int] = None
+    goal_via: Optional[Node] = None
+    serial = 0
+    open_heap: List[Tuple[int, int, Node]] = [(0, 0, (start_chunk_id, start))]
+
+    while open_heap:
+        cost, _order, node = heapq.heappop(open_heap)
+        if cost > best.get(node, cost):
+            continue
+        if goal_cost is not None and cost >= goal_cost:
+            break
+        chunk_id, cell = node
+        portals = portals_of(chunk_id)
+        if portals is None:
+            continue
+
+        if chunk_id == goal_chunk_id and cell in goal_distances:
+            total = cost + goal_distances[cell]
+            if goal_cost is None or total < goal_cost:
+                goal_cost, goal_via = total, node
+
+        # Entry cells repeat across commands and are cached; the start cell is not.
+        reach = portals.stand_distances(cell, cache=node != (start_chunk_id, start))
+        for neighbor_id, exits in exits_of(chunk_id):
+            for portal in exits:
+                dist = reach.get(portal.stand)
+                if dist is None:
+                    continue
+                nxt = (neighbor_id, portal.arrival)
+                tentative = cost + dist + 1
+                if tentative >= best.get(nxt, tentative + 1):
+                    continue
+                best[nxt] = tentative
+                came_from[nxt] = (node, portal)
+                serial += 1
+                heapq.heappush(open_heap, (tentative, serial, nxt))
+
+    if goal_via is None:
+        return None
+    legs = [RouteLeg(waypoint=goal, edge=None)]
+    cursor = goal_via
+    while cursor in came_from:
+        previous, portal = came_from[cursor]
+        legs.append(RouteLeg(waypoint=portal.stand, edge=portal.edge))
+        cursor = previous
+    legs.reverse()
+    return legs
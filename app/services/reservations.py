@@ -0,0 +1,85 @@
+"""
+Space-time reservations of one chunk for cooperative (WHCA*) planning.
+
+Every executing command claims the cell it will stand on at each tick of its
+path, and its last cell from its arrival tick on. New plans route around
+these claims, and a plan is only committed if its own claims are still free.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.pathfinding import Cell
+
+
+class ReservationTable:
+    def __init__(self, width: int) -> None:
+        self.width = width
+        self._slots: Dict[Tuple[int, int], str] = {}
+        # cell index -> (first tick, agent) for agents that will rest there.
+        self._parked: Dict[int, Tuple[int, str]] = {}
+        self._claims: Dict[str, Tuple[List[Tuple[int, int]], Optional[int]]] = {}
+        # Claim serial per agent, so a plan can ignore claims it already saw.
+        self.serial = 0
+        self._claim_serial: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def claim(self, agent_id: str, *, first_tick: int, cells: Sequence[Cell]) -> None:
+        """Reserve `cells[i]` at tick first_tick + i, and the last cell for good."""
+        self.release(agent_id)
+        width = self.width
+        keys = []
+        for offset, (x, y) in enumerate(cells):
+            key = (first_tick + offset, y * width + x)
+            self._slots[key] = agent_id
+            keys.append(key)
+        last = None
+        if keys:
+            arrival, last = keys[-1]
+            self._parked[last] = (arrival, agent_id)
+        self._claims[agent_id] = (keys, last)
+        self.serial += 1
+        self._claim_serial[agent_id] = self.serial
+
+    def release(self, agent_id: str) -> None:
+        keys, last = self._claims.pop(agent_id, ((), None))
+        self._claim_serial.pop(agent_id, None)
+        for key in keys:
+            if self._slots.get(key) == agent_id:
+                del self._slots[key]
+        if last is not None and self._parked.get(last, (0, None))[1] == agent_id:
+            del self._parked[last]
+
+    def conflicts(self, agent_id: str, *, first_tick: int, cells: Sequence[Cell], newer_than: int = 0) -> bool:
+        """
+        Whether standing on `cells[i]` at tick first_tick + i would collide with
+        another agent's claims made after claim serial `newer_than`. Agents step
+        in accept order, so a newer command must also keep off a cell an older
+        one enters on the following tick.
+        """
+        width = self.width
+        slots = self._slots
+        parked = self._parked
+        claim_serial = self._claim_serial
+
+        def counts(owner: Optional[str]) -> bool:
+            return owner is not None and owner != agent_id and claim_serial.get(owner, 0) > newer_than
+
+        for offset, (x, y) in enumerate(cells):
+            tick = first_tick + offset
+            idx = y * width + x
+            if counts(slots.get((tick, idx))) or counts(slots.get((tick + 1, idx))):
+                return True
+            rest = parked.get(idx)
+            if rest is not None and rest[0] <= tick + 1 and counts(rest[1]):
+                return True
+        return False
+
+    def relative(self, base_tick: int) -> Tuple[List[Tuple[int, int]], Dict[int, int]]:
+        """Claims after `base_tick` as (tick offset, cell index) slots and parked offsets."""
+        slots = [(tick - base_tick, idx) for tick, idx in self._slots if tick > base_tick]
+        parked = {idx: max(0, tick - base_tick) for idx, (tick, _agent) in self._parked.items()}
+        return slots, parked
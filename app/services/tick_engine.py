@@ -1,14 +1,57 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import functools
+import heapq
 import random
 import time
+from array import array
 from collections import deque
-from dataclasses import dataclass
-from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
-
-from app.services.chunk_generation import generate_chunk_tiles
-from app.services.pathfinding import Cell, astar_path
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from app.services.chunk_cache import ChunkKey, ChunkTileCache, chunk_key
+from app.services.chunk_generation import render_tiles
+from app.services.chunk_generation_np import generate_chunk_mask
+from app.services.event_frames import AgentFrame, SpectatorFrame, dump_json, typed_payload_json
+from app.services.pathfinding import (
+    PATH_MODE_ASTAR,
+    PATH_MODE_FLOW,
+    PATH_MODE_JPS,
+    PATH_MODE_WHCA,
+    PATH_MODES,
+    Cell,
+    astar_path,
+    component_labels,
+    cooperative_paths,
+    distance_field,
+    field_steps,
+    field_typecode,
+    grid_pathfinder,
+    jps_path,
+    landmark_tables,
+    plan_paths,
+)
+from app.services.portal_graph import ChunkPortals, Portal, RouteLeg, plan_route
+from app.services.reservations import ReservationTable
+from app.services.tick_scheduler import OVERRUN_CATCH_UP, FixedTimestepScheduler
 
 
 @dataclass
@@ -24,7 +67,7 @@ class ChunkState:
     chunk_id: str
     width: int
     height: int
-    tiles_static: List[str]
+    walkable: bytearray
     neighbors: Dict[str, Optional[str]]
     occupancy: Dict[Cell, str]
     agents: Set[str]
@@ -32,7 +75,34 @@ class ChunkState:
     last_player_left_at: Optional[float]
     pinned: bool
     seed: int
+    gc_deadline: Optional[float] = None
     transition_lock_count: int = 0
+    # Row-major mirror of `occupancy` (1 = an agent stands there) for the pathfinder.
+    occupied: bytearray = field(default_factory=bytearray, repr=False, compare=False)
+    agent_order: List[str] = field(default_factory=list)
+    agent_rows: List[Dict[str, Any]] = field(default_factory=list)
+    dirty_agents: Set[str] = field(default_factory=set)
+    delta_view: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = None
+    static_cache: Optional[Tuple[Dict[str, Any], str]] = field(default=None, repr=False, compare=False)
+    portals: Optional[ChunkPortals] = field(default=None, repr=False, compare=False)
+    # Connected floor region of every cell (0 = wall), labeled once per chunk
+    # off the event loop: by the pregeneration worker, or after the first
+    # same-chunk move_to.
+    components: array = field(default_factory=lambda: array("I"), repr=False, compare=False)
+    component_build: Optional[asyncio.Future] = field(default=None, repr=False, compare=False)
+    # ALT landmark distance tables for A* searches on this chunk, built off the
+    # event loop; searches use plain Manhattan until they are ready.
+    landmarks: List[array] = field(default_factory=list, repr=False, compare=False)
+    landmark_build: Optional[asyncio.Future] = field(default=None, repr=False, compare=False)
+    reservations: Optional[ReservationTable] = field(default=None, repr=False, compare=False)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
+    _tiles: Optional[List[str]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def tiles_static(self) -> List[str]:
+        if self._tiles is None:
+            self._tiles = render_tiles(self.walkable, width=self.width, height=self.height)
+        return self._tiles
 
 
 @dataclass
@@ -45,6 +115,84 @@ class MoveCommand:
     accepted_tick: int
     accepted_order: int
     path_index: int = 0
+    # First path index whose step crosses a chunk edge, and its direction.
+    exit_step: Optional[int] = None
+    exit_direction: Optional[str] = None
+    # Set when the agent leaves while the command still sits in a pending deque;
+    # the deque entry is skipped at promotion instead of being searched for.
+    cancelled: bool = False
+    # Cross-chunk moves: `path` covers the current chunk only and the remaining
+    # legs are refined into cells one chunk at a time, on arrival.
+    target_chunk_id: Optional[str] = None
+    legs: List[RouteLeg] = field(default_factory=list)
+    # Chunk whose reservation table holds this command's claims (whca mode).
+    reserved_in: Optional[str] = None
+    # Consecutive ticks spent waiting for a moving agent to clear the next cell.
+    blocked_ticks: int = 0
+    # flow mode: the distance field to the target shared by every move to it;
+    # `path` stays empty and each step is looked up in the field.
+    flow: Optional[array] = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class PlanRequest:
+    """A validated move_to waiting to be path-planned and committed by a tick."""
+
+    agent_id: str
+    server_cmd_id: str
+    target_x: int
+    target_y: int
+    target_chunk_id: Optional[str]
+    # Resolved with the accepted tick, or with a TickEngineError.
+    future: asyncio.Future
+    # Times a finished plan was discarded because its agent moved or its path got occupied.
+    stale_plans: int = 0
+
+
+@dataclass
+class PlannedMove:
+    """A path planned off a snapshot, waiting for the tick to commit it."""
+
+    request: PlanRequest
+    chunk_id: str
+    start: Cell
+    goal: Cell
+    first_leg: Optional[RouteLeg] = None
+    legs: List[RouteLeg] = field(default_factory=list)
+    path: Optional[List[Cell]] = None
+    error: Optional[str] = None
+    # whca mode: the tick the plan's time offsets count from, and the last
+    # reservation claim it was planned around.
+    base_tick: int = 0
+    reservation_serial: int = 0
+    flow: Optional[array] = None
+
+
+@dataclass
+class PendingNeighbor:
+    """A neighbor chunk whose id and seed are fixed while its tiles generate off-loop."""
+
+    chunk_id: str
+    seed: int
+    required_edges: Set[str]
+    future: Optional[asyncio.Future] = None
+    dropped: bool = False
+
+
+@dataclass
+class MoveStep:
+    chunk_events: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    finished: List[Tuple[MoveCommand, str, Optional[Dict[str, Any]]]] = field(default_factory=list)
+    transitions: List[Tuple[str, Dict[str, Any], str]] = field(default_factory=list)
+
+
+def _pregenerate_chunk(
+    *, width: int, height: int, seed: int, required_edges: Set[str], landmark_count: int = 0
+) -> Tuple[bytearray, array, List[array]]:
+    """Pregeneration worker job: a neighbor's mask, component labels and landmark tables."""
+    walkable = generate_chunk_mask(width=width, height=height, seed=seed, required_edges=required_edges)
+    labels = component_labels(walkable, width, height)
+    return walkable, labels, landmark_tables(walkable, width, height, landmark_count, labels=labels)
 
 
 class TickEngineError(Exception):
@@ -57,6 +205,10 @@ class InMemoryTickEngine:
     DIRECTIONS = ("N", "E", "S", "W")
     OPPOSITE_DIR = {"N": "S", "E": "W", "S": "N", "W": "E"}
     DEMO_PLAYER_ID = "demo-player"
+    # Searches per worker task when a batch is planned on the executor.
+    PLAN_SLICE_SIZE = 32
+    # After this many stale plans a move is rejected as stale_plan.
+    MAX_STALE_PLANS = 2
 
     def __init__(
         self,
@@ -67,6 +219,22 @@ class InMemoryTickEngine:
         sse_replay_max_events: int = 300,
         enable_demo_actors: bool = False,
         clock: Optional[Callable[[], float]] = None,
+        overrun_policy: str = OVERRUN_CATCH_UP,
+        max_catch_up_ticks: int = 3,
+        pregeneration_workers: int = 0,
+        pregeneration_band: int = 8,
+        chunk_executor: Optional[Executor] = None,
+        chunk_cache: Optional[ChunkTileCache] = None,
+        path_mode: str = PATH_MODE_ASTAR,
+        reservation_window: int = 16,
+        block_wait_ticks: int = 0,
+        block_detour_steps: int = 0,
+        flow_field_ttl_ticks: int = 25,
+        landmark_count: int = 0,
+        landmark_max_bytes: int = 0,
+        planning_workers: int = 0,
+        planning_pool_min_batch: int = 32,
+        planning_executor: Optional[Executor] = None,
     ) -> None:
         self.tick_hz = tick_hz
         self.width = width
@@ -74,20 +242,70 @@ class InMemoryTickEngine:
         self.chunk_gc_ttl_seconds = chunk_gc_ttl_seconds
         self.sse_replay_max_events = max(1, sse_replay_max_events)
         self._clock = clock or time.time
+        if path_mode not in PATH_MODES:
+            raise ValueError(f"unknown path mode: {path_mode}")
+        self.path_mode = path_mode
+        # whca mode: ticks over which new plans wait and detour around reservations.
+        self.reservation_window = max(1, reservation_window)
+        # Opt-in repair of a step blocked by another agent: wait up to
+        # block_wait_ticks for a moving agent to clear the cell, then try a
+        # local detour that rejoins the path within block_detour_steps cells.
+        # With both at 0 a blocked step fails the command at once.
+        self.block_wait_ticks = max(0, block_wait_ticks)
+        self.block_detour_steps = max(0, block_detour_steps)
+        # flow mode: (chunk_id, goal) -> (field, tick after which it is dropped).
+        # Every lookup extends the entry; commands keep their own reference.
+        self.flow_field_ttl_ticks = max(1, flow_field_ttl_ticks)
+        self._flow_fields: Dict[Tuple[str, Cell], Tuple[array, int]] = {}
+        # Landmark tables per chunk for the A* heuristic, one distance field each
+        # (0 keeps plain Manhattan). landmark_max_bytes caps them per chunk; 0
+        # sizes the budget from the chunk so every requested table fits.
+        # pathfinding_stats reports requested and effective counts side by side.
+        cells = width * height
+        table_bytes = array(field_typecode(cells)).itemsize * cells
+        self.landmarks_requested = max(0, landmark_count)
+        self.landmark_max_bytes = max(0, landmark_max_bytes) or self.landmarks_requested * table_bytes
+        self.landmark_count = min(self.landmarks_requested, self.landmark_max_bytes // table_bytes)
+        # With an executor, neighbor tiles are generated off the event loop as soon
+        # as a command's path gets within pregeneration_band steps of a chunk edge.
+        self.pregeneration_band = max(0, pregeneration_band)
+        self._owns_chunk_executor = chunk_executor is None and pregeneration_workers > 0
+        if self._owns_chunk_executor:
+            chunk_executor = ProcessPoolExecutor(max_workers=pregeneration_workers)
+        self._chunk_executor = chunk_executor
+        self._pending_neighbors: Dict[Tuple[str, str], PendingNeighbor] = {}
+        self._chunk_cache = chunk_cache if chunk_cache is not None else ChunkTileCache()
+        # Move submissions are planned together at the next tick boundary; batches
+        # of at least planning_pool_min_batch go to the planning executor.
+        self.planning_pool_min_batch = max(1, planning_pool_min_batch)
+        self._owns_planning_executor = planning_executor is None and planning_workers > 0
+        if self._owns_planning_executor:
+            planning_executor = ProcessPoolExecutor(max_workers=planning_workers)
+        self._planning_executor = planning_executor
+        self._plan_queue: List[PlanRequest] = []
+        self._planning: Dict[str, PlanRequest] = {}
+        self._planned: List[PlannedMove] = []
+        self._plan_task: Optional[asyncio.Task] = None
 
         self._tick = 0
         self._accept_serial = 0
         self._chunk_serial = 0
         self._agents: Dict[str, AgentEntity] = {}
+        # See _step_commands for the tick phases.
         self._pending: Deque[MoveCommand] = deque()
         self._executing: Dict[str, MoveCommand] = {}
-        self._agent_active_cmd: Dict[str, str] = {}
+        self._agent_active_cmd: Dict[str, MoveCommand] = {}
         self._neighbor_lock_refcnt: Dict[Tuple[str, str], int] = {}
+        self._dirty_chunks: Set[str] = set()
+        # (deadline, serial, chunk) for every empty unpinned chunk. Entries are
+        # invalidated lazily: an entry only counts while chunk.gc_deadline matches.
+        self._gc_heap: List[Tuple[float, int, ChunkState]] = []
+        self._gc_serial = 0
 
         self._listeners: Dict[str, Set[asyncio.Queue]] = {}
         self._owner_listeners: Dict[str, Set[asyncio.Queue]] = {}
         self._spectator_listeners: Dict[str, Set[asyncio.Queue]] = {}
-        self._spectator_history: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._spectator_history: Dict[str, Deque[SpectatorFrame]] = {}
         self._spectator_seq: Dict[str, int] = {}
         self._enable_demo_actors = enable_demo_actors
         self._demo_overlays: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
@@ -99,7 +317,17 @@ class InMemoryTickEngine:
         if self._enable_demo_actors:
             self._demo_overlays[root.chunk_id] = self._build_demo_overlays(root)
 
-        self._lock = asyncio.Lock()
+        # Lock hierarchy: the world lock guards chunk creation/removal and the command
+        # queues; each ChunkState.lock guards that chunk's occupancy and agent set.
+        # Chunk locks are always taken after the world lock and in chunk_id order.
+        # Listener registries are only touched between awaits and need no lock.
+        self._world_lock = asyncio.Lock()
+        self._scheduler = FixedTimestepScheduler(
+            tick_hz=tick_hz,
+            tick=self.tick_once,
+            overrun_policy=overrun_policy,
+            max_catch_up_ticks=max_catch_up_ticks,
+        )
         self._task: Optional[asyncio.Task] = None
 
     @property
@@ -113,7 +341,12 @@ class InMemoryTickEngine:
     async def start(self) -> None:
         if self._task is not None and not self._task.done():
             return
-        self._task = asyncio.create_task(self._run_loop())
+        if self._owns_chunk_executor and self._chunk_executor is not None:
+            # Spawn the pool's workers now rather than on the first edge approach.
+            await asyncio.get_running_loop().run_in_executor(self._chunk_executor, int)
+        if self._owns_planning_executor and self._planning_executor is not None:
+            await asyncio.get_running_loop().run_in_executor(self._planning_executor, int)
+        self._task = asyncio.create_task(self._scheduler.run())
 
     async def stop(self) -> None:
         if self._task is None:
@@ -124,48 +357,77 @@ class InMemoryTickEngine:
         except asyncio.CancelledError:
             pass
         self._task = None
-
-    async def _run_loop(self) -> None:
-        interval = 1.0 / max(1, self.tick_hz)
-        while True:
-            started = time.perf_counter()
-            await self.tick_once()
-            elapsed = time.perf_counter() - started
-            await asyncio.sleep(max(0.0, interval - elapsed))
+        if self._plan_task is not None:
+            self._plan_task.cancel()
+            try:
+                await self._plan_task
+            except asyncio.CancelledError:
+                pass
+            self._plan_task = None
+        # Nothing commits plans without the tick loop; settle what is left now.
+        async with self._world_lock:
+            batch, self._plan_queue = self._plan_queue, []
+            self._planned.extend(self._solve_batch_now(batch))
+            self._commit_planned(accepted_tick=self._tick + 1)
+        if self._owns_chunk_executor and self._chunk_executor is not None:
+            self._chunk_executor.shutdown(wait=False, cancel_futures=True)
+            self._chunk_executor = None
+        if self._owns_planning_executor and self._planning_executor is not None:
+            self._planning_executor.shutdown(wait=False, cancel_futures=True)
+            self._planning_executor = None
+        self._chunk_cache.close()
+
+    def tick_stats(self) -> Dict[str, Any]:
+        return {"tick": self._tick, **self._scheduler.snapshot()}
+
+    def chunk_cache_stats(self) -> Dict[str, Any]:
+        return self._chunk_cache.snapshot()
+
+    def pathfinding_stats(self) -> Dict[str, Any]:
+        """Memory held by per-chunk pathfinding tables, for the health endpoint."""
+        landmark_bytes = [
+            sum(table.itemsize * len(table) for table in chunk.landmarks) for chunk in self._chunks.values()
+        ]
+        return {
+            "landmarks_requested": self.landmarks_requested,
+            "landmarks_per_chunk": self.landmark_count,
+            "landmark_max_bytes": self.landmark_max_bytes,
+            "landmark_bytes": sum(landmark_bytes),
+            "landmark_bytes_per_chunk": max(landmark_bytes, default=0),
+            "stand_field_bytes": sum(chunk.portals.field_bytes() for chunk in self._chunks.values() if chunk.portals),
+            "flow_fields": len(self._flow_fields),
+            "flow_field_bytes": sum(flow.itemsize * len(flow) for flow, _until in self._flow_fields.values()),
+        }
 
     async def register_listener(self, agent_id: str) -> asyncio.Queue:
         queue: asyncio.Queue = asyncio.Queue(maxsize=256)
-        async with self._lock:
-            self._listeners.setdefault(agent_id, set()).add(queue)
+        self._listeners.setdefault(agent_id, set()).add(queue)
         return queue
 
     async def unregister_listener(self, agent_id: str, queue: asyncio.Queue) -> None:
-        async with self._lock:
-            listeners = self._listeners.get(agent_id)
-            if not listeners:
-                return
-            listeners.discard(queue)
-            if not listeners:
-                self._listeners.pop(agent_id, None)
+        listeners = self._listeners.get(agent_id)
+        if not listeners:
+            return
+        listeners.discard(queue)
+        if not listeners:
+            self._listeners.pop(agent_id, None)
 
     async def register_owner_listener(self, agent_id: str) -> asyncio.Queue:
         queue: asyncio.Queue = asyncio.Queue(maxsize=512)
-        async with self._lock:
-            self._owner_listeners.setdefault(agent_id, set()).add(queue)
+        self._owner_listeners.setdefault(agent_id, set()).add(queue)
         return queue
 
     async def unregister_owner_listener(self, agent_id: str, queue: asyncio.Queue) -> None:
-        async with self._lock:
-            listeners = self._owner_listeners.get(agent_id)
-            if not listeners:
-                return
-            listeners.discard(queue)
-            if not listeners:
-                self._owner_listeners.pop(agent_id, None)
+        listeners = self._owner_listeners.get(agent_id)
+        if not listeners:
+            return
+        listeners.discard(queue)
+        if not listeners:
+            self._owner_listeners.pop(agent_id, None)
 
-    async def emit_owner_event(self, agent_id: str, message: Dict[str, Any]) -> None:
-        async with self._lock:
-            self._emit_to_owner(agent_id, message)
+    async def emit_owner_event(self, agent_id: str, message: Union[AgentFrame, Dict[str, Any]]) -> None:
+        if agent_id in self._owner_listeners:
+            self._emit_to_owner(agent_id, AgentFrame.from_message(message))
 
     async def open_spectator_feed(
         self,
@@ -173,8 +435,7 @@ class InMemoryTickEngine:
         chunk_id: str,
         last_event_id: Optional[str],
     ) -> Dict[str, Any]:
-        async with self._lock:
-            chunk = self._resolve_chunk(chunk_id=chunk_id, agent_id=None)
+        async with self._locked_chunk(chunk_id=chunk_id, agent_id=None) as chunk:
             self._ensure_spectator_chunk(chunk.chunk_id)
 
             queue: asyncio.Queue = asyncio.Queue(maxsize=512)
@@ -190,47 +451,49 @@ class InMemoryTickEngine:
                 "chunk_id": chunk.chunk_id,
                 "replay_events": replay_events,
                 "resync_required": resync_required,
-                "chunk_static": self._build_chunk_static_payload(chunk),
+                "chunk_static_json": self._build_chunk_static_json(chunk),
                 "chunk_delta": self._build_chunk_delta_payload(chunk, events=[]),
             }
 
     async def unregister_spectator_listener(self, chunk_id: str, queue: asyncio.Queue) -> None:
-        async with self._lock:
-            listeners = self._spectator_listeners.get(chunk_id)
-            if not listeners:
-                return
-            listeners.discard(queue)
-            if not listeners:
-                self._spectator_listeners.pop(chunk_id, None)
+        listeners = self._spectator_listeners.get(chunk_id)
+        if not listeners:
+            return
+        listeners.discard(queue)
+        if not listeners:
+            self._spectator_listeners.pop(chunk_id, None)
 
     async def chunk_snapshot_payload(self, *, chunk_id: str) -> Dict[str, Any]:
-        async with self._lock:
-            chunk = self._resolve_chunk(chunk_id=chunk_id, agent_id=None)
-            static_payload = self._build_chunk_static_payload(chunk)
-
-            latest_delta: Optional[Dict[str, Any]] = None
-            history = self._spectator_history.get(chunk.chunk_id)
-            if history:
-                for event in reversed(history):
-                    if event["event"] == "chunk_delta":
-                        latest_delta = dict(event["data"])
-                        break
-
-            if latest_delta is None:
-                latest_delta = self._build_chunk_delta_payload(chunk, events=[])
-
+        async with self._locked_chunk(chunk_id=chunk_id, agent_id=None) as chunk:
             return {
-                "chunk_static": static_payload,
-                "latest_delta": latest_delta,
+                "chunk_static": self._build_chunk_static_payload(chunk),
+                "latest_delta": self._latest_delta_payload(chunk),
             }
 
+    async def chunk_snapshot_json(self, *, chunk_id: str) -> str:
+        async with self._locked_chunk(chunk_id=chunk_id, agent_id=None) as chunk:
+            static_json = self._build_chunk_static_json(chunk)
+            delta_json = dump_json(self._latest_delta_payload(chunk))
+            return f'{{"chunk_static":{static_json},"latest_delta":{delta_json}}}'
+
+    def _latest_delta_payload(self, chunk: ChunkState) -> Dict[str, Any]:
+        history = self._spectator_history.get(chunk.chunk_id)
+        if history:
+            for event in reversed(history):
+                if event["event"] == "chunk_delta":
+                    return dict(event["data"])
+        return self._build_chunk_delta_payload(chunk, events=[])
+
     async def ensure_agent(self, agent_id: str) -> AgentEntity:
-        async with self._lock:
+        existing = self._agents.get(agent_id)
+        if existing:
+            return existing
+
+        async with self._locked_chunk(chunk_id=self._root_chunk_id, agent_id=None) as chunk:
             existing = self._agents.get(agent_id)
             if existing:
                 return existing
 
-            chunk = self._chunks[self._root_chunk_id]
             preferred = self._preferred_spawn_cell(chunk=chunk, agent_id=agent_id)
             if preferred is not None and preferred not in chunk.occupancy:
                 entity = AgentEntity(
@@ -240,61 +503,48 @@ class InMemoryTickEngine:
                     y=preferred[1],
                 )
                 self._agents[agent_id] = entity
-                chunk.occupancy[preferred] = agent_id
-                chunk.agents.add(agent_id)
-                chunk.last_player_left_at = None
+                self._attach_agent(chunk, entity)
                 return entity
 
-            for y in range(1, self.height - 1):
-                for x in range(1, self.width - 1):
-                    pos = (x, y)
-                    if not self._is_walkable(chunk, x, y):
-                        continue
-                    if pos not in chunk.occupancy:
-                        entity = AgentEntity(
-                            agent_id=agent_id,
-                            chunk_id=chunk.chunk_id,
-                            x=x,
-                            y=y,
-                        )
-                        self._agents[agent_id] = entity
-                        chunk.occupancy[pos] = agent_id
-                        chunk.agents.add(agent_id)
-                        chunk.last_player_left_at = None
-                        return entity
+            for x, y in self._iter_walkable_cells(chunk, margin=1):
+                if (x, y) not in chunk.occupancy:
+                    entity = AgentEntity(
+                        agent_id=agent_id,
+                        chunk_id=chunk.chunk_id,
+                        x=x,
+                        y=y,
+                    )
+                    self._agents[agent_id] = entity
+                    self._attach_agent(chunk, entity)
+                    return entity
 
         raise TickEngineError("no_spawn_available")
 
     async def remove_agent(self, agent_id: str) -> None:
-        async with self._lock:
-            self._agent_active_cmd.pop(agent_id, None)
-
-            stale_ids = [
-                cmd.server_cmd_id for cmd in self._pending if cmd.agent_id == agent_id
-            ]
-            if stale_ids:
-                self._pending = deque(cmd for cmd in self._pending if cmd.agent_id != agent_id)
-                for sid in stale_ids:
-                    self._executing.pop(sid, None)
-
-            for cmd_id, cmd in list(self._executing.items()):
-                if cmd.agent_id == agent_id:
-                    self._executing.pop(cmd_id, None)
-
-            entity = self._agents.pop(agent_id, None)
-            if entity is not None:
-                chunk = self._chunks.get(entity.chunk_id)
-                if chunk is not None:
-                    chunk.occupancy.pop((entity.x, entity.y), None)
-                    chunk.agents.discard(agent_id)
-                    if not chunk.agents:
-                        chunk.last_player_left_at = self._clock()
+        async with self._world_lock:
+            active = self._agent_active_cmd.pop(agent_id, None)
+            if active is not None:
+                active.cancelled = True
+                self._executing.pop(active.server_cmd_id, None)
+                self._release_claim(active)
+            queued = self._planning.pop(agent_id, None)
+            if queued is not None and not queued.future.done():
+                queued.future.set_exception(TickEngineError("agent_not_found"))
+                # The submitter is usually being cancelled along with the agent's
+                # connection; mark the error retrieved so it is not logged as lost.
+                queued.future.exception()
+
+            entity = self._agents.get(agent_id)
+            chunk = self._chunks.get(entity.chunk_id) if entity is not None else None
+            async with self._chunk_locks([chunk] if chunk is not None else []):
+                entity = self._agents.pop(agent_id, None)
+                if entity is not None and chunk is not None:
+                    self._detach_agent(chunk, entity)
 
             self._reset_world_if_idle_locked()
 
     async def has_active_command(self, agent_id: str) -> bool:
-        async with self._lock:
-            return agent_id in self._agent_active_cmd
+        return agent_id in self._agent_active_cmd or agent_id in self._planning
 
     async def submit_move_command(
         self,
@@ -303,93 +553,632 @@ class InMemoryTickEngine:
         server_cmd_id: str,
         target_x: int,
         target_y: int,
+        target_chunk_id: Optional[str] = None,
     ) -> int:
-        async with self._lock:
-            agent = self._agents.get(agent_id)
-            if agent is None:
-                raise TickEngineError("agent_not_found")
-
-            if agent_id in self._agent_active_cmd:
+        """
+        Validate a move and queue it for path planning.
+
+        Queued moves are planned in batches by a background task, outside every
+        engine lock, and the next tick commits the finished plans. Returns the
+        accepted tick once that has happened, so callers acknowledge only planned
+        commands. Planning failures raise TickEngineError like validation
+        failures do.
+        """
+        async with self._locked_chunk(chunk_id=None, agent_id=agent_id) as chunk:
+            if agent_id in self._agent_active_cmd or agent_id in self._planning:
                 raise TickEngineError("busy")
 
             if not (0 <= target_x < self.width and 0 <= target_y < self.height):
                 raise TickEngineError("out_of_bounds")
 
-            chunk = self._chunks.get(agent.chunk_id)
-            if chunk is None:
-                raise TickEngineError("chunk_not_found")
-
-            start = (agent.x, agent.y)
-            goal = (target_x, target_y)
+            if target_chunk_id == chunk.chunk_id:
+                target_chunk_id = None
+            goal_chunk = chunk
+            if target_chunk_id is not None:
+                goal_chunk = self._chunks.get(target_chunk_id)
+                if goal_chunk is None:
+                    raise TickEngineError("chunk_not_found")
 
-            if not self._is_walkable(chunk, target_x, target_y):
+            if not self._is_walkable(goal_chunk, target_x, target_y):
+                raise TickEngineError("unreachable")
+            agent = self._agents[agent_id]
+            if target_chunk_id is None and self._cannot_reach(chunk, (agent.x, agent.y), (target_x, target_y)):
                 raise TickEngineError("unreachable")
 
-            def is_blocked(cell: Cell) -> bool:
-                if not self._is_walkable(chunk, cell[0], cell[1]):
-                    return True
-                occ = chunk.occupancy.get(cell)
-                if occ is None:
-                    return False
-                return occ != agent_id
+            request = PlanRequest(
+                agent_id=agent_id,
+                server_cmd_id=server_cmd_id,
+                target_x=target_x,
+                target_y=target_y,
+                target_chunk_id=target_chunk_id,
+                future=asyncio.get_running_loop().create_future(),
+            )
+            self._planning[agent_id] = request
+            if self._is_running():
+                self._plan_queue.append(request)
+                self._kick_planner()
+            else:
+                # No tick loop to commit plans: plan and commit right here.
+                self._planned.extend(self._solve_batch_now([request]))
+                self._commit_planned(accepted_tick=self._tick + 1)
+        return await request.future
+
+    def _cannot_reach(self, chunk: ChunkState, start: Cell, goal: Cell) -> bool:
+        """
+        Constant-time rejection of moves no planner could find a path for: the
+        two cells lie in different floor regions, or one of them is boxed in by
+        walls and resting agents. Agents with a command may still step aside,
+        so only resting agents count.
+
+        The region check needs the chunk's labels and is skipped until they are
+        built. The occupancy check only looks at the four cells around start and
+        goal, so an agent pocket or corridor wider than one cell is left to the
+        search, like anything else.
+        """
+        if start == goal:
+            return False
+        width = chunk.width
+        labels = self._chunk_components(chunk)
+        if labels and labels[start[1] * width + start[0]] != labels[goal[1] * width + goal[0]]:
+            return True
+        return self._boxed_in(chunk, start, goal) or self._boxed_in(chunk, goal, start)
+
+    def _chunk_components(self, chunk: ChunkState) -> array:
+        """
+        The chunk's component labels, or an empty array until they are built.
+        The first call starts the labeling on the chunk executor, or on the
+        loop's default thread pool without one, as for landmark tables.
+        """
+        if chunk.components or chunk.component_build is not None:
+            return chunk.components
+        chunk.component_build = asyncio.get_running_loop().run_in_executor(
+            self._chunk_executor,
+            functools.partial(component_labels, bytes(chunk.walkable), chunk.width, chunk.height),
+        )
+        chunk.component_build.add_done_callback(functools.partial(self._components_built, chunk))
+        return chunk.components
 
-            path = astar_path(
-                width=self.width,
-                height=self.height,
-                start=start,
-                goal=goal,
-                is_blocked=is_blocked,
+    @staticmethod
+    def _components_built(chunk: ChunkState, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            # Try again on the next move_to.
+            chunk.component_build = None
+            return
+        chunk.components = future.result()
+
+    def _boxed_in(self, chunk: ChunkState, cell: Cell, other: Cell) -> bool:
+        x, y = cell
+        for nxt in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if nxt == other:
+                return False
+            if not (0 <= nxt[0] < chunk.width and 0 <= nxt[1] < chunk.height):
+                continue
+            if not chunk.walkable[nxt[1] * chunk.width + nxt[0]]:
+                continue
+            occupant = chunk.occupancy.get(nxt)
+            if occupant is None or occupant in self._agent_active_cmd or occupant in self._planning:
+                return False
+        return True
+
+    def _is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _kick_planner(self) -> None:
+        if self._plan_task is None or self._plan_task.done():
+            self._plan_task = asyncio.get_running_loop().create_task(self._run_planner())
+
+    async def _run_planner(self) -> None:
+        # Plans are computed without holding any engine lock, so a long batch never
+        # delays a tick; the tick only commits results that are ready.
+        while self._plan_queue:
+            batch, self._plan_queue = self._plan_queue, []
+            try:
+                planned = await self._solve_batch(batch)
+            except asyncio.CancelledError:
+                self._plan_queue[:0] = batch
+                raise
+            except Exception:
+                # A failed search must not strand the batch's submitters or the planner.
+                for request in batch:
+                    if self._planning.get(request.agent_id) is request:
+                        self._finish_plan(request, error="planning_failed")
+                continue
+            self._planned.extend(planned)
+
+    def _snapshot_batch(
+        self, batch: List[PlanRequest]
+    ) -> Tuple[List[PlannedMove], List[Tuple[List[int], Callable[[], List[Optional[List[Cell]]]]]]]:
+        """
+        Read everything a batch needs in one synchronous step: agent positions and
+        one copy of each chunk's walkable and occupancy masks,
+        shared by all searches on that chunk. Returns the moves and the search
+        calls that fill in their paths.
+        """
+        planned: List[PlannedMove] = []
+        for request in batch:
+            if self._planning.get(request.agent_id) is not request:
+                continue
+            if request.future.done():
+                # The submitter was cancelled; free the agent for new commands.
+                self._finish_plan(request)
+                continue
+            agent = self._agents.get(request.agent_id)
+            chunk = self._chunks.get(agent.chunk_id) if agent is not None else None
+            if agent is None or chunk is None:
+                self._finish_plan(request, error="agent_not_found")
+                continue
+            move = PlannedMove(
+                request=request,
+                chunk_id=chunk.chunk_id,
+                start=(agent.x, agent.y),
+                goal=(request.target_x, request.target_y),
             )
-            if path is None:
-                raise TickEngineError("unreachable")
+            if request.target_chunk_id is not None:
+                route = plan_route(
+                    start_chunk_id=chunk.chunk_id,
+                    start=move.start,
+                    goal_chunk_id=request.target_chunk_id,
+                    goal=move.goal,
+                    portals_of=self._loaded_chunk_portals,
+                    exits_of=self._chunk_exits,
+                )
+                if route is None:
+                    move.error = "unreachable"
+                else:
+                    move.first_leg, move.legs = route[0], route[1:]
+                    move.goal = route[0].waypoint
+            planned.append(move)
+
+        # Group by the grid each search runs on: the chunk, and for the first leg of
+        # a cross-chunk route its interior mask.
+        groups: Dict[Tuple[str, bool], List[int]] = {}
+        for idx, move in enumerate(planned):
+            if move.error is not None:
+                continue
+            if move.first_leg is None and self.path_mode == PATH_MODE_FLOW:
+                chunk = self._chunks[move.chunk_id]
+                move.flow = self._flow_field(chunk, move.goal)
+                move.path = []
+                if move.start != move.goal and not field_steps(move.flow, move.start, chunk.width, chunk.height):
+                    move.error = "unreachable"
+                continue
+            if self.path_mode != PATH_MODE_WHCA:
+                # A leg towards a portal, or a same-chunk goal on a crossable edge
+                # cell, is read off the portal stand's distance field.
+                chunk = self._chunks[move.chunk_id]
+                leg = move.first_leg or self._edge_goal_leg(chunk, move.start, move.goal)
+                if leg is not None:
+                    move.path = self._exit_descent(chunk, move.start, leg)
+                    if move.path is not None:
+                        continue
+            groups.setdefault((move.chunk_id, move.first_leg is not None), []).append(idx)
+
+        use_pool = self._planning_executor is not None and len(planned) >= self.planning_pool_min_batch
+        calls: List[Tuple[List[int], Callable[[], List[Optional[List[Cell]]]]]] = []
+        for (chunk_id, is_leg), members in groups.items():
+            chunk = self._chunks[chunk_id]
+            walkable = bytes(self._chunk_portals(chunk).interior if is_leg else chunk.walkable)
+            if self.path_mode == PATH_MODE_WHCA:
+                # One call per chunk: each plan reserves its slots for the next one.
+                calls.append((members, self._cooperative_call(chunk, walkable, [planned[idx] for idx in members])))
+                continue
+            blocked = bytes(chunk.occupied)
+            step = self.PLAN_SLICE_SIZE if use_pool else len(members)
+            for offset in range(0, len(members), step):
+                members_slice = members[offset : offset + step]
+                call = functools.partial(
+                    plan_paths,
+                    width=self.width,
+                    height=self.height,
+                    jobs=[(planned[idx].start, planned[idx].goal) for idx in members_slice],
+                    walkable=walkable,
+                    blocked=blocked,
+                    mode=self.path_mode,
+                    landmarks=self._chunk_landmarks(chunk),
+                )
+                calls.append((members_slice, call))
+        return planned, calls
+
+    def _cooperative_call(
+        self, chunk: ChunkState, walkable: bytes, moves: List[PlannedMove]
+    ) -> Callable[[], List[Optional[List[Cell]]]]:
+        # Agents that are executing a command are covered by their reservations,
+        # so only resting agents stay static obstacles.
+        blocked = bytearray(chunk.occupied)
+        for agent_id in self._agent_active_cmd:
+            agent = self._agents.get(agent_id)
+            if agent is not None and agent.chunk_id == chunk.chunk_id:
+                blocked[agent.y * chunk.width + agent.x] = 0
+        # The next tick commits these plans, so tick offsets count from this one.
+        table = self._reservations(chunk)
+        reserved, parked = table.relative(self._tick)
+        for move in moves:
+            move.base_tick = self._tick
+            move.reservation_serial = table.serial
+        return functools.partial(
+            cooperative_paths,
+            width=self.width,
+            height=self.height,
+            jobs=[(move.start, move.goal) for move in moves],
+            walkable=walkable,
+            blocked=bytes(blocked),
+            reserved=reserved,
+            parked=parked,
+            window=self.reservation_window,
+        )
+
+    async def _solve_batch(self, batch: List[PlanRequest]) -> List[PlannedMove]:
+        planned, calls = self._snapshot_batch(batch)
+        if not calls:
+            return planned
+        # Batches too small for the pool run on the loop's default thread pool
+        # (each thread has its own GridPathfinder). The searches hold the GIL,
+        # but the interpreter hands it back to the loop every switch interval,
+        # so the scheduler keeps firing while they run.
+        executor = self._planning_executor if len(planned) >= self.planning_pool_min_batch else None
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, call) for _members, call in calls),
+            return_exceptions=True,
+        )
+        return self._fill_paths(planned, calls, results)
+
+    def _solve_batch_now(self, batch: List[PlanRequest]) -> List[PlannedMove]:
+        planned, calls = self._snapshot_batch(batch)
+        return self._fill_paths(planned, calls, [call() for _members, call in calls])
 
+    @staticmethod
+    def _fill_paths(
+        planned: List[PlannedMove],
+        calls: List[Tuple[List[int], Callable[[], List[Optional[List[Cell]]]]]],
+        results: List[Any],
+    ) -> List[PlannedMove]:
+        for (members, call), result in zip(calls, results):
+            if isinstance(result, BaseException):
+                result = call()
+            for idx, path in zip(members, result):
+                move = planned[idx]
+                if path is None:
+                    move.error = "unreachable"
+                    continue
+                if move.first_leg is not None and move.first_leg.edge is not None:
+                    path.append(move.first_leg.edge)
+                move.path = path
+        return planned
+
+    def _commit_planned(self, *, accepted_tick: int) -> None:
+        """
+        Turn ready plans into commands, in the order they were planned. A plan is
+        only committed if its agent still stands where it was planned from and no
+        cell on its path has been occupied since the snapshot; otherwise the move
+        is planned again, off the tick and ahead of newer submits. Agents moving
+        elsewhere in the chunk do not invalidate it.
+        """
+        ready, self._planned = self._planned, []
+        replan: List[PlanRequest] = []
+        for move in ready:
+            request = move.request
+            if self._planning.get(request.agent_id) is not request:
+                continue
+            if request.future.done():
+                # The submitter was cancelled; free the agent for new commands.
+                self._finish_plan(request)
+                continue
+            agent = self._agents.get(request.agent_id)
+            chunk = self._chunks.get(move.chunk_id)
+            if agent is None:
+                self._finish_plan(request, error="agent_not_found")
+                continue
+            if (
+                chunk is None
+                or agent.chunk_id != move.chunk_id
+                or (agent.x, agent.y) != move.start
+                or not self._path_still_free(chunk, move, accepted_tick=accepted_tick)
+            ):
+                request.stale_plans += 1
+                if request.stale_plans > self.MAX_STALE_PLANS:
+                    # Searching again here would stall the tick; let the submitter retry.
+                    self._finish_plan(request, error="stale_plan")
+                else:
+                    replan.append(request)
+                continue
+            if move.error is not None or move.path is None:
+                self._finish_plan(request, error=move.error or "unreachable")
+                continue
+            exit_step, exit_direction = self._find_exit(move.path, start=move.start)
             self._accept_serial += 1
-            accepted_tick = self._tick + 1
             cmd = MoveCommand(
-                server_cmd_id=server_cmd_id,
-                agent_id=agent_id,
-                target_x=target_x,
-                target_y=target_y,
-                path=path,
+                server_cmd_id=request.server_cmd_id,
+                agent_id=request.agent_id,
+                target_x=request.target_x,
+                target_y=request.target_y,
+                path=move.path,
                 accepted_tick=accepted_tick,
                 accepted_order=self._accept_serial,
+                exit_step=exit_step,
+                exit_direction=exit_direction,
+                target_chunk_id=request.target_chunk_id,
+                legs=move.legs,
+                flow=move.flow,
             )
             self._pending.append(cmd)
-            self._agent_active_cmd[agent_id] = server_cmd_id
-            return accepted_tick
+            self._agent_active_cmd[request.agent_id] = cmd
+            self._claim_path(cmd, self._chunks[move.chunk_id], first_tick=accepted_tick)
+            self._finish_plan(request, accepted_tick=accepted_tick)
+
+        if replan:
+            self._plan_queue[:0] = replan
+            if self._is_running():
+                self._kick_planner()
+            else:
+                batch, self._plan_queue = self._plan_queue, []
+                self._planned.extend(self._solve_batch_now(batch))
+
+    def _path_still_free(self, chunk: ChunkState, move: PlannedMove, *, accepted_tick: int) -> bool:
+        if move.path is None:
+            return True
+        if self.path_mode == PATH_MODE_WHCA:
+            # Only the windowed part was planned around reservations, and only
+            # claims made since then can invalidate it, unless the commit came
+            # later than planned. Resting agents count on the whole path.
+            newer_than = move.reservation_serial if accepted_tick == move.base_tick + 1 else 0
+            if self._reservations(chunk).conflicts(
+                move.request.agent_id,
+                first_tick=accepted_tick,
+                cells=move.path[: self.reservation_window],
+                newer_than=newer_than,
+            ):
+                return False
+            occupancy = chunk.occupancy
+            return not any(
+                (occupant := occupancy.get(cell)) is not None
+                and occupant != move.request.agent_id
+                and occupant not in self._agent_active_cmd
+                for cell in move.path[:-1]
+            )
+        occupied = chunk.occupied
+        width = chunk.width
+        # The goal may hold an agent (the step onto it fails as blocked, as it would
+        # have when planned), so only the cells before it must still be free.
+        return not any(occupied[y * width + x] for x, y in move.path[:-1])
+
+    def _reservations(self, chunk: ChunkState) -> ReservationTable:
+        if chunk.reservations is None:
+            chunk.reservations = ReservationTable(chunk.width)
+        return chunk.reservations
+
+    def _claim_path(self, cmd: MoveCommand, chunk: ChunkState, *, first_tick: int) -> None:
+        if self.path_mode != PATH_MODE_WHCA:
+            return
+        self._release_claim(cmd)
+        remaining = cmd.path[cmd.path_index :]
+        if remaining:
+            self._reservations(chunk).claim(cmd.agent_id, first_tick=first_tick, cells=remaining)
+            cmd.reserved_in = chunk.chunk_id
+
+    def _release_claim(self, cmd: MoveCommand) -> None:
+        if cmd.reserved_in is None:
+            return
+        chunk = self._chunks.get(cmd.reserved_in)
+        if chunk is not None and chunk.reservations is not None:
+            chunk.reservations.release(cmd.agent_id)
+        cmd.reserved_in = None
+
+    def _finish_plan(self, request: PlanRequest, *, accepted_tick: int = 0, error: Optional[str] = None) -> None:
+        if self._planning.get(request.agent_id) is request:
+            del self._planning[request.agent_id]
+        if request.future.done():
+            return
+        if error is not None:
+            request.future.set_exception(TickEngineError(error))
+        else:
+            request.future.set_result(accepted_tick)
 
-    def _emit_to_agent(self, agent_id: str, message: Dict[str, Any]) -> None:
+    def _grid_path(
+        self,
+        start: Cell,
+        goal: Cell,
+        *,
+        walkable: bytearray,
+        blocked: bytearray,
+        landmarks: Sequence[array] = (),
+    ) -> Optional[List[Cell]]:
+        if self.path_mode == PATH_MODE_JPS:
+            return jps_path(
+                width=self.width,
+                height=self.height,
+                start=start,
+                goal=goal,
+                walkable=walkable,
+                blocked=blocked,
+            )
+        return astar_path(
+            width=self.width,
+            height=self.height,
+            start=start,
+            goal=goal,
+            walkable=walkable,
+            blocked=blocked,
+            landmarks=landmarks,
+        )
+
+    def _chunk_landmarks(self, chunk: ChunkState) -> List[array]:
+        """
+        The chunk's landmark tables, or [] (plain Manhattan) until they are
+        built. The first call starts the build on the chunk executor, or on the
+        loop's default thread pool without one; pregenerated chunks arrive with
+        their tables already built.
+        """
+        if chunk.landmarks or not self.landmark_count or chunk.landmark_build is not None:
+            return chunk.landmarks
+        chunk.landmark_build = asyncio.get_running_loop().run_in_executor(
+            self._chunk_executor,
+            functools.partial(
+                landmark_tables,
+                bytes(chunk.walkable),
+                chunk.width,
+                chunk.height,
+                self.landmark_count,
+            ),
+        )
+        chunk.landmark_build.add_done_callback(functools.partial(self._landmarks_built, chunk))
+        return chunk.landmarks
+
+    @staticmethod
+    def _landmarks_built(chunk: ChunkState, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            # Try again on the next search.
+            chunk.landmark_build = None
+            return
+        chunk.landmarks = future.result()
+
+    def _chunk_portals(self, chunk: ChunkState) -> ChunkPortals:
+        if chunk.portals is None:
+            chunk.portals = ChunkPortals(chunk.walkable, chunk.width, chunk.height)
+        return chunk.portals
+
+    def _loaded_chunk_portals(self, chunk_id: str) -> Optional[ChunkPortals]:
+        chunk = self._chunks.get(chunk_id)
+        return self._chunk_portals(chunk) if chunk is not None else None
+
+    def _chunk_exits(self, chunk_id: str) -> Iterator[Tuple[str, List[Portal]]]:
+        chunk = self._chunks[chunk_id]
+        portals = self._chunk_portals(chunk)
+        for direction in self.DIRECTIONS:
+            neighbor_id = chunk.neighbors.get(direction)
+            neighbor = self._chunks.get(neighbor_id) if neighbor_id is not None else None
+            if neighbor is not None:
+                yield neighbor.chunk_id, portals.portals(direction, neighbor.chunk_id, neighbor.walkable)
+
+    def _edge_goal_leg(self, chunk: ChunkState, start: Cell, goal: Cell) -> Optional[RouteLeg]:
+        """
+        A same-chunk goal on a crossable edge cell, as a leg ending with the step
+        onto it. Only from interior starts, whose paths must cross onto the
+        border to reach the goal anyway; an agent standing on the border may
+        walk along it instead.
+        """
+        portals = self._chunk_portals(chunk)
+        if not portals.interior[start[1] * chunk.width + start[0]]:
+            return None
+        stand = portals.edge_stand(goal)
+        return RouteLeg(waypoint=stand, edge=goal) if stand is not None else None
+
+    def _exit_descent(self, chunk: ChunkState, start: Cell, leg: RouteLeg) -> Optional[List[Cell]]:
+        """A leg's path down its portal stand's distance field; None means search instead."""
+        if leg.edge is None:
+            return None
+        path = self._chunk_portals(chunk).descend(start, leg.waypoint, blocked=chunk.occupied)
+        if path is not None:
+            path.append(leg.edge)
+        return path
+
+    def _leg_path(self, chunk: ChunkState, start: Cell, leg: RouteLeg) -> Optional[List[Cell]]:
+        path = self._exit_descent(chunk, start, leg)
+        if path is not None:
+            return path
+        # Legs are planned on the chunk interior so a leg never crosses an edge
+        # before its own exit step.
+        path = self._grid_path(
+            start,
+            leg.waypoint,
+            walkable=self._chunk_portals(chunk).interior,
+            blocked=chunk.occupied,
+            landmarks=self._chunk_landmarks(chunk),
+        )
+        if path is not None and leg.edge is not None:
+            path.append(leg.edge)
+        return path
+
+    def _refine_next_leg(self, cmd: MoveCommand, chunk: ChunkState, agent: AgentEntity) -> bool:
+        start = (agent.x, agent.y)
+        path = self._leg_path(chunk, start, cmd.legs.pop(0))
+        if path is None:
+            return False
+        cmd.path = path
+        cmd.path_index = 0
+        cmd.exit_step, cmd.exit_direction = self._find_exit(path, start=start)
+        return True
+
+    def _emit_to_agent(self, agent_id: str, frame: AgentFrame) -> None:
         listeners = self._listeners.get(agent_id, set())
         for queue in listeners:
             try:
-                queue.put_nowait(message)
+                queue.put_nowait(frame)
             except asyncio.QueueFull:
                 pass
 
-    def _emit_to_owner(self, agent_id: str, message: Dict[str, Any]) -> None:
+    def _emit_to_owner(self, agent_id: str, frame: AgentFrame) -> None:
         listeners = self._owner_listeners.get(agent_id, set())
         for queue in listeners:
             try:
-                queue.put_nowait(message)
+                queue.put_nowait(frame)
             except asyncio.QueueFull:
                 pass
 
-    def _emit_to_agent_and_owner(self, agent_id: str, message: Dict[str, Any]) -> None:
-        self._emit_to_agent(agent_id, message)
-        self._emit_to_owner(agent_id, message)
+    def _has_agent_or_owner_listener(self, agent_id: str) -> bool:
+        return agent_id in self._listeners or agent_id in self._owner_listeners
 
-    def _emit_to_all(self, message: Dict[str, Any]) -> None:
-        for agent_id in list(self._listeners.keys()):
-            self._emit_to_agent(agent_id, message)
+    def _emit_to_agent_and_owner(self, agent_id: str, message: Union[AgentFrame, Dict[str, Any]]) -> None:
+        if not self._has_agent_or_owner_listener(agent_id):
+            return
+        frame = AgentFrame.from_message(message)
+        self._emit_to_agent(agent_id, frame)
+        self._emit_to_owner(agent_id, frame)
 
-    def _agent_snapshots(self, chunk: ChunkState) -> List[Dict[str, Any]]:
-        agents = [
-            self._agent_snapshot_from_entity(entity)
-            for entity in self._agents.values()
-            if entity.chunk_id == chunk.chunk_id
-        ]
-        agents.sort(key=lambda item: item["id"])
-        return agents
+    def _emit_to_all(self, message: Union[AgentFrame, Dict[str, Any]]) -> None:
+        frame = AgentFrame.from_message(message)
+        for agent_id in list(self._listeners.keys()):
+            self._emit_to_agent(agent_id, frame)
+
+    def _attach_agent(self, chunk: ChunkState, entity: AgentEntity) -> None:
+        chunk.occupancy[(entity.x, entity.y)] = entity.agent_id
+        chunk.occupied[entity.y * chunk.width + entity.x] = 1
+        if entity.agent_id not in chunk.agents:
+            chunk.agents.add(entity.agent_id)
+            idx = bisect.bisect_left(chunk.agent_order, entity.agent_id)
+            chunk.agent_order.insert(idx, entity.agent_id)
+            chunk.agent_rows.insert(idx, self._agent_snapshot_from_entity(entity))
+        chunk.last_player_left_at = None
+        chunk.gc_deadline = None
+        self._mark_chunk_dirty(chunk)
+
+    def _detach_agent(self, chunk: ChunkState, entity: AgentEntity) -> None:
+        if chunk.occupancy.get((entity.x, entity.y)) == entity.agent_id:
+            chunk.occupancy.pop((entity.x, entity.y), None)
+            chunk.occupied[entity.y * chunk.width + entity.x] = 0
+        if entity.agent_id in chunk.agents:
+            chunk.agents.discard(entity.agent_id)
+            chunk.dirty_agents.discard(entity.agent_id)
+            idx = bisect.bisect_left(chunk.agent_order, entity.agent_id)
+            del chunk.agent_order[idx]
+            del chunk.agent_rows[idx]
+        if not chunk.agents:
+            chunk.last_player_left_at = self._clock()
+            self._schedule_chunk_gc(chunk)
+        self._mark_chunk_dirty(chunk)
+
+    def _move_agent(self, chunk: ChunkState, entity: AgentEntity, cell: Cell) -> None:
+        chunk.occupancy.pop((entity.x, entity.y), None)
+        chunk.occupied[entity.y * chunk.width + entity.x] = 0
+        chunk.occupancy[cell] = entity.agent_id
+        chunk.occupied[cell[1] * chunk.width + cell[0]] = 1
+        entity.x, entity.y = cell
+        chunk.dirty_agents.add(entity.agent_id)
+        self._mark_chunk_dirty(chunk)
+
+    def _mark_chunk_dirty(self, chunk: ChunkState) -> None:
+        chunk.delta_view = None
+        self._dirty_chunks.add(chunk.chunk_id)
+
+    def _chunk_view(self, chunk: ChunkState) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        if chunk.dirty_agents:
+            for agent_id in chunk.dirty_agents:
+                idx = bisect.bisect_left(chunk.agent_order, agent_id)
+                chunk.agent_rows[idx] = self._agent_snapshot_from_entity(self._agents[agent_id])
+            chunk.dirty_agents.clear()
+        if chunk.delta_view is None:
+            chunk.delta_view = self._build_chunk_view(chunk)
+        return chunk.delta_view
 
     def _agent_snapshot_from_entity(self, entity: AgentEntity) -> Dict[str, Any]:
         snapshot = {
@@ -417,25 +1206,17 @@ class InMemoryTickEngine:
 
         rng = random.Random(chunk.seed ^ 0xA11CEB00)
         center = (chunk.width // 2, chunk.height // 2)
-        candidates: List[Cell] = []
-        for y in range(1, chunk.height - 1):
-            for x in range(1, chunk.width - 1):
-                if not self._is_walkable(chunk, x, y):
-                    continue
-                if (x, y) == center:
-                    continue
-                if abs(x - 1) + abs(y - 1) < 6:
-                    continue
-                candidates.append((x, y))
+        candidates: List[Cell] = [
+            (x, y)
+            for x, y in self._iter_walkable_cells(chunk, margin=1)
+            if (x, y) != center and abs(x - 1) + abs(y - 1) >= 6
+        ]
 
         if len(candidates) < 6:
-            for y in range(chunk.height):
-                for x in range(chunk.width):
-                    if not self._is_walkable(chunk, x, y):
-                        continue
-                    cell = (x, y)
-                    if cell not in candidates:
-                        candidates.append(cell)
+            seen = set(candidates)
+            for cell in self._iter_walkable_cells(chunk):
+                if cell not in seen:
+                    candidates.append(cell)
 
         rng.shuffle(candidates)
         user_cells = candidates[:2]
@@ -486,10 +1267,18 @@ class InMemoryTickEngine:
         chunk_id: Optional[str] = None,
         agent_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        async with self._lock:
-            chunk = self._resolve_chunk(chunk_id=chunk_id, agent_id=agent_id)
+        async with self._locked_chunk(chunk_id=chunk_id, agent_id=agent_id) as chunk:
             return self._build_chunk_static_payload(chunk)
 
+    async def chunk_static_json(
+        self,
+        *,
+        chunk_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+    ) -> str:
+        async with self._locked_chunk(chunk_id=chunk_id, agent_id=agent_id) as chunk:
+            return self._build_chunk_static_json(chunk)
+
     async def chunk_delta_payload(
         self,
         *,
@@ -497,223 +1286,401 @@ class InMemoryTickEngine:
         agent_id: Optional[str] = None,
         events: Optional[List[Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
-        async with self._lock:
-            chunk = self._resolve_chunk(chunk_id=chunk_id, agent_id=agent_id)
+        async with self._locked_chunk(chunk_id=chunk_id, agent_id=agent_id) as chunk:
             return self._build_chunk_delta_payload(chunk, events=list(events or []))
 
     async def tick_once(self) -> None:
-        async with self._lock:
+        async with self._world_lock:
             self._tick += 1
+            self._dirty_chunks.clear()
+            self._commit_planned(accepted_tick=self._tick)
+            self._expire_flow_fields()
 
-            while self._pending and self._pending[0].accepted_tick <= self._tick:
-                cmd = self._pending.popleft()
-                self._executing[cmd.server_cmd_id] = cmd
+            running = self._promote_pending()
+            async with self._chunk_locks(self._chunks_touched_by(running)):
+                self._step_commands(running)
 
-            affected_chunks: Set[str] = set()
-            chunk_events: Dict[str, List[Dict[str, Any]]] = {}
-            transitions: List[Tuple[str, Dict[str, Any], str]] = []
-            finished_cmds: List[Tuple[MoveCommand, str, Optional[Dict[str, Any]]]] = []
+            self._run_chunk_gc(now=self._clock())
+            self._reset_world_if_idle_locked()
 
-            running = sorted(
-                self._executing.values(),
-                key=lambda c: (c.accepted_tick, c.accepted_order, c.agent_id),
+    def _promote_pending(self) -> List[MoveCommand]:
+        pending = self._pending
+        executing = self._executing
+        # Commands are accepted with increasing accepted_order and promoted in that
+        # order, so the executing dict's insertion order already is the step order.
+        while pending and pending[0].accepted_tick <= self._tick:
+            cmd = pending.popleft()
+            if not cmd.cancelled:
+                executing[cmd.server_cmd_id] = cmd
+        return list(executing.values())
+
+    def _step_commands(self, running: List[MoveCommand]) -> None:
+        step = self._step_moves(running)
+        chunk_events = step.chunk_events
+        finished_cmds = step.finished
+        transitions = step.transitions
+        affected_chunks: Set[str] = set(chunk_events)
+
+        for cmd, status, meta in finished_cmds:
+            self._executing.pop(cmd.server_cmd_id, None)
+            self._release_claim(cmd)
+            if self._agent_active_cmd.get(cmd.agent_id) is cmd:
+                del self._agent_active_cmd[cmd.agent_id]
+
+            payload: Dict[str, Any] = {
+                "server_cmd_id": cmd.server_cmd_id,
+                "status": status,
+                "ended_tick": self._tick,
+            }
+            if meta:
+                payload.update(meta)
+            self._emit_to_agent_and_owner(cmd.agent_id, {"type": "command_result", "payload": payload})
+
+        for agent_id, transition_payload, to_chunk_id in transitions:
+            self._emit_to_agent_and_owner(
+                agent_id,
+                {"type": "chunk_transition", "payload": transition_payload},
+            )
+            if not self._has_agent_or_owner_listener(agent_id):
+                continue
+            to_chunk = self._chunks[to_chunk_id]
+            self._emit_to_agent_and_owner(
+                agent_id,
+                AgentFrame(
+                    "chunk_static",
+                    self._build_chunk_static_payload(to_chunk),
+                    payload_json=self._build_chunk_static_json(to_chunk),
+                ),
             )
 
-            for cmd in running:
-                agent = self._agents.get(cmd.agent_id)
-                if agent is None:
-                    finished_cmds.append((cmd, "failed", {"reason": "agent_not_found"}))
-                    continue
-                chunk = self._chunks.get(agent.chunk_id)
-                if chunk is None:
-                    finished_cmds.append((cmd, "failed", {"reason": "chunk_not_found"}))
-                    continue
+        affected_chunks.update(self._dirty_chunks)
+        self._dirty_chunks.clear()
+        for chunk_id in sorted(affected_chunks):
+            chunk = self._chunks.get(chunk_id)
+            if chunk is None:
+                continue
+            self._emit_chunk_delta(
+                chunk,
+                events=chunk_events.get(chunk_id, []),
+            )
 
-                if cmd.path_index >= len(cmd.path):
-                    finished_cmds.append((cmd, "completed", None))
-                    continue
+    def _step_moves(self, running: List[MoveCommand]) -> MoveStep:
+        step = MoveStep()
 
-                next_x, next_y = cmd.path[cmd.path_index]
-                transition_dir = self._boundary_direction(
-                    current=(agent.x, agent.y),
-                    nxt=(next_x, next_y),
-                )
-                if transition_dir is not None:
-                    outcome = self._attempt_boundary_transition(
-                        cmd=cmd,
-                        agent=agent,
-                        source_chunk=chunk,
-                        direction=transition_dir,
-                        boundary_cell=(next_x, next_y),
-                    )
-                    if not outcome["ok"]:
-                        blocker_id = str(outcome["blocker"]["id"])
-                        at = {
-                            "x": int(outcome["blocked_at"]["x"]),
-                            "y": int(outcome["blocked_at"]["y"]),
-                        }
-                        meta = {
-                            "reason": "blocked",
-                            "blocked_at": at,
-                            "blocker": {
-                                "id": blocker_id,
-                                "x": at["x"],
-                                "y": at["y"],
-                            },
-                        }
-                        chunk_events.setdefault(chunk.chunk_id, []).append(
-                            {
-                                "type": "blocked",
-                                "by": blocker_id,
-                                "at": at,
-                            }
-                        )
-                        affected_chunks.add(chunk.chunk_id)
-                        finished_cmds.append((cmd, "failed", meta))
-                        continue
+        for cmd in running:
+            agent = self._agents.get(cmd.agent_id)
+            if agent is None:
+                step.finished.append((cmd, "failed", {"reason": "agent_not_found"}))
+                continue
+            chunk = self._chunks.get(agent.chunk_id)
+            if chunk is None:
+                step.finished.append((cmd, "failed", {"reason": "chunk_not_found"}))
+                continue
 
-                    from_chunk_id = str(outcome["from_chunk_id"])
-                    to_chunk_id = str(outcome["to_chunk_id"])
-                    transitions.append(
-                        (
-                            cmd.agent_id,
-                            {
-                                "agent_id": cmd.agent_id,
-                                "from_chunk_id": from_chunk_id,
-                                "to_chunk_id": to_chunk_id,
-                                "from": {
-                                    "x": int(outcome["from"]["x"]),
-                                    "y": int(outcome["from"]["y"]),
-                                },
-                                "to": {
-                                    "x": int(outcome["to"]["x"]),
-                                    "y": int(outcome["to"]["y"]),
-                                },
-                                "tick": self._tick,
-                            },
-                            to_chunk_id,
-                        )
-                    )
-                    affected_chunks.add(from_chunk_id)
-                    affected_chunks.add(to_chunk_id)
-                    if cmd.path_index >= len(cmd.path):
-                        finished_cmds.append((cmd, "completed", None))
-                    continue
+            if cmd.flow is not None:
+                self._step_flow(cmd, chunk, agent, step)
+                continue
 
-                occupant = chunk.occupancy.get((next_x, next_y))
-                if not self._is_walkable(chunk, next_x, next_y):
-                    meta = {
-                        "reason": "blocked",
-                        "blocked_at": {"x": next_x, "y": next_y},
-                        "blocker": {"id": "wall", "x": next_x, "y": next_y},
-                    }
-                    chunk_events.setdefault(chunk.chunk_id, []).append(
-                        {
-                            "type": "blocked",
-                            "by": "wall",
-                            "at": {"x": next_x, "y": next_y},
-                        }
-                    )
-                    affected_chunks.add(chunk.chunk_id)
-                    finished_cmds.append((cmd, "failed", meta))
-                    continue
-                if occupant is not None and occupant != cmd.agent_id:
-                    meta = {
-                        "reason": "blocked",
-                        "blocked_at": {"x": next_x, "y": next_y},
-                        "blocker": {"id": occupant, "x": next_x, "y": next_y},
-                    }
-                    chunk_events.setdefault(chunk.chunk_id, []).append(
-                        {
-                            "type": "blocked",
-                            "by": occupant,
-                            "at": {"x": next_x, "y": next_y},
-                        }
-                    )
-                    affected_chunks.add(chunk.chunk_id)
-                    finished_cmds.append((cmd, "failed", meta))
-                    continue
+            if cmd.path_index >= len(cmd.path):
+                step.finished.append((cmd, "completed", None))
+                continue
 
-                old_pos = (agent.x, agent.y)
-                chunk.occupancy.pop(old_pos, None)
-                chunk.occupancy[(next_x, next_y)] = cmd.agent_id
-                agent.x = next_x
-                agent.y = next_y
-                cmd.path_index += 1
-                affected_chunks.add(chunk.chunk_id)
+            self._maybe_pregenerate_neighbor(cmd, chunk)
+            next_x, next_y = cmd.path[cmd.path_index]
+            transition_dir = self._boundary_direction(
+                current=(agent.x, agent.y),
+                nxt=(next_x, next_y),
+            )
+            if transition_dir is not None:
+                self._step_boundary(step, cmd, chunk, agent, transition_dir, (next_x, next_y))
+                continue
 
+            occupant = chunk.occupancy.get((next_x, next_y))
+            blocker_id: Optional[str] = None
+            if not chunk.walkable[next_y * chunk.width + next_x]:
+                blocker_id = "wall"
+            elif occupant is not None and occupant != cmd.agent_id:
+                if self._wait_out_block(cmd, chunk, occupant):
+                    continue
+                if self._splice_detour(cmd, chunk, agent):
+                    next_x, next_y = cmd.path[cmd.path_index]
+                else:
+                    blocker_id = occupant
+            if blocker_id is None:
+                cmd.blocked_ticks = 0
+                self._move_agent(chunk, agent, (next_x, next_y))
+                cmd.path_index += 1
                 if cmd.path_index >= len(cmd.path):
-                    finished_cmds.append((cmd, "completed", None))
+                    step.finished.append((cmd, "completed", None))
+                continue
 
-            for cmd, status, meta in finished_cmds:
-                self._executing.pop(cmd.server_cmd_id, None)
-                self._agent_active_cmd.pop(cmd.agent_id, None)
+            self._fail_blocked(step, cmd, chunk, (next_x, next_y), blocker_id)
 
-                payload: Dict[str, Any] = {
-                    "server_cmd_id": cmd.server_cmd_id,
-                    "status": status,
-                    "ended_tick": self._tick,
-                }
-                if meta:
-                    payload.update(meta)
-                self._emit_to_agent_and_owner(cmd.agent_id, {"type": "command_result", "payload": payload})
-
-            for agent_id, transition_payload, to_chunk_id in transitions:
-                self._emit_to_agent_and_owner(
-                    agent_id,
-                    {"type": "chunk_transition", "payload": transition_payload},
-                )
-                static_payload = self._build_chunk_static_payload(self._chunks[to_chunk_id])
-                self._emit_to_agent_and_owner(
-                    agent_id,
-                    {"type": "chunk_static", "payload": static_payload},
-                )
+        return step
 
-            for chunk_id in sorted(affected_chunks):
-                chunk = self._chunks.get(chunk_id)
-                if chunk is None:
-                    continue
-                self._emit_chunk_delta(
-                    chunk,
-                    events=chunk_events.get(chunk_id, []),
-                )
+    def _step_flow(self, cmd: MoveCommand, chunk: ChunkState, agent: AgentEntity, step: MoveStep) -> None:
+        """
+        Take the first free step down the command's flow field. The field
+        covers the interior plus the goal, so only a goal on the border can be
+        a crossing step; it crosses like any other.
+        """
+        goal = (cmd.target_x, cmd.target_y)
+        if (agent.x, agent.y) == goal:
+            step.finished.append((cmd, "completed", None))
+            return
+        blocker: Optional[Tuple[Cell, str]] = None
+        for cell in field_steps(cmd.flow, (agent.x, agent.y), chunk.width, chunk.height):
+            occupant = chunk.occupancy.get(cell)
+            if occupant is None or occupant == cmd.agent_id:
+                cmd.blocked_ticks = 0
+                direction = self._boundary_direction(current=(agent.x, agent.y), nxt=cell)
+                if direction is not None:
+                    self._step_boundary(step, cmd, chunk, agent, direction, cell)
+                    return
+                self._move_agent(chunk, agent, cell)
+                if cell == goal:
+                    step.finished.append((cmd, "completed", None))
+                return
+            if blocker is None:
+                blocker = (cell, occupant)
+        if blocker is None:
+            step.finished.append((cmd, "failed", {"reason": "unreachable"}))
+            return
+        cell, occupant = blocker
+        if not self._wait_out_block(cmd, chunk, occupant):
+            self._fail_blocked(step, cmd, chunk, cell, occupant)
 
-            self._run_chunk_gc(now=self._clock())
-            self._reset_world_if_idle_locked()
+    def _step_boundary(
+        self,
+        step: MoveStep,
+        cmd: MoveCommand,
+        chunk: ChunkState,
+        agent: AgentEntity,
+        direction: str,
+        boundary_cell: Cell,
+    ) -> None:
+        outcome = self._attempt_boundary_transition(
+            cmd=cmd,
+            agent=agent,
+            source_chunk=chunk,
+            direction=direction,
+            boundary_cell=boundary_cell,
+        )
+        if outcome.get("waiting"):
+            # The neighbor is still generating; hold at the edge and retry next tick.
+            # The schedule its reservations describe has slipped, so drop them.
+            self._release_claim(cmd)
+            return
+        if not outcome["ok"]:
+            at = outcome["blocked_at"]
+            self._fail_blocked(step, cmd, chunk, (int(at["x"]), int(at["y"])), str(outcome["blocker"]["id"]))
+            return
+
+        from_chunk_id = str(outcome["from_chunk_id"])
+        to_chunk_id = str(outcome["to_chunk_id"])
+        step.transitions.append(
+            (
+                cmd.agent_id,
+                {
+                    "agent_id": cmd.agent_id,
+                    "from_chunk_id": from_chunk_id,
+                    "to_chunk_id": to_chunk_id,
+                    "from": {
+                        "x": int(outcome["from"]["x"]),
+                        "y": int(outcome["from"]["y"]),
+                    },
+                    "to": {
+                        "x": int(outcome["to"]["x"]),
+                        "y": int(outcome["to"]["y"]),
+                    },
+                    "tick": self._tick,
+                },
+                to_chunk_id,
+            )
+        )
+        target_chunk = self._chunks[to_chunk_id]
+        if cmd.path_index >= len(cmd.path) and cmd.legs:
+            if not self._refine_next_leg(cmd, target_chunk, agent):
+                step.finished.append((cmd, "failed", {"reason": "unreachable"}))
+                return
+        if cmd.path_index >= len(cmd.path):
+            step.finished.append((cmd, "completed", None))
+        else:
+            self._claim_path(cmd, target_chunk, first_tick=self._tick + 1)
+
+    def _fail_blocked(self, step: MoveStep, cmd: MoveCommand, chunk: ChunkState, cell: Cell, blocker_id: str) -> None:
+        x, y = cell
+        meta = {
+            "reason": "blocked",
+            "blocked_at": {"x": x, "y": y},
+            "blocker": {"id": blocker_id, "x": x, "y": y},
+        }
+        step.chunk_events.setdefault(chunk.chunk_id, []).append(
+            {
+                "type": "blocked",
+                "by": blocker_id,
+                "at": {"x": x, "y": y},
+            }
+        )
+        step.finished.append((cmd, "failed", meta))
+
+    def _flow_field(self, chunk: ChunkState, goal: Cell) -> array:
+        key = (chunk.chunk_id, goal)
+        entry = self._flow_fields.get(key)
+        if entry is not None:
+            flow = entry[0]
+        else:
+            # Interior only, like portal legs, so a flow step never crosses an edge.
+            flow = distance_field(
+                width=chunk.width,
+                height=chunk.height,
+                goal=goal,
+                walkable=self._chunk_portals(chunk).interior,
+            )
+        self._flow_fields[key] = (flow, self._tick + self.flow_field_ttl_ticks)
+        return flow
+
+    def _expire_flow_fields(self) -> None:
+        if not self._flow_fields:
+            return
+        expired = [key for key, (_flow, until) in self._flow_fields.items() if until < self._tick]
+        for key in expired:
+            del self._flow_fields[key]
+
+    def _wait_out_block(self, cmd: MoveCommand, chunk: ChunkState, blocker_id: str) -> bool:
+        """Hold the agent for this tick if the blocker is itself about to move."""
+        if cmd.blocked_ticks >= self.block_wait_ticks:
+            return False
+        if blocker_id not in self._agent_active_cmd and blocker_id not in self._planning:
+            return False
+        cmd.blocked_ticks += 1
+        # Everything after the wait happens a tick later than claimed.
+        self._claim_path(cmd, chunk, first_tick=self._tick + 1)
+        return True
+
+    def _splice_detour(self, cmd: MoveCommand, chunk: ChunkState, agent: AgentEntity) -> bool:
+        """
+        Replace the path up to a cell at most block_detour_steps ahead with a
+        bounded A* around the current occupancy. The detour runs on the chunk
+        interior and rejoins on an interior cell before the path's exit step,
+        so it never introduces a chunk crossing; a path that runs along the
+        border has no such cell and is not repaired.
+        """
+        steps = self.block_detour_steps
+        if not steps:
+            return False
+        interior = self._chunk_portals(chunk).interior
+        width = chunk.width
+        last = len(cmd.path) - 1 if cmd.exit_step is None else cmd.exit_step - 1
+        rejoin = min(cmd.path_index + steps, last)
+        while rejoin > cmd.path_index and not interior[cmd.path[rejoin][1] * width + cmd.path[rejoin][0]]:
+            rejoin -= 1
+        if rejoin <= cmd.path_index:
+            return False
+        goal = cmd.path[rejoin]
+        if chunk.occupancy.get(goal, cmd.agent_id) != cmd.agent_id:
+            return False
+        detour = grid_pathfinder(chunk.width, chunk.height).search(
+            (agent.x, agent.y),
+            goal,
+            walkable=interior,
+            blocked=chunk.occupied,
+            max_expanded=(2 * steps + 1) ** 2,
+            landmarks=self._chunk_landmarks(chunk),
+        )
+        if not detour:
+            return False
+        path = cmd.path[: cmd.path_index] + detour + cmd.path[rejoin + 1 :]
+        exit_step, exit_direction = self._find_exit(path, start=(agent.x, agent.y), offset=cmd.path_index)
+        if cmd.exit_step is not None:
+            expected = cmd.exit_step + len(detour) - (rejoin + 1 - cmd.path_index)
+            if (exit_step, exit_direction) != (expected, cmd.exit_direction):
+                return False
+        elif exit_step is not None:
+            return False
+        cmd.path = path
+        cmd.exit_step = exit_step
+        self._claim_path(cmd, chunk, first_tick=self._tick)
+        return True
+
+    def _chunks_touched_by(self, running: Iterable[MoveCommand]) -> List[ChunkState]:
+        touched: Dict[str, ChunkState] = {}
+        for cmd in running:
+            agent = self._agents.get(cmd.agent_id)
+            if agent is None:
+                continue
+            chunk = self._chunks.get(agent.chunk_id)
+            if chunk is None:
+                continue
+            touched[chunk.chunk_id] = chunk
+            if cmd.flow is not None:
+                # A flow command can only cross by stepping onto its goal.
+                nxt = (cmd.target_x, cmd.target_y)
+            elif cmd.path_index < len(cmd.path):
+                nxt = cmd.path[cmd.path_index]
+            else:
+                continue
+            direction = self._boundary_direction(current=(agent.x, agent.y), nxt=nxt)
+            if direction is None:
+                continue
+            neighbor_id = chunk.neighbors.get(direction)
+            neighbor = self._chunks.get(neighbor_id) if neighbor_id is not None else None
+            if neighbor is not None:
+                touched[neighbor.chunk_id] = neighbor
+        return list(touched.values())
+
+    @asynccontextmanager
+    async def _chunk_locks(self, chunks: Iterable[ChunkState]) -> AsyncIterator[None]:
+        ordered = sorted({chunk.chunk_id: chunk for chunk in chunks}.values(), key=lambda c: c.chunk_id)
+        async with AsyncExitStack() as stack:
+            for chunk in ordered:
+                await stack.enter_async_context(chunk.lock)
+            yield
+
+    @asynccontextmanager
+    async def _locked_chunk(
+        self,
+        *,
+        chunk_id: Optional[str],
+        agent_id: Optional[str],
+    ) -> AsyncIterator[ChunkState]:
+        while True:
+            chunk = self._resolve_chunk(chunk_id=chunk_id, agent_id=agent_id)
+            async with chunk.lock:
+                # The agent may have crossed a boundary (or the chunk been collected)
+                # while we waited; only hand out the lock that still guards it.
+                if self._resolve_chunk(chunk_id=chunk_id, agent_id=agent_id) is not chunk:
+                    continue
+                yield chunk
+                return
 
     async def has_chunk(self, chunk_id: str) -> bool:
-        async with self._lock:
-            return chunk_id in self._chunks
+        return chunk_id in self._chunks
 
     async def chunk_count(self) -> int:
-        async with self._lock:
-            return len(self._chunks)
+        return len(self._chunks)
 
     async def agent_state(self, agent_id: str) -> Optional[AgentEntity]:
-        async with self._lock:
-            return self._agents.get(agent_id)
+        return self._agents.get(agent_id)
 
     def _run_chunk_gc(self, *, now: float) -> None:
-        candidates: List[str] = []
-        for chunk in self._chunks.values():
-            if chunk.chunk_id == self._root_chunk_id:
-                continue
-            if chunk.pinned:
+        due: List[ChunkState] = []
+        while self._gc_heap and self._gc_heap[0][0] <= now:
+            deadline, _, chunk = heapq.heappop(self._gc_heap)
+            if chunk.gc_deadline != deadline or self._chunks.get(chunk.chunk_id) is not chunk:
                 continue
+            due.append(chunk)
+
+        candidates: List[str] = []
+        for chunk in due:
             if chunk.agents:
                 continue
             if chunk.transition_lock_count > 0:
+                self._schedule_chunk_gc(chunk, deadline=now)
                 continue
-            if chunk.last_player_left_at is None:
-                continue
-            if (now - chunk.last_player_left_at) < self.chunk_gc_ttl_seconds:
-                continue
-            degree = sum(
-                1
-                for neighbor_id in chunk.neighbors.values()
-                if neighbor_id is not None and neighbor_id in self._chunks
-            )
-            if degree > 1:
+            if self._chunk_degree(chunk) > 1:
+                # Re-armed below once one of its neighbors is collected.
+                chunk.gc_deadline = None
                 continue
             candidates.append(chunk.chunk_id)
 
@@ -730,18 +1697,40 @@ class InMemoryTickEngine:
                     "tick": self._tick,
                 },
             )
+            chunk.gc_deadline = None
+            self._drop_pending_neighbors(chunk_id)
             for direction, neighbor_id in list(chunk.neighbors.items()):
                 if neighbor_id is None:
                     continue
                 neighbor = self._chunks.get(neighbor_id)
                 if neighbor is not None:
                     neighbor.neighbors[self.OPPOSITE_DIR[direction]] = None
+                    if neighbor.gc_deadline is None:
+                        self._schedule_chunk_gc(neighbor, deadline=now)
                 chunk.neighbors[direction] = None
             self._chunks.pop(chunk_id, None)
             self._spectator_listeners.pop(chunk_id, None)
             self._spectator_history.pop(chunk_id, None)
             self._spectator_seq.pop(chunk_id, None)
 
+    def _schedule_chunk_gc(self, chunk: ChunkState, *, deadline: Optional[float] = None) -> None:
+        if chunk.pinned or chunk.agents or chunk.last_player_left_at is None:
+            return
+        if deadline is None:
+            deadline = chunk.last_player_left_at + self.chunk_gc_ttl_seconds
+        else:
+            deadline = max(deadline, chunk.last_player_left_at + self.chunk_gc_ttl_seconds)
+        chunk.gc_deadline = deadline
+        self._gc_serial += 1
+        heapq.heappush(self._gc_heap, (deadline, self._gc_serial, chunk))
+
+    def _chunk_degree(self, chunk: ChunkState) -> int:
+        return sum(
+            1
+            for neighbor_id in chunk.neighbors.values()
+            if neighbor_id is not None and neighbor_id in self._chunks
+        )
+
     def _reset_world_if_idle_locked(self) -> None:
         if self._agents:
             return
@@ -773,6 +1762,8 @@ class InMemoryTickEngine:
             self._spectator_seq.pop(chunk_id, None)
 
         root.neighbors = {direction: None for direction in self.DIRECTIONS}
+        self._gc_heap.clear()
+        self._drop_pending_neighbors()
 
     def _attempt_boundary_transition(
         self,
@@ -805,6 +1796,8 @@ class InMemoryTickEngine:
                 source_chunk_id=source_chunk.chunk_id,
                 direction=direction,
             )
+            if to_chunk_id is None:
+                return {"ok": False, "waiting": True}
             target_chunk = self._chunks[to_chunk_id]
             target_chunk.transition_lock_count += 1
 
@@ -823,19 +1816,13 @@ class InMemoryTickEngine:
                     "blocker": {"id": target_occupant},
                 }
 
-            old_pos = (agent.x, agent.y)
-            source_chunk.occupancy.pop(old_pos, None)
-            source_chunk.agents.discard(agent.agent_id)
-            if not source_chunk.agents:
-                source_chunk.last_player_left_at = self._clock()
-
-            target_chunk.occupancy[(to_x, to_y)] = agent.agent_id
-            target_chunk.agents.add(agent.agent_id)
-            target_chunk.last_player_left_at = None
+            self._detach_agent(source_chunk, agent)
             agent.chunk_id = target_chunk.chunk_id
             agent.x = to_x
             agent.y = to_y
+            self._attach_agent(target_chunk, agent)
             cmd.path_index += 1
+            cmd.exit_step, cmd.exit_direction = self._find_exit(cmd.path, start=(to_x, to_y), offset=cmd.path_index)
 
             return {
                 "ok": True,
@@ -849,7 +1836,113 @@ class InMemoryTickEngine:
             if target_chunk is not None:
                 target_chunk.transition_lock_count -= 1
 
-    def _get_or_create_neighbor(self, *, source_chunk_id: str, direction: str) -> str:
+    def _find_exit(self, path: List[Cell], *, start: Cell, offset: int = 0) -> Tuple[Optional[int], Optional[str]]:
+        current = start
+        for idx in range(offset, len(path)):
+            direction = self._boundary_direction(current=current, nxt=path[idx])
+            if direction is not None:
+                return idx, direction
+            current = path[idx]
+        return None, None
+
+    def _maybe_pregenerate_neighbor(self, cmd: MoveCommand, chunk: ChunkState) -> None:
+        if cmd.exit_step is None or cmd.exit_direction is None:
+            return
+        if cmd.exit_step - cmd.path_index > self.pregeneration_band:
+            return
+        if chunk.neighbors.get(cmd.exit_direction) in self._chunks:
+            return
+        if (chunk.chunk_id, cmd.exit_direction) in self._pending_neighbors:
+            return
+        cache_key = self._neighbor_cache_key(chunk, cmd.exit_direction)
+        if cache_key in self._chunk_cache:
+            return
+        # A spilled mask is read back off the tick, with or without a generation pool.
+        if self._chunk_cache.prefetch(cache_key) or self._chunk_executor is None:
+            return
+        self._request_neighbor(chunk, cmd.exit_direction)
+
+    def _request_neighbor(self, source: ChunkState, direction: str) -> PendingNeighbor:
+        self._chunk_serial += 1
+        pending = PendingNeighbor(
+            chunk_id=f"chunk-{self._chunk_serial}",
+            seed=self._neighbor_seed(source.seed, direction),
+            required_edges={self.OPPOSITE_DIR[direction]},
+        )
+        self._pending_neighbors[(source.chunk_id, direction)] = pending
+        # Handing work to a process pool wakes its feeder thread, which can hold
+        # the GIL for a few ms; submit after the tick instead of inside it.
+        asyncio.get_running_loop().call_soon(self._submit_pending_neighbor, pending)
+        return pending
+
+    def _submit_pending_neighbor(self, pending: PendingNeighbor) -> None:
+        if pending.dropped or self._chunk_executor is None:
+            return
+        pending.future = asyncio.get_running_loop().run_in_executor(
+            self._chunk_executor,
+            functools.partial(
+                _pregenerate_chunk,
+                width=self.width,
+                height=self.height,
+                seed=pending.seed,
+                required_edges=pending.required_edges,
+                landmark_count=self.landmark_count,
+            ),
+        )
+
+    def _take_pregenerated_neighbor(self, source: ChunkState, direction: str) -> Optional[ChunkState]:
+        key = (source.chunk_id, direction)
+        pending = self._pending_neighbors.get(key)
+        if pending is None:
+            if self._neighbor_cache_key(source, direction) in self._chunk_cache:
+                return self._new_chunk(
+                    seed=self._neighbor_seed(source.seed, direction),
+                    required_edges={self.OPPOSITE_DIR[direction]},
+                )
+            pending = self._request_neighbor(source, direction)
+        if pending.future is None or not pending.future.done():
+            return None
+        del self._pending_neighbors[key]
+        cache_key = chunk_key(
+            width=self.width,
+            height=self.height,
+            seed=pending.seed,
+            required_edges=pending.required_edges,
+        )
+        components = array("I")
+        landmarks: List[array] = []
+        if pending.future.cancelled() or pending.future.exception() is not None:
+            walkable = self._chunk_cache.get_or_generate(
+                width=self.width,
+                height=self.height,
+                seed=pending.seed,
+                required_edges=pending.required_edges,
+            )
+        else:
+            mask, components, landmarks = pending.future.result()
+            walkable = bytearray(mask)
+            self._chunk_cache.put(cache_key, walkable)
+        chunk = self._chunk_from_mask(pending.chunk_id, seed=pending.seed, walkable=walkable, components=components)
+        chunk.landmarks = landmarks
+        return chunk
+
+    def _neighbor_cache_key(self, source: ChunkState, direction: str) -> ChunkKey:
+        return chunk_key(
+            width=self.width,
+            height=self.height,
+            seed=self._neighbor_seed(source.seed, direction),
+            required_edges={self.OPPOSITE_DIR[direction]},
+        )
+
+    def _drop_pending_neighbors(self, chunk_id: Optional[str] = None) -> None:
+        for key in list(self._pending_neighbors):
+            if chunk_id is None or key[0] == chunk_id:
+                pending = self._pending_neighbors.pop(key)
+                pending.dropped = True
+                if pending.future is not None:
+                    pending.future.cancel()
+
+    def _get_or_create_neighbor(self, *, source_chunk_id: str, direction: str) -> Optional[str]:
         source = self._chunks[source_chunk_id]
         existing = source.neighbors.get(direction)
         if existing is not None and existing in self._chunks:
@@ -862,10 +1955,18 @@ class InMemoryTickEngine:
             if existing is not None and existing in self._chunks:
                 return existing
 
-            neighbor_chunk = self._new_chunk(
-                required_edges={self.OPPOSITE_DIR[direction]},
-            )
+            if self._chunk_executor is not None:
+                pregenerated = self._take_pregenerated_neighbor(source, direction)
+                if pregenerated is None:
+                    return None
+                neighbor_chunk = pregenerated
+            else:
+                neighbor_chunk = self._new_chunk(
+                    seed=self._neighbor_seed(source.seed, direction),
+                    required_edges={self.OPPOSITE_DIR[direction]},
+                )
             self._chunks[neighbor_chunk.chunk_id] = neighbor_chunk
+            self._schedule_chunk_gc(neighbor_chunk)
             self._ensure_spectator_chunk(neighbor_chunk.chunk_id)
             source.neighbors[direction] = neighbor_chunk.chunk_id
             neighbor_chunk.neighbors[self.OPPOSITE_DIR[direction]] = source_chunk_id
@@ -908,6 +2009,7 @@ class InMemoryTickEngine:
 
     def _emit_chunk_delta(self, chunk: ChunkState, *, events: List[Dict[str, Any]]) -> None:
         payload = self._build_chunk_delta_payload(chunk, events=list(events))
+        payload_json = dump_json(payload)
         self._push_spectator_event(
             chunk_id=chunk.chunk_id,
             event="chunk_delta",
@@ -915,40 +2017,18 @@ class InMemoryTickEngine:
                 "type": "chunk_delta",
                 **payload,
             },
+            data_json=typed_payload_json("chunk_delta", payload_json),
         )
-        for agent_id in list(chunk.agents):
-            self._emit_to_agent_and_owner(agent_id, {"type": "chunk_delta", "payload": payload})
+        frame: Optional[AgentFrame] = None
+        for agent_id in chunk.agent_order:
+            if not self._has_agent_or_owner_listener(agent_id):
+                continue
+            if frame is None:
+                frame = AgentFrame("chunk_delta", payload, payload_json=payload_json)
+            self._emit_to_agent_and_owner(agent_id, frame)
 
     def _build_chunk_delta_payload(self, chunk: ChunkState, *, events: List[Dict[str, Any]]) -> Dict[str, Any]:
-        agents = self._agent_snapshots(chunk)
-        occupied = {(int(item["x"]), int(item["y"])) for item in agents}
-        known_agent_ids = {str(item["id"]) for item in agents}
-
-        npcs: List[Dict[str, Any]] = []
-        if self._enable_demo_actors:
-            overlays = self._demo_overlays.get(chunk.chunk_id)
-            if overlays is None:
-                overlays = self._build_demo_overlays(chunk)
-                self._demo_overlays[chunk.chunk_id] = overlays
-
-            for item in overlays.get("agents", []):
-                overlay_id = str(item.get("id", ""))
-                if overlay_id and overlay_id in known_agent_ids:
-                    continue
-                cell = (int(item["x"]), int(item["y"]))
-                if cell in occupied:
-                    continue
-                agents.append(dict(item))
-                if overlay_id:
-                    known_agent_ids.add(overlay_id)
-            agents.sort(key=lambda item: str(item["id"]))
-
-            for item in overlays.get("npcs", []):
-                cell = (int(item["x"]), int(item["y"]))
-                if cell in occupied:
-                    continue
-                npcs.append(dict(item))
-
+        agents, npcs = self._chunk_view(chunk)
         return {
             "chunk_id": chunk.chunk_id,
             "tick": self._tick,
@@ -957,6 +2037,42 @@ class InMemoryTickEngine:
             "events": list(events),
         }
 
+    def _build_chunk_view(self, chunk: ChunkState) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        # Views are shared by every payload built until the chunk is dirtied again,
+        # so they are rebuilt into fresh lists and never mutated afterwards.
+        agents = list(chunk.agent_rows)
+        npcs: List[Dict[str, Any]] = []
+        if not self._enable_demo_actors:
+            return agents, npcs
+
+        overlays = self._demo_overlays.get(chunk.chunk_id)
+        if overlays is None:
+            overlays = self._build_demo_overlays(chunk)
+            self._demo_overlays[chunk.chunk_id] = overlays
+
+        extras: List[Dict[str, Any]] = []
+        known_agent_ids = set(chunk.agents)
+        for item in overlays.get("agents", []):
+            overlay_id = str(item.get("id", ""))
+            if overlay_id and overlay_id in known_agent_ids:
+                continue
+            cell = (int(item["x"]), int(item["y"]))
+            if cell in chunk.occupancy:
+                continue
+            extras.append(dict(item))
+            if overlay_id:
+                known_agent_ids.add(overlay_id)
+        if extras:
+            extras.sort(key=lambda item: str(item["id"]))
+            agents = list(heapq.merge(agents, extras, key=lambda item: str(item["id"])))
+
+        for item in overlays.get("npcs", []):
+            cell = (int(item["x"]), int(item["y"]))
+            if cell in chunk.occupancy:
+                continue
+            npcs.append(dict(item))
+        return agents, npcs
+
     def _ensure_spectator_chunk(self, chunk_id: str) -> None:
         self._spectator_listeners.setdefault(chunk_id, set())
         self._spectator_history.setdefault(
@@ -971,28 +2087,30 @@ class InMemoryTickEngine:
         event_id = f"{chunk_id}:{tick}:{seq:04d}"
         return event_id, seq
 
-    def _push_spectator_event(self, *, chunk_id: str, event: str, data: Dict[str, Any]) -> None:
+    def _push_spectator_event(
+        self,
+        *,
+        chunk_id: str,
+        event: str,
+        data: Dict[str, Any],
+        data_json: Optional[str] = None,
+    ) -> None:
         self._ensure_spectator_chunk(chunk_id)
         event_id, seq = self._next_spectator_event_id(chunk_id, tick=self._tick)
-        envelope = {
-            "id": event_id,
-            "event": event,
-            "data": dict(data),
-            "tick": self._tick,
-            "seq": seq,
-        }
-        self._spectator_history[chunk_id].append(envelope)
+        frame = SpectatorFrame(
+            event_id=event_id,
+            event=event,
+            data=data,
+            tick=self._tick,
+            seq=seq,
+            data_json=data_json,
+        )
+        self._spectator_history[chunk_id].append(frame)
 
         listeners = self._spectator_listeners.get(chunk_id, set())
         for queue in listeners:
             try:
-                queue.put_nowait(
-                    {
-                        "id": envelope["id"],
-                        "event": envelope["event"],
-                        "data": dict(envelope["data"]),
-                    }
-                )
+                queue.put_nowait(frame)
             except asyncio.QueueFull:
                 pass
 
@@ -1014,7 +2132,7 @@ class InMemoryTickEngine:
         *,
         chunk_id: str,
         last_event_id: Optional[str],
-    ) -> Tuple[List[Dict[str, Any]], bool]:
+    ) -> Tuple[List[SpectatorFrame], bool]:
         if not last_event_id:
             return [], False
 
@@ -1029,8 +2147,8 @@ class InMemoryTickEngine:
         if not history:
             return [], True
 
-        oldest = (int(history[0]["tick"]), int(history[0]["seq"]))
-        newest = (int(history[-1]["tick"]), int(history[-1]["seq"]))
+        oldest = (history[0].tick, history[0].seq)
+        newest = (history[-1].tick, history[-1].seq)
         marker_key = (marker_tick, marker_seq)
 
         if marker_key < oldest:
@@ -1039,15 +2157,7 @@ class InMemoryTickEngine:
         if marker_key >= newest:
             return [], False
 
-        replay = [
-            {
-                "id": str(item["id"]),
-                "event": str(item["event"]),
-                "data": dict(item["data"]),
-            }
-            for item in history
-            if (int(item["tick"]), int(item["seq"])) > marker_key
-        ]
+        replay = [item for item in history if (item.tick, item.seq) > marker_key]
         return replay, False
 
     def _resolve_chunk(
@@ -1081,7 +2191,6 @@ class InMemoryTickEngine:
         seed: Optional[int] = None,
         required_edges: Optional[Set[str]] = None,
     ) -> ChunkState:
-        now = self._clock()
         if chunk_id is None:
             self._chunk_serial += 1
             chunk_id = f"chunk-{self._chunk_serial}"
@@ -1091,54 +2200,113 @@ class InMemoryTickEngine:
                 self._chunk_serial = max(self._chunk_serial, serial)
             except (IndexError, ValueError):
                 pass
-        chunk_seed = seed if seed is not None else (self._chunk_serial * 0x9E3779B97F4A7C15) & (
-            (1 << 64) - 1
-        )
-        tiles_static = generate_chunk_tiles(
+        chunk_seed = seed if seed is not None else self._default_chunk_seed(self._chunk_serial)
+        walkable = self._chunk_cache.get_or_generate(
             width=self.width,
             height=self.height,
             seed=chunk_seed,
             required_edges=required_edges or set(),
             root_layout=(chunk_id == "chunk-0"),
         )
+        return self._chunk_from_mask(
+            chunk_id,
+            seed=chunk_seed,
+            walkable=walkable,
+            pinned=pinned,
+        )
+
+    @staticmethod
+    def _default_chunk_seed(serial: int) -> int:
+        return (serial * 0x9E3779B97F4A7C15) & ((1 << 64) - 1)
+
+    @staticmethod
+    def _neighbor_seed(source_seed: int, direction: str) -> int:
+        # splitmix64 over (source seed, direction): walking the same edge out of the
+        # same chunk always yields the same layout, so revisits hit the chunk cache.
+        mask = (1 << 64) - 1
+        z = (source_seed + 0x9E3779B97F4A7C15 * (InMemoryTickEngine.DIRECTIONS.index(direction) + 1)) & mask
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & mask
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & mask
+        return z ^ (z >> 31)
+
+    def _chunk_from_mask(
+        self,
+        chunk_id: str,
+        *,
+        seed: int,
+        walkable: bytearray,
+        pinned: bool = False,
+        components: Optional[array] = None,
+    ) -> ChunkState:
+        now = self._clock()
         return ChunkState(
             chunk_id=chunk_id,
             width=self.width,
             height=self.height,
-            tiles_static=tiles_static,
+            walkable=walkable,
             neighbors={direction: None for direction in self.DIRECTIONS},
             occupancy={},
+            occupied=bytearray(self.width * self.height),
+            components=components if components is not None else array("I"),
             agents=set(),
             created_at=now,
             last_player_left_at=now,
             pinned=pinned,
-            seed=chunk_seed,
+            seed=seed,
         )
 
+    def _chunk_static_cache(self, chunk: ChunkState) -> Tuple[Dict[str, Any], str]:
+        # Tiles never change after _new_chunk, so everything except neighbors and
+        # tick_base is built and serialized once per chunk. The cached objects are
+        # shared by every payload and must not be mutated.
+        if chunk.static_cache is None:
+            fields = {
+                "chunk_id": chunk.chunk_id,
+                "size": {"w": self.width, "h": self.height},
+                "tiles": chunk.tiles_static,
+                "grid": self._build_numeric_grid(chunk),
+                "legend": {".": "floor", "#": "wall"},
+                "render_hint": {
+                    "cell_codes": {"0": "floor", "1": "wall"},
+                    "agent_overlay": "chunk_delta.agents",
+                    "npc_overlay": "chunk_delta.npcs",
+                    "debug_move_default_agent_id": self.DEMO_PLAYER_ID,
+                },
+            }
+            chunk.static_cache = (fields, dump_json(fields)[1:-1])
+        return chunk.static_cache
+
     def _build_chunk_static_payload(self, chunk: ChunkState) -> Dict[str, Any]:
+        fields, _body = self._chunk_static_cache(chunk)
         return {
-            "chunk_id": chunk.chunk_id,
-            "size": {"w": self.width, "h": self.height},
-            "tiles": list(chunk.tiles_static),
-            "grid": self._build_numeric_grid(chunk),
-            "legend": {".": "floor", "#": "wall"},
-            "render_hint": {
-                "cell_codes": {"0": "floor", "1": "wall"},
-                "agent_overlay": "chunk_delta.agents",
-                "npc_overlay": "chunk_delta.npcs",
-                "debug_move_default_agent_id": self.DEMO_PLAYER_ID,
-            },
+            **fields,
             "neighbors": dict(chunk.neighbors),
             "tick_base": self._tick,
         }
 
+    def _build_chunk_static_json(self, chunk: ChunkState) -> str:
+        _fields, body = self._chunk_static_cache(chunk)
+        return f'{{{body},"neighbors":{dump_json(chunk.neighbors)},"tick_base":{self._tick}}}'
+
     def _is_walkable(self, chunk: ChunkState, x: int, y: int) -> bool:
         if not (0 <= x < chunk.width and 0 <= y < chunk.height):
             return False
-        return chunk.tiles_static[y][x] != "#"
+        return bool(chunk.walkable[y * chunk.width + x])
+
+    def _iter_walkable_cells(self, chunk: ChunkState, *, margin: int = 0) -> Iterator[Cell]:
+        mask = chunk.walkable
+        for y in range(margin, chunk.height - margin):
+            row_start = y * chunk.width
+            row_end = row_start + chunk.width - margin
+            idx = mask.find(1, row_start + margin, row_end)
+            while idx != -1:
+                yield (idx - row_start, y)
+                idx = mask.find(1, idx + 1, row_end)
 
     def _build_numeric_grid(self, chunk: ChunkState) -> List[List[int]]:
-        rows: List[List[int]] = []
-        for row in chunk.tiles_static:
-            rows.append([1 if ch == "#" else 0 for ch in row])
-        return rows
+        mask = chunk.walkable
+        width = chunk.width
+        return [
+            [0 if cell else 1 for cell in mask[y * width : (y + 1) * width]]
+            for y in range(chunk.height)
+        ]
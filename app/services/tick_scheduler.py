@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+# What to do with tick slots whose deadline passed while a tick was still running.
+OVERRUN_SKIP = "skip"  # drop every missed slot and resume on the next slot boundary
+OVERRUN_CATCH_UP = "catch_up"  # run missed slots back to back, at most max_catch_up_ticks of them
+OVERRUN_DEGRADE = "degrade"  # re-anchor the schedule at the late tick; the rate drops instead
+OVERRUN_POLICIES = (OVERRUN_SKIP, OVERRUN_CATCH_UP, OVERRUN_DEGRADE)
+
+
+@dataclass
+class TickSchedulerStats:
+    ticks: int = 0
+    late_ticks: int = 0
+    skipped_ticks: int = 0
+    max_overrun_seconds: float = 0.0
+    last_tick_seconds: float = 0.0
+    max_tick_seconds: float = 0.0
+    started_at: Optional[float] = None
+
+
+class FixedTimestepScheduler:
+    """
+    Runs `tick` on a fixed grid of monotonic deadlines (start + n * interval).
+
+    Sleeping until the next deadline rather than for `interval - elapsed` keeps
+    sleep jitter from accumulating. A tick is late when it finishes past the
+    deadline of the following slot; the policy decides what happens to the
+    slots it ran over.
+    """
+
+    def __init__(
+        self,
+        *,
+        tick_hz: int,
+        tick: Callable[[], Awaitable[None]],
+        overrun_policy: str = OVERRUN_CATCH_UP,
+        max_catch_up_ticks: int = 3,
+        clock: Optional[Callable[[], float]] = None,
+        sleep: Optional[Callable[[float], Awaitable[Any]]] = None,
+    ) -> None:
+        if overrun_policy not in OVERRUN_POLICIES:
+            raise ValueError(f"unknown overrun policy: {overrun_policy}")
+        self.interval = 1.0 / max(1, tick_hz)
+        self.overrun_policy = overrun_policy
+        self.max_catch_up_ticks = max(0, max_catch_up_ticks)
+        self._tick = tick
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or asyncio.sleep
+        self.stats = TickSchedulerStats()
+
+    async def run(self) -> None:
+        deadline = self._clock()
+        self.stats.started_at = deadline
+        while True:
+            now = self._clock()
+            if now < deadline:
+                await self._sleep(deadline - now)
+                continue
+
+            started = self._clock()
+            await self._tick()
+            finished = self._clock()
+            deadline = self._next_deadline(deadline, started=started, finished=finished)
+            if finished >= deadline:
+                # The next slot is already due (catch-up, or degrade's re-anchor). Yield
+                # once so back-to-back ticks do not starve the rest of the event loop.
+                await self._sleep(0)
+
+    def _next_deadline(self, deadline: float, *, started: float, finished: float) -> float:
+        stats = self.stats
+        elapsed = finished - started
+        stats.ticks += 1
+        stats.last_tick_seconds = elapsed
+        stats.max_tick_seconds = max(stats.max_tick_seconds, elapsed)
+
+        deadline += self.interval
+        overrun = finished - deadline
+        if overrun <= 0:
+            return deadline
+
+        stats.late_ticks += 1
+        stats.max_overrun_seconds = max(stats.max_overrun_seconds, overrun)
+        # Slots whose deadline is already behind us, including `deadline` itself.
+        due = int(overrun // self.interval) + 1
+
+        if self.overrun_policy == OVERRUN_DEGRADE:
+            return finished
+        if self.overrun_policy == OVERRUN_SKIP:
+            stats.skipped_ticks += due
+            return deadline + due * self.interval
+        dropped = max(0, due - self.max_catch_up_ticks)
+        stats.skipped_ticks += dropped
+        return deadline + dropped * self.interval
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = self.stats
+        effective_hz = 0.0
+        if stats.started_at is not None:
+            window = self._clock() - stats.started_at
+            if window > 0:
+                effective_hz = stats.ticks / window
+        return {
+            "target_tick_hz": 1.0 / self.interval,
+            "effective_tick_hz": effective_hz,
+            "overrun_policy": self.overrun_policy,
+            "ticks": stats.ticks,
+            "late_ticks": stats.late_ticks,
+            "skipped_ticks": stats.skipped_ticks,
+            "max_overrun_ms": stats.max_overrun_seconds * 1000.0,
+            "last_tick_ms": stats.last_tick_seconds * 1000.0,
+            "max_tick_ms": stats.max_tick_seconds * 1000.0,
+        }
@@ -0,0 +1,95 @@
+"""Event-loop stalls when a burst of agents submit moves in the same tick.
+
+AGENTS agents stand in the 50x50 root chunk and all submit a move_to to a
+random walkable cell between two ticks. The moves are planned as one batch
+by the background planner, either on a thread of the loop's default
+executor or on a process pool, and committed. The benchmark times that
+planning phase, and a heartbeat task records the longest gap during it in
+which the event loop could not run.
+
+Run with ``python -m benchmarks.bench_batch_planning``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from app.services.tick_engine import InMemoryTickEngine
+
+AGENTS = 200
+ROUNDS = 5
+
+
+async def _heartbeat(gaps: List[float], stop: asyncio.Event) -> None:
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def _measure(executor: Optional[ProcessPoolExecutor]) -> Tuple[float, float]:
+    engine = InMemoryTickEngine(tick_hz=5, planning_executor=executor, planning_pool_min_batch=32)
+    for idx in range(AGENTS):
+        await engine.ensure_agent(f"agent-{idx}")
+    chunk = engine._chunks[engine.default_chunk_id]
+    cells = list(engine._iter_walkable_cells(chunk, margin=1))
+    rng = random.Random(7)
+
+    plan_ms: List[float] = []
+    stall_ms: List[float] = []
+    for round_idx in range(ROUNDS):
+        # Queue the burst while a tick loop is "running", so the background planner takes it.
+        engine._task = asyncio.get_running_loop().create_future()
+        gaps: List[float] = []
+        stop = asyncio.Event()
+        heartbeat = asyncio.ensure_future(_heartbeat(gaps, stop))
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        submits = []
+        for idx in range(AGENTS):
+            goal = rng.choice(cells)
+            submits.append(
+                asyncio.ensure_future(
+                    engine.submit_move_command(
+                        agent_id=f"agent-{idx}",
+                        server_cmd_id=f"cmd-{round_idx}-{idx}",
+                        target_x=goal[0],
+                        target_y=goal[1],
+                    )
+                )
+            )
+        await asyncio.sleep(0)
+        await engine._plan_task
+        async with engine._world_lock:
+            engine._commit_planned(accepted_tick=engine.tick + 1)
+        plan_ms.append((time.perf_counter() - started) * 1000)
+        stop.set()
+        await heartbeat
+        stall_ms.append(max(gaps) * 1000)
+        await asyncio.gather(*submits, return_exceptions=True)
+
+        engine._task = None
+        for cmd in list(engine._agent_active_cmd.values()):
+            cmd.cancelled = True
+            engine._executing.pop(cmd.server_cmd_id, None)
+        engine._agent_active_cmd.clear()
+    return sorted(plan_ms)[len(plan_ms) // 2], max(stall_ms)
+
+
+async def main() -> None:
+    thread_plan, thread_stall = await _measure(None)
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        await asyncio.get_running_loop().run_in_executor(executor, int)
+        pool_plan, pool_stall = await _measure(executor)
+    print(f"{AGENTS} moves per batch  thread: planning {thread_plan:6.1f} ms, longest loop stall {thread_stall:6.1f} ms")
+    print(f"{AGENTS} moves per batch  pool:   planning {pool_plan:6.1f} ms, longest loop stall {pool_stall:6.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
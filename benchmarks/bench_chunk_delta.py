@@ -0,0 +1,79 @@
+"""Delta building with 5,000 agents spread over 200 chunks.
+
+Each round moves one agent in every affected chunk and then builds that
+chunk's delta payload, the way tick_once does.
+
+Run with ``python -m benchmarks.bench_chunk_delta``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List
+
+from app.services.tick_engine import AgentEntity, ChunkState, InMemoryTickEngine
+
+AGENTS = 5_000
+CHUNKS = 200
+AFFECTED_PER_TICK = 20
+ROUNDS = 50
+
+
+def _populate(engine: InMemoryTickEngine) -> List[ChunkState]:
+    chunks = [engine._chunks[engine.default_chunk_id]]
+    while len(chunks) < CHUNKS:
+        chunk = engine._new_chunk()
+        engine._chunks[chunk.chunk_id] = chunk
+        chunks.append(chunk)
+
+    for idx in range(AGENTS):
+        chunk = chunks[idx % CHUNKS]
+        free = [
+            (x, y)
+            for y in range(engine.height)
+            for x in range(engine.width)
+            if engine._is_walkable(chunk, x, y) and (x, y) not in chunk.occupancy
+        ]
+        x, y = free[0]
+        entity = AgentEntity(agent_id=f"agent-{idx:05d}", chunk_id=chunk.chunk_id, x=x, y=y)
+        engine._agents[entity.agent_id] = entity
+        engine._attach_agent(chunk, entity)
+    return chunks
+
+
+def _legacy_agent_snapshots(engine: InMemoryTickEngine, chunk: ChunkState) -> List[Dict[str, Any]]:
+    agents = [
+        engine._agent_snapshot_from_entity(entity)
+        for entity in engine._agents.values()
+        if entity.chunk_id == chunk.chunk_id
+    ]
+    agents.sort(key=lambda item: item["id"])
+    return agents
+
+
+def main() -> None:
+    engine = InMemoryTickEngine(tick_hz=5, width=50, height=50)
+    chunks = _populate(engine)
+    affected = chunks[:AFFECTED_PER_TICK]
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for chunk in affected:
+            _legacy_agent_snapshots(engine, chunk)
+    legacy = (time.perf_counter() - started) / ROUNDS
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for chunk in affected:
+            mover = engine._agents[chunk.agent_order[0]]
+            engine._move_agent(chunk, mover, (mover.x, mover.y))
+            engine._build_chunk_delta_payload(chunk, events=[])
+    indexed = (time.perf_counter() - started) / ROUNDS
+
+    print(f"agents={AGENTS} chunks={CHUNKS} affected_per_tick={AFFECTED_PER_TICK}")
+    print(f"world scan + sort + rebuild : {legacy * 1000:8.3f} ms/tick")
+    print(f"chunk index + dirty rows    : {indexed * 1000:8.3f} ms/tick  ({legacy / indexed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
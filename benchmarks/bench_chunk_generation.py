@@ -0,0 +1,44 @@
+"""Chunks per second: pure Python generator vs the NumPy variant.
+
+Both produce identical tiles for the same seed; the NumPy side is timed
+through generate_chunk_mask, which is what the chunk cache calls.
+
+Run with ``python -m benchmarks.bench_chunk_generation`` (needs numpy).
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from app.services.chunk_generation import generate_chunk_tiles, tiles_to_walkable_mask
+from app.services.chunk_generation_np import HAVE_NUMPY, generate_chunk_mask
+
+SIZES = (50, 256)
+CHUNKS = {50: 400, 256: 40}
+
+
+def _python_mask(**kwargs) -> bytearray:
+    return tiles_to_walkable_mask(generate_chunk_tiles(**kwargs))
+
+
+def _rate(generate: Callable[..., bytearray], size: int, count: int) -> float:
+    started = time.perf_counter()
+    for seed in range(count):
+        generate(width=size, height=size, seed=seed * 0x9E3779B1, required_edges={"W"})
+    return count / (time.perf_counter() - started)
+
+
+def main() -> None:
+    if not HAVE_NUMPY:
+        raise SystemExit("numpy is not installed (pip install .[fast])")
+    for size in SIZES:
+        count = CHUNKS[size]
+        python_rate = _rate(_python_mask, size, count)
+        numpy_rate = _rate(generate_chunk_mask, size, count)
+        print(f"{size}x{size}: python {python_rate:9.1f} chunks/s  numpy {numpy_rate:9.1f} chunks/s"
+              f"  ({numpy_rate / python_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
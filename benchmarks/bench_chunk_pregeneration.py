@@ -0,0 +1,88 @@
+"""Tick latency while agents keep walking into ungenerated chunks.
+
+Each round puts WALKERS agents at the east edge band of fresh chunks and
+ticks until all of them have crossed. Inline generation runs
+generate_chunk_tiles inside tick_once; pregeneration hands it to a
+process pool as soon as a path enters the exit band.
+
+Run with ``python -m benchmarks.bench_chunk_pregeneration``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from app.services.tick_engine import AgentEntity, InMemoryTickEngine, TickEngineError
+
+SIZE = 256
+WALKERS = 4
+ROUNDS = 5
+BAND = 16
+TICK_SECONDS = 0.05
+
+
+async def _measure(executor: Optional[ProcessPoolExecutor]) -> List[float]:
+    engine = InMemoryTickEngine(
+        tick_hz=20,
+        width=SIZE,
+        height=SIZE,
+        pregeneration_band=BAND,
+        chunk_executor=executor,
+    )
+    latencies: List[float] = []
+    for round_idx in range(ROUNDS):
+        for walker in range(WALKERS):
+            chunk = engine._new_chunk(required_edges={"E", "W"})
+            engine._chunks[chunk.chunk_id] = chunk
+            start_x = SIZE - BAND - 8
+            for y in range(1, SIZE - 1):
+                if not (engine._is_walkable(chunk, start_x, y) and engine._is_walkable(chunk, SIZE - 1, y)):
+                    continue
+                agent_id = f"walker-{round_idx}-{walker}"
+                entity = AgentEntity(agent_id=agent_id, chunk_id=chunk.chunk_id, x=start_x, y=y)
+                engine._agents[agent_id] = entity
+                engine._attach_agent(chunk, entity)
+                try:
+                    await engine.submit_move_command(
+                        agent_id=agent_id,
+                        server_cmd_id=f"cmd-{agent_id}",
+                        target_x=SIZE - 1,
+                        target_y=y,
+                    )
+                    break
+                except TickEngineError:
+                    engine._detach_agent(chunk, entity)
+                    del engine._agents[agent_id]
+        while engine._agent_active_cmd:
+            started = time.perf_counter()
+            await engine.tick_once()
+            elapsed = time.perf_counter() - started
+            latencies.append(elapsed)
+            await asyncio.sleep(max(0.0, TICK_SECONDS - elapsed))
+    return latencies
+
+
+def _report(label: str, latencies: List[float]) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<22}: ticks={len(ordered):4d} median={statistics.median(ordered) * 1000:7.3f} ms"
+        f" p99={p99 * 1000:7.3f} ms max={ordered[-1] * 1000:7.3f} ms"
+    )
+
+
+def main() -> None:
+    print(f"chunk={SIZE}x{SIZE} walkers={WALKERS} rounds={ROUNDS} band={BAND}")
+    _report("inline generation", asyncio.run(_measure(None)))
+    with ProcessPoolExecutor(max_workers=WALKERS) as executor:
+        # Worker start-up is paid once at engine start, not on the tick path.
+        list(executor.map(int, range(WALKERS)))
+        _report("process pool pregen", asyncio.run(_measure(executor)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Blocked failures and client retries for a 100-agent crowd: A*, A* with
+block repair, and WHCA*.
+
+Every agent walks to GOALS random floor cells of the root chunk, one after the
+other; goals are distinct and free when chosen. A command that fails as
+blocked is resubmitted to the same goal, the way a client would after a fresh
+challenge round trip. With plain A* other agents are static obstacles at plan
+time; the repair run waits out or detours around a blocked step instead of
+failing; whca plans around the (tick, cell) slots of executing commands.
+
+Run with ``python -m benchmarks.bench_crowd``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.services.pathfinding import PATH_MODE_ASTAR, PATH_MODE_WHCA, Cell
+from app.services.tick_engine import InMemoryTickEngine, TickEngineError
+
+AGENTS = 100
+GOALS = 3
+MAX_TICKS = 600
+
+
+async def _run(path_mode: str, **engine_options: Any) -> Dict[str, float]:
+    engine = InMemoryTickEngine(tick_hz=5, width=50, height=50, path_mode=path_mode, **engine_options)
+    chunk = engine._chunks[engine.default_chunk_id]
+    cells: List[Cell] = list(engine._iter_walkable_cells(chunk, margin=1))
+    rng = random.Random(11)
+    queues = {}
+    for idx in range(AGENTS):
+        agent_id = f"agent-{idx}"
+        queues[agent_id] = await engine.register_listener(agent_id)
+        agent = await engine.ensure_agent(agent_id)
+        # Spread the crowd out: spawns are packed, which walls in the agents inside.
+        engine._move_agent(chunk, agent, rng.choice([cell for cell in cells if cell not in chunk.occupancy]))
+
+    goals_left = {agent_id: GOALS for agent_id in queues}
+    targets: Dict[str, Cell] = {}
+    counts = {"submits": 0, "retries": 0, "blocked": 0, "completed": 0}
+    serial = [0]
+    plan_seconds = [0.0]
+
+    async def submit(agent_id: str, goal: Cell) -> None:
+        serial[0] += 1
+        counts["submits"] += 1
+        started = time.perf_counter()
+        try:
+            await engine.submit_move_command(
+                agent_id=agent_id, server_cmd_id=f"cmd-{serial[0]}", target_x=goal[0], target_y=goal[1]
+            )
+        except TickEngineError:
+            # Unreachable right now (e.g. walled in by resting agents): pick another goal.
+            targets.pop(agent_id, None)
+        finally:
+            plan_seconds[0] += time.perf_counter() - started
+
+    async def next_goal(agent_id: str) -> None:
+        if goals_left[agent_id] == 0:
+            return
+        goals_left[agent_id] -= 1
+        # Distinct free goals: a goal another agent rests on blocks under any planner.
+        taken = set(targets.values()) | set(chunk.occupancy)
+        targets[agent_id] = rng.choice([cell for cell in cells if cell not in taken])
+        await submit(agent_id, targets[agent_id])
+
+    for agent_id in queues:
+        await next_goal(agent_id)
+
+    tick_seconds = 0.0
+    ticks = 0
+    while ticks < MAX_TICKS and (targets or any(goals_left.values())):
+        started = time.perf_counter()
+        await engine.tick_once()
+        tick_seconds += time.perf_counter() - started
+        ticks += 1
+        for agent_id, queue in queues.items():
+            while not queue.empty():
+                event = queue.get_nowait()
+                if event["type"] != "command_result":
+                    continue
+                if event["payload"]["status"] == "completed":
+                    counts["completed"] += 1
+                    targets.pop(agent_id, None)
+                    await next_goal(agent_id)
+                elif event["payload"].get("reason") == "blocked":
+                    counts["blocked"] += 1
+                    counts["retries"] += 1
+                    await submit(agent_id, targets[agent_id])
+        for agent_id in list(queues):
+            if agent_id not in targets and goals_left[agent_id] and not await engine.has_active_command(agent_id):
+                await next_goal(agent_id)
+
+    return {
+        **counts,
+        "ticks": ticks,
+        "tick_ms": tick_seconds / max(1, ticks) * 1000,
+        "plan_ms": plan_seconds[0] / max(1, counts["submits"]) * 1000,
+    }
+
+
+def _report(label: str, result: Dict[str, float]) -> None:
+    commands = result["submits"]
+    print(
+        f"{label:<12} blocked={int(result['blocked']):4d} ({result['blocked'] / max(1, commands):5.1%} of commands)"
+        f"  retries={int(result['retries']):4d}  completed={int(result['completed']):3d}"
+        f"  ticks={int(result['ticks']):3d}  tick={result['tick_ms']:5.2f} ms  plan={result['plan_ms']:5.2f} ms/cmd"
+    )
+
+
+async def main() -> None:
+    results: List[Tuple[str, Dict[str, float]]] = []
+    results.append(("astar", await _run(PATH_MODE_ASTAR)))
+    results.append(("astar+repair", await _run(PATH_MODE_ASTAR, block_wait_ticks=2, block_detour_steps=4)))
+    results.append(("whca", await _run(PATH_MODE_WHCA)))
+    for label, result in results:
+        _report(label, result)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
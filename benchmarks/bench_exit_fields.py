@@ -0,0 +1,79 @@
+"""Legs towards a chunk exit: A* per leg vs descent down a stand distance field.
+
+Each generated dungeon chunk gets random interior starts heading for the
+middle stand cell of every exit band, the way a cross-chunk move_to leg
+does. The field is built once per stand (timed separately); afterwards a
+leg costs one step per path cell.
+
+Run with ``python -m benchmarks.bench_exit_fields``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import List, Tuple
+
+from app.services.chunk_generation import DIRECTIONS, generate_chunk_tiles, tiles_to_walkable_mask
+from app.services.pathfinding import Cell, astar_path
+from app.services.portal_graph import ChunkPortals
+
+SIZE = 50
+CHUNKS = 8
+STARTS = 25
+
+
+def _legs(seed: int) -> Tuple[bytearray, ChunkPortals, List[Tuple[Cell, Cell]]]:
+    rng = random.Random(seed)
+    walkable = tiles_to_walkable_mask(
+        generate_chunk_tiles(width=SIZE, height=SIZE, seed=seed, required_edges=set(DIRECTIONS))
+    )
+    portals = ChunkPortals(walkable, SIZE, SIZE)
+    floor = [(idx % SIZE, idx // SIZE) for idx, cell in enumerate(portals.interior) if cell]
+    legs = []
+    for direction in DIRECTIONS:
+        stands = [stand for _edge, stand in portals._crossable[direction]]
+        if not stands:
+            continue
+        stand = stands[len(stands) // 2]
+        legs.extend((rng.choice(floor), stand) for _ in range(STARTS))
+    return walkable, portals, legs
+
+
+def main() -> None:
+    astar_seconds = descent_seconds = field_seconds = 0.0
+    legs_total = fields = field_bytes = 0
+    for seed in range(CHUNKS):
+        _walkable, portals, legs = _legs(seed)
+        started = time.perf_counter()
+        for stand in {stand for _start, stand in legs}:
+            portals.stand_field(stand)
+            fields += 1
+        field_seconds += time.perf_counter() - started
+        field_bytes += portals.field_bytes()
+
+        started = time.perf_counter()
+        searched = [
+            astar_path(width=SIZE, height=SIZE, start=start, goal=stand, walkable=portals.interior)
+            for start, stand in legs
+        ]
+        astar_seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        descended = [portals.descend(start, stand) for start, stand in legs]
+        descent_seconds += time.perf_counter() - started
+        for path, other in zip(searched, descended):
+            assert (path is None) == (other is None) and (path is None or len(path) == len(other))
+        legs_total += len(legs)
+
+    print(
+        f"{legs_total} legs on {CHUNKS} chunks: A* {astar_seconds / legs_total * 1000:6.3f} ms/leg"
+        f"  descent {descent_seconds / legs_total * 1000:6.3f} ms/leg ({astar_seconds / descent_seconds:.1f}x)"
+    )
+    print(
+        f"fields: {fields} built, {field_seconds / fields * 1000:6.3f} ms each,"
+        f" {field_bytes / CHUNKS / 1024:5.1f} KiB per chunk"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Planning a crowd that converges on one cell: A* per agent vs one flow field.
+
+AGENTS agents are scattered over the root chunk and all sent to its center.
+With A* every submit runs its own search; in flow mode the first submit
+builds the field and the rest reuse it, and each tick looks the steps up.
+Only one agent can end on the cell, so the rest fail as blocked once they
+reach the agents already standing around it.
+
+Run with ``python -m benchmarks.bench_flow_field``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Dict, List
+
+from app.services.pathfinding import PATH_MODE_ASTAR, PATH_MODE_FLOW, Cell
+from app.services.tick_engine import InMemoryTickEngine
+
+AGENTS = 100
+TICKS = 60
+
+
+async def _run(path_mode: str) -> Dict[str, float]:
+    engine = InMemoryTickEngine(tick_hz=5, width=50, height=50, path_mode=path_mode)
+    chunk = engine._chunks[engine.default_chunk_id]
+    cells: List[Cell] = list(engine._iter_walkable_cells(chunk, margin=1))
+    rng = random.Random(5)
+    goal = (chunk.width // 2, chunk.height // 2)
+    agent_ids = [f"agent-{idx}" for idx in range(AGENTS)]
+    agents = []
+    for agent_id in agent_ids:
+        agent = await engine.ensure_agent(agent_id)
+        free = [cell for cell in cells if cell not in chunk.occupancy and cell != goal]
+        engine._move_agent(chunk, agent, rng.choice(free))
+        agents.append(agent)
+
+    started = time.perf_counter()
+    for serial, agent_id in enumerate(agent_ids):
+        await engine.submit_move_command(
+            agent_id=agent_id, server_cmd_id=f"cmd-{serial}", target_x=goal[0], target_y=goal[1]
+        )
+    submit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(TICKS):
+        await engine.tick_once()
+    tick_seconds = time.perf_counter() - started
+    spread = sum(abs(agent.x - goal[0]) + abs(agent.y - goal[1]) for agent in agents) / AGENTS
+    return {
+        "spread": spread,
+        "submit_ms": submit_seconds / AGENTS * 1000,
+        "tick_ms": tick_seconds / TICKS * 1000,
+    }
+
+
+async def main() -> None:
+    for label, mode in (("astar", PATH_MODE_ASTAR), ("flow", PATH_MODE_FLOW)):
+        result = await _run(mode)
+        print(
+            f"{label:<5} {AGENTS} agents -> one cell: plan {result['submit_ms']:6.3f} ms/cmd"
+            f"  tick {result['tick_ms']:6.3f} ms  mean distance left {result['spread']:5.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
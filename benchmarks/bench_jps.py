@@ -0,0 +1,59 @@
+"""Node expansions and time: A* vs Jump Point Search on the root chunk.
+
+The root chunk is a round hall with four 4-wide corridors running to the
+chunk edges. Routes go corridor to corridor, so they cross the hall where
+A* has the most equal-f ties to expand.
+
+Run with ``python -m benchmarks.bench_jps``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import List, Tuple
+
+from app.services.pathfinding import Cell, grid_pathfinder
+from app.services.tick_engine import InMemoryTickEngine
+
+ROUNDS = 50
+
+
+def _routes(size: int) -> List[Tuple[str, Cell, Cell]]:
+    low, high = size // 2 - 2, size // 2 + 1
+    return [
+        ("W->E corridor", (0, low), (size - 1, high)),
+        ("S->N corridor", (low, 0), (high, size - 1)),
+        ("W->N corner", (0, low), (high, size - 1)),
+        ("S->E corner", (high, 0), (size - 1, low)),
+    ]
+
+
+def main() -> None:
+    engine = InMemoryTickEngine(tick_hz=5, width=50, height=50)
+    chunk = engine._chunks[engine.default_chunk_id]
+    finder = grid_pathfinder(chunk.width, chunk.height)
+
+    for label, start, goal in _routes(chunk.width):
+        astar = finder.search(start, goal, walkable=chunk.walkable)
+        astar_expanded = finder.expanded
+        jps = finder.jump_search(start, goal, walkable=chunk.walkable)
+        jps_expanded = finder.expanded
+        assert astar is not None and jps is not None and len(astar) == len(jps)
+
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            finder.search(start, goal, walkable=chunk.walkable)
+        astar_ms = (time.perf_counter() - started) / ROUNDS * 1000
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            finder.jump_search(start, goal, walkable=chunk.walkable)
+        jps_ms = (time.perf_counter() - started) / ROUNDS * 1000
+
+        print(
+            f"{label:<14} len={len(astar):3d}  expansions astar={astar_expanded:4d} jps={jps_expanded:3d}"
+            f" ({astar_expanded / max(1, jps_expanded):.0f}x)  time astar={astar_ms:6.3f} ms jps={jps_ms:6.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""A* expansions with Manhattan vs ALT landmark heuristics on dungeon chunks.
+
+Room-and-corridor chunks make Manhattan distance a poor guide: the straight
+line towards the goal usually runs into a wall. Routes here are random
+floor-to-floor pairs at least one chunk width apart. Landmark tables are
+built once per chunk (timed) and cost 2 bytes per cell each.
+
+Run with ``python -m benchmarks.bench_landmarks``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from app.services.chunk_generation import DIRECTIONS, generate_chunk_tiles, tiles_to_walkable_mask
+from app.services.pathfinding import GridPathfinder, landmark_tables
+
+CHUNKS = 6
+PAIRS = 60
+LANDMARKS = 4
+
+
+def main() -> None:
+    for size in (50, 100):
+        plain_expanded = alt_expanded = routes = 0
+        plain_seconds = alt_seconds = build_seconds = 0.0
+        table_bytes = 0
+        for seed in range(CHUNKS):
+            walkable = tiles_to_walkable_mask(
+                generate_chunk_tiles(width=size, height=size, seed=seed, required_edges=set(DIRECTIONS))
+            )
+            started = time.perf_counter()
+            landmarks = landmark_tables(walkable, size, size, LANDMARKS)
+            build_seconds += time.perf_counter() - started
+            table_bytes = sum(table.itemsize * len(table) for table in landmarks)
+
+            floor = [(idx % size, idx // size) for idx, cell in enumerate(walkable) if cell]
+            finder = GridPathfinder(size, size)
+            rng = random.Random(seed)
+            for _ in range(PAIRS):
+                start, goal = rng.choice(floor), rng.choice(floor)
+                path = finder.search(start, goal, walkable=walkable)
+                if path is None or len(path) < size:
+                    continue
+                routes += 1
+                started = time.perf_counter()
+                finder.search(start, goal, walkable=walkable)
+                plain_seconds += time.perf_counter() - started
+                plain_expanded += finder.expanded
+                started = time.perf_counter()
+                alt = finder.search(start, goal, walkable=walkable, landmarks=landmarks)
+                alt_seconds += time.perf_counter() - started
+                alt_expanded += finder.expanded
+                assert alt is not None and len(alt) == len(path)
+
+        print(
+            f"{size}x{size}: {routes} routes  expanded {plain_expanded / routes:6.1f} -> {alt_expanded / routes:6.1f}"
+            f"  ({plain_expanded / alt_expanded:.1f}x)  {plain_seconds / routes * 1000:5.3f} ->"
+            f" {alt_seconds / routes * 1000:5.3f} ms  tables {table_bytes / 1024:5.1f} KiB,"
+            f" built in {build_seconds / CHUNKS * 1000:5.2f} ms per chunk"
+        )
+
+
+if __name__ == "__main__":
+    main()
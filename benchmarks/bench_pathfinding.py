@@ -0,0 +1,102 @@
+"""A* on worst-case 50x50 mazes: tuple-keyed search vs the flat-index pathfinder.
+
+Mazes are perfect (one route between any two cells) and the endpoints sit
+in opposite corners, so the search has to wind through most of the grid.
+The "open hall" case has scattered agents as dynamic obstacles instead.
+
+Run with ``python -m benchmarks.bench_pathfinding``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, List, Optional, Tuple
+
+from app.services.pathfinding import Cell, astar_path
+
+SIZE = 50
+MAZES = 8
+ROUNDS = 20
+
+
+def _maze(seed: int) -> bytearray:
+    rng = random.Random(seed)
+    walkable = bytearray(SIZE * SIZE)
+    stack = [(1, 1)]
+    walkable[SIZE + 1] = 1
+    while stack:
+        x, y = stack[-1]
+        options = [
+            (x + dx, y + dy, dx, dy)
+            for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < x + dx < SIZE - 1 and 0 < y + dy < SIZE - 1 and not walkable[(y + dy) * SIZE + x + dx]
+        ]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny, dx, dy = rng.choice(options)
+        walkable[(y + dy // 2) * SIZE + x + dx // 2] = 1
+        walkable[ny * SIZE + nx] = 1
+        stack.append((nx, ny))
+    return walkable
+
+
+def _hall(seed: int) -> Tuple[bytearray, bytearray]:
+    rng = random.Random(seed)
+    walkable = bytearray(b"\x01" * (SIZE * SIZE))
+    occupied = bytearray(SIZE * SIZE)
+    for _ in range(SIZE * SIZE // 6):
+        occupied[rng.randrange(SIZE * SIZE)] = 1
+    occupied[0] = occupied[-1] = 0
+    return walkable, occupied
+
+
+def _timed(search: Callable[[], Optional[List[Cell]]]) -> Tuple[float, Optional[List[Cell]]]:
+    result = search()
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        search()
+    return (time.perf_counter() - started) / ROUNDS, result
+
+
+def _compare(label: str, walkable: bytearray, occupied: bytearray, start: Cell, goal: Cell) -> Tuple[float, float]:
+    def occupied_at(cell: Cell) -> bool:
+        return bool(occupied[cell[1] * SIZE + cell[0]])
+
+    legacy, legacy_path = _timed(
+        lambda: astar_path(
+            width=SIZE, height=SIZE, start=start, goal=goal, walkable=walkable, is_blocked=occupied_at
+        )
+    )
+    flat, flat_path = _timed(
+        lambda: astar_path(width=SIZE, height=SIZE, start=start, goal=goal, walkable=walkable, blocked=occupied)
+    )
+    assert legacy_path == flat_path, label
+    return legacy, flat
+
+
+def main() -> None:
+    cases = []
+    for seed in range(MAZES):
+        cases.append(("maze", _maze(seed), bytearray(SIZE * SIZE), (1, 1), (SIZE - 3, SIZE - 3)))
+        walkable, occupied = _hall(seed)
+        cases.append(("open hall", walkable, occupied, (0, 0), (SIZE - 1, SIZE - 1)))
+
+    for label in ("maze", "open hall"):
+        legacy_total = flat_total = 0.0
+        for case_label, walkable, occupied, start, goal in cases:
+            if case_label != label:
+                continue
+            legacy, flat = _compare(label, walkable, occupied, start, goal)
+            legacy_total += legacy
+            flat_total += flat
+        count = MAZES
+        print(
+            f"{label:<9} {SIZE}x{SIZE}: tuple-keyed {legacy_total / count * 1000:7.3f} ms"
+            f"  flat-index {flat_total / count * 1000:7.3f} ms  ({legacy_total / flat_total:.1f}x, same paths)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Walkability lookups: tile strings versus the per-chunk mask.
+
+Run with ``python -m benchmarks.bench_walkability``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, List
+
+from app.services.pathfinding import Cell, astar_path
+from app.services.tick_engine import ChunkState, InMemoryTickEngine
+
+ROUNDS = 200
+
+
+def _timed(fn: Callable[[], object], rounds: int = ROUNDS) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds
+
+
+def _far_floor_cells(chunk: ChunkState) -> tuple[Cell, Cell]:
+    floor = [
+        (x, y)
+        for y in range(chunk.height)
+        for x in range(chunk.width)
+        if chunk.walkable[y * chunk.width + x]
+    ]
+    return floor[0], floor[-1]
+
+
+def main() -> None:
+    engine = InMemoryTickEngine(tick_hz=5, width=50, height=50, enable_demo_actors=True)
+    chunk = engine._new_chunk(seed=20260221, required_edges={"N", "E", "S", "W"})
+    tiles: List[str] = list(chunk.tiles_static)
+    start, goal = _far_floor_cells(chunk)
+
+    def legacy_is_walkable(x: int, y: int) -> bool:
+        if not (0 <= x < chunk.width and 0 <= y < chunk.height):
+            return False
+        return tiles[y][x] != "#"
+
+    def legacy_blocked(cell: Cell) -> bool:
+        if not legacy_is_walkable(cell[0], cell[1]):
+            return True
+        return chunk.occupancy.get(cell) is not None
+
+    def occupied(cell: Cell) -> bool:
+        return chunk.occupancy.get(cell) is not None
+
+    legacy_path = _timed(
+        lambda: astar_path(width=50, height=50, start=start, goal=goal, is_blocked=legacy_blocked)
+    )
+    mask_path = _timed(
+        lambda: astar_path(
+            width=50,
+            height=50,
+            start=start,
+            goal=goal,
+            is_blocked=occupied,
+            walkable=chunk.walkable,
+        )
+    )
+
+    def legacy_scan() -> List[Cell]:
+        return [
+            (x, y)
+            for y in range(1, chunk.height - 1)
+            for x in range(1, chunk.width - 1)
+            if legacy_is_walkable(x, y)
+        ]
+
+    def mask_scan() -> List[Cell]:
+        return list(engine._iter_walkable_cells(chunk, margin=1))
+
+    legacy_cells = _timed(legacy_scan)
+    mask_cells = _timed(mask_scan)
+
+    print(f"astar {start}->{goal}: strings {legacy_path * 1e3:7.3f} ms, mask {mask_path * 1e3:7.3f} ms "
+          f"({legacy_path / mask_path:.2f}x)")
+    print(f"floor scan        : strings {legacy_cells * 1e3:7.3f} ms, mask {mask_cells * 1e3:7.3f} ms "
+          f"({legacy_cells / mask_cells:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
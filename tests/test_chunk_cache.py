@@ -0,0 +1,137 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app.services.chunk_cache import ChunkTileCache, chunk_key
+from app.services.chunk_generation import generate_chunk_tiles, tiles_to_walkable_mask
+
+
+def _generate(cache: ChunkTileCache, seed: int) -> bytearray:
+    return cache.get_or_generate(width=30, height=30, seed=seed, required_edges={"W", "N"})
+
+
+class ChunkTileCacheTests(unittest.TestCase):
+    def test_cached_mask_matches_generator_output(self) -> None:
+        cache = ChunkTileCache()
+        first = _generate(cache, 11)
+        second = _generate(cache, 11)
+
+        expected = tiles_to_walkable_mask(
+            generate_chunk_tiles(width=30, height=30, seed=11, required_edges={"N", "W"})
+        )
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected)
+        self.assertIsNot(first, second)
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+
+    def test_lru_eviction_respects_memory_budget(self) -> None:
+        cache = ChunkTileCache(max_bytes=2 * 30 * 30)
+        for seed in (1, 2, 3):
+            _generate(cache, seed)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertLessEqual(cache.snapshot()["bytes"], cache.max_bytes)
+
+        _generate(cache, 2)
+        _generate(cache, 1)
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertNotIn(chunk_key(width=30, height=30, seed=3, required_edges={"W", "N"}), cache)
+
+    def test_evicted_masks_spill_to_disk_and_reload(self) -> None:
+        with tempfile.TemporaryDirectory() as spill_dir:
+            cache = ChunkTileCache(max_bytes=30 * 30, spill_dir=spill_dir)
+            first = _generate(cache, 7)
+            _generate(cache, 8)
+            self.assertEqual(cache.stats.spills, 1)
+            spilled = os.listdir(spill_dir)
+            self.assertEqual(len(spilled), 1)
+            self.assertLess(os.path.getsize(os.path.join(spill_dir, spilled[0])), 30 * 30 // 4)
+
+            self.assertEqual(_generate(cache, 7), first)
+            self.assertEqual(cache.stats.disk_hits, 1)
+            self.assertEqual(cache.stats.misses, 2)
+
+            reopened = ChunkTileCache(max_bytes=30 * 30, spill_dir=spill_dir)
+            self.assertEqual(_generate(reopened, 8), _generate(cache, 8))
+            self.assertEqual(reopened.stats.disk_hits, 1)
+
+    def test_spill_dir_is_trimmed_to_its_byte_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as spill_dir:
+            tight = ChunkTileCache(max_bytes=30 * 30, spill_dir=spill_dir, spill_max_bytes=1)
+            for seed in (1, 2, 3):
+                _generate(tight, seed)
+            self.assertEqual(os.listdir(spill_dir), [])
+            self.assertEqual(tight.stats.spill_removals, 2)
+
+            cache = ChunkTileCache(max_bytes=30 * 30, spill_dir=spill_dir)
+            for seed in (1, 2, 3, 4):
+                _generate(cache, seed)
+            paths = [
+                cache._spill_path(chunk_key(width=30, height=30, seed=seed, required_edges={"W", "N"}))
+                for seed in (1, 2, 3)
+            ]
+            for age, path in enumerate(paths):
+                os.utime(path, (1_000 + age, 1_000 + age))
+
+            # A restart with a smaller budget drops the oldest files first.
+            budget = os.path.getsize(paths[1]) + os.path.getsize(paths[2])
+            reopened = ChunkTileCache(max_bytes=30 * 30, spill_dir=spill_dir, spill_max_bytes=budget)
+            self.assertEqual(sorted(os.listdir(spill_dir)), sorted(os.path.basename(path) for path in paths[1:]))
+            self.assertEqual(reopened.snapshot()["spill_bytes"], budget)
+            self.assertIsNone(reopened.get(chunk_key(width=30, height=30, seed=1, required_edges={"W", "N"})))
+            self.assertIsNotNone(reopened.get(chunk_key(width=30, height=30, seed=3, required_edges={"W", "N"})))
+
+
+class ChunkTileCacheLoopTests(unittest.IsolatedAsyncioTestCase):
+    async def _drain(self, cache: ChunkTileCache) -> None:
+        await asyncio.sleep(0)
+        await asyncio.get_running_loop().run_in_executor(cache._spill_thread(), int)
+        await asyncio.sleep(0)
+
+    async def test_spill_io_runs_off_the_caller(self) -> None:
+        with tempfile.TemporaryDirectory() as spill_dir:
+            cache = ChunkTileCache(max_bytes=30 * 30, spill_dir=spill_dir)
+            first = _generate(cache, 7)
+            _generate(cache, 8)
+            # The eviction is only queued; the mask is still served from memory.
+            self.assertEqual(os.listdir(spill_dir), [])
+            self.assertEqual(_generate(cache, 7), first)
+            self.assertEqual(cache.stats.misses, 2)
+
+            await self._drain(cache)
+            self.assertEqual(len(os.listdir(spill_dir)), 2)
+            key = chunk_key(width=30, height=30, seed=8, required_edges={"W", "N"})
+            self.assertNotIn(key, cache)
+
+            with mock.patch.object(cache, "_read_spill", wraps=cache._read_spill) as read:
+                self.assertIsNone(cache.get(key))
+                read.assert_not_called()
+                self.assertTrue(cache.prefetch(key))
+                await self._drain(cache)
+                read.assert_called_once()
+            self.assertIn(key, cache)
+            self.assertEqual(cache.stats.disk_hits, 1)
+            self.assertEqual(cache.get(key), _generate(ChunkTileCache(), 8))
+
+
+    async def test_close_finishes_spills_and_stops_the_spill_thread(self) -> None:
+        with tempfile.TemporaryDirectory() as spill_dir:
+            cache = ChunkTileCache(max_bytes=30 * 30, spill_dir=spill_dir)
+            _generate(cache, 7)
+            _generate(cache, 8)
+            await self._drain(cache)
+            spill_thread = cache._spill_thread()
+            # Queued, but not handed to the spill thread yet.
+            _generate(cache, 9)
+
+            cache.close()
+            self.assertTrue(spill_thread._shutdown)
+            self.assertIsNone(cache._spill_executor)
+            self.assertEqual(len(os.listdir(spill_dir)), 2)
+            self.assertEqual(cache._unwritten, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
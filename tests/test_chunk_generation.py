@@ -2,7 +2,8 @@ import unittest
 from collections import deque
 from typing import Set, Tuple
 
-from app.services.chunk_generation import generate_chunk_tiles
+from app.services.chunk_generation import generate_chunk_tiles, render_tiles, tiles_to_walkable_mask
+from app.services.chunk_generation_np import HAVE_NUMPY, generate_chunk_mask, generate_chunk_tiles_np
 
 Cell = Tuple[int, int]
 
@@ -149,6 +150,39 @@ class ChunkGenerationTests(unittest.TestCase):
         self.assertEqual(tiles[cy + 8][cx], ".")
         self.assertEqual(tiles[cy - 8][cx], ".")
 
+    def test_walkable_mask_round_trips_tiles(self) -> None:
+        tiles = generate_chunk_tiles(width=50, height=40, seed=99, required_edges={"N", "S"})
+        mask = tiles_to_walkable_mask(tiles)
+        self.assertEqual(len(mask), 50 * 40)
+        for y, row in enumerate(tiles):
+            for x, ch in enumerate(row):
+                self.assertEqual(mask[y * 50 + x], 1 if ch == "." else 0)
+        self.assertEqual(render_tiles(mask, width=50, height=40), tiles)
+
+    @unittest.skipUnless(HAVE_NUMPY, "numpy is not installed")
+    def test_numpy_generator_is_bit_identical(self) -> None:
+        for size in ((6, 6), (19, 30), (50, 50), (256, 256)):
+            for seed in range(12):
+                for edges in (set(), {"W"}, {"N", "E", "S", "W"}):
+                    for root_layout in (False, True):
+                        kwargs = dict(
+                            width=size[0],
+                            height=size[1],
+                            seed=seed * 7919,
+                            required_edges=edges,
+                            root_layout=root_layout,
+                        )
+                        tiles = generate_chunk_tiles(**kwargs)
+                        self.assertEqual(generate_chunk_tiles_np(**kwargs), tiles)
+                        self.assertEqual(generate_chunk_mask(**kwargs), tiles_to_walkable_mask(tiles))
+
+    def test_chunk_mask_matches_rendered_tiles(self) -> None:
+        tiles = generate_chunk_tiles(width=30, height=30, seed=5, required_edges={"E"})
+        self.assertEqual(
+            generate_chunk_mask(width=30, height=30, seed=5, required_edges={"E"}),
+            tiles_to_walkable_mask(tiles),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,248 @@
+import random
+import unittest
+
+from app.services.chunk_generation import generate_chunk_tiles, tiles_to_walkable_mask
+from app.services.pathfinding import (
+    NO_PATH_WIDE,
+    GridPathfinder,
+    astar_path,
+    component_labels,
+    cooperative_paths,
+    distance_field,
+    field_steps,
+    grid_pathfinder,
+    jps_path,
+    landmark_tables,
+)
+
+
+def _random_grid(rng: random.Random, width: int, height: int):
+    walkable = bytearray(1 if rng.random() > 0.3 else 0 for _ in range(width * height))
+    occupied = bytearray(1 if rng.random() < 0.08 else 0 for _ in range(width * height))
+    return walkable, occupied
+
+
+class GridPathfinderTests(unittest.TestCase):
+    def test_flat_search_returns_same_paths_as_callback_search(self) -> None:
+        rng = random.Random(1234)
+        for _ in range(150):
+            width = rng.randint(2, 30)
+            height = rng.randint(2, 30)
+            walkable, occupied = _random_grid(rng, width, height)
+            start = (rng.randrange(width), rng.randrange(height))
+            goal = (rng.randrange(width), rng.randrange(height))
+
+            expected = astar_path(
+                width=width,
+                height=height,
+                start=start,
+                goal=goal,
+                walkable=walkable,
+                is_blocked=lambda cell: bool(occupied[cell[1] * width + cell[0]]),
+            )
+            actual = astar_path(
+                width=width,
+                height=height,
+                start=start,
+                goal=goal,
+                walkable=walkable,
+                blocked=occupied,
+            )
+            self.assertEqual(actual, expected)
+
+    def test_buffers_are_reused_across_searches(self) -> None:
+        finder = grid_pathfinder(12, 9)
+        self.assertIs(grid_pathfinder(12, 9), finder)
+        g_buffer = finder._g
+
+        first = finder.search((0, 0), (11, 8))
+        walls = bytearray(b"\x01" * (12 * 9))
+        for y in range(8):
+            walls[y * 12 + 5] = 0
+        second = finder.search((0, 0), (11, 0), walkable=walls)
+
+        self.assertIs(finder._g, g_buffer)
+        assert first is not None and second is not None
+        self.assertEqual(len(first), 19)
+        self.assertIn((5, 8), second)
+        self.assertIsNone(finder.search((0, 0), (11, 0), walkable=walls, blocked=bytearray(b"\x01" * (12 * 9))))
+
+    def test_generation_wraparound_resets_stamps(self) -> None:
+        finder = GridPathfinder(4, 4)
+        finder._generation = GridPathfinder._MAX_GENERATION
+        self.assertEqual(finder.search((0, 0), (3, 3)), astar_path(width=4, height=4, start=(0, 0), goal=(3, 3)))
+        self.assertEqual(finder._generation, 1)
+
+    def test_jump_search_matches_astar_lengths_with_contiguous_steps(self) -> None:
+        rng = random.Random(99)
+        for _ in range(300):
+            width = rng.randint(1, 25)
+            height = rng.randint(1, 25)
+            walkable, occupied = _random_grid(rng, width, height)
+            start = (rng.randrange(width), rng.randrange(height))
+            goal = (rng.randrange(width), rng.randrange(height))
+
+            expected = astar_path(width=width, height=height, start=start, goal=goal, walkable=walkable, blocked=occupied)
+            actual = jps_path(width=width, height=height, start=start, goal=goal, walkable=walkable, blocked=occupied)
+            if expected is None:
+                self.assertIsNone(actual)
+                continue
+            assert actual is not None
+            self.assertEqual(len(actual), len(expected))
+            previous = start
+            for x, y in actual:
+                self.assertEqual(abs(x - previous[0]) + abs(y - previous[1]), 1)
+                if (x, y) != goal:
+                    self.assertTrue(walkable[y * width + x] and not occupied[y * width + x])
+                previous = (x, y)
+            self.assertEqual(previous, goal)
+
+    def test_jump_search_expands_far_fewer_nodes_on_root_corridors(self) -> None:
+        walkable = tiles_to_walkable_mask(
+            generate_chunk_tiles(width=50, height=50, seed=0, required_edges=(), root_layout=True)
+        )
+        finder = GridPathfinder(50, 50)
+        for start, goal in (((0, 23), (49, 26)), ((23, 0), (26, 49)), ((26, 0), (49, 23))):
+            astar = finder.search(start, goal, walkable=walkable)
+            astar_expanded = finder.expanded
+            jps = finder.jump_search(start, goal, walkable=walkable)
+            assert astar is not None and jps is not None
+            self.assertEqual(len(jps), len(astar))
+            self.assertGreaterEqual(astar_expanded, 10 * finder.expanded)
+
+    def test_search_gives_up_after_max_expanded(self) -> None:
+        finder = GridPathfinder(20, 20)
+        self.assertIsNone(finder.search((0, 0), (19, 19), max_expanded=10))
+        self.assertEqual(finder.expanded, 10)
+        path = finder.search((0, 0), (3, 0), max_expanded=10)
+        self.assertEqual(path, [(1, 0), (2, 0), (3, 0)])
+
+    def test_component_labels_agree_with_search(self) -> None:
+        rng = random.Random(3)
+        for _ in range(40):
+            width = rng.randint(2, 30)
+            height = rng.randint(2, 30)
+            walkable, _occupied = _random_grid(rng, width, height)
+            labels = component_labels(walkable, width, height)
+            self.assertEqual([bool(label) for label in labels], [bool(cell) for cell in walkable])
+            floor = [idx for idx, cell in enumerate(walkable) if cell]
+            if not floor:
+                continue
+            for _ in range(10):
+                a, b = rng.choice(floor), rng.choice(floor)
+                path = astar_path(
+                    width=width,
+                    height=height,
+                    start=(a % width, a // width),
+                    goal=(b % width, b // width),
+                    walkable=walkable,
+                )
+                self.assertEqual(labels[a] == labels[b], path is not None)
+
+    def test_distance_field_steps_match_search_lengths(self) -> None:
+        rng = random.Random(8)
+        walkable, _occupied = _random_grid(rng, 20, 20)
+        goal = next((idx % 20, idx // 20) for idx in range(400) if walkable[idx])
+        field = distance_field(width=20, height=20, goal=goal, walkable=walkable)
+        self.assertEqual(field[goal[1] * 20 + goal[0]], 0)
+        self.assertEqual(field_steps(field, goal, 20, 20), [])
+        for idx in range(400):
+            if not walkable[idx]:
+                continue
+            start = (idx % 20, idx // 20)
+            path = astar_path(width=20, height=20, start=start, goal=goal, walkable=walkable)
+            steps = field_steps(field, start, 20, 20)
+            if path is None:
+                self.assertEqual(steps, [])
+            elif path:
+                self.assertEqual(field[idx], len(path))
+                self.assertIn(path[0], steps)
+                self.assertTrue(all(field[y * 20 + x] == len(path) - 1 for x, y in steps))
+
+    def test_distance_field_widens_past_two_byte_distances(self) -> None:
+        width = 70000
+        walkable = bytearray(b"\x01") * width
+        walkable[-2] = 0
+        field = distance_field(width=width, height=1, goal=(0, 0), walkable=walkable)
+        self.assertEqual(field.typecode, "I")
+        self.assertEqual(field[width - 3], width - 3)
+        self.assertEqual(field[width - 2], NO_PATH_WIDE)
+        self.assertEqual(field_steps(field, (width - 3, 0), width, 1), [(width - 4, 0)])
+        self.assertEqual(distance_field(width=255, height=257, goal=(0, 0), walkable=b"\x01" * 65535).typecode, "H")
+
+    def test_landmark_search_finds_equally_short_paths(self) -> None:
+        rng = random.Random(99)
+        for _ in range(120):
+            width = rng.randint(2, 30)
+            height = rng.randint(2, 30)
+            walkable, occupied = _random_grid(rng, width, height)
+            landmarks = landmark_tables(walkable, width, height, 4)
+            self.assertLessEqual(len(landmarks), 4)
+            start = (rng.randrange(width), rng.randrange(height))
+            goal = (rng.randrange(width), rng.randrange(height))
+            plain = astar_path(width=width, height=height, start=start, goal=goal, walkable=walkable, blocked=occupied)
+            alt = astar_path(
+                width=width,
+                height=height,
+                start=start,
+                goal=goal,
+                walkable=walkable,
+                blocked=occupied,
+                landmarks=landmarks,
+            )
+            self.assertEqual(plain is None, alt is None)
+            if plain is not None and alt is not None:
+                self.assertEqual(len(alt), len(plain))
+                steps = [start, *alt]
+                self.assertTrue(all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(steps, steps[1:])))
+
+    def test_landmarks_cut_expansions_on_dungeon_chunks(self) -> None:
+        plain_expanded = alt_expanded = 0
+        for seed in range(3):
+            walkable = tiles_to_walkable_mask(
+                generate_chunk_tiles(width=50, height=50, seed=seed, required_edges=("N", "E", "S", "W"))
+            )
+            landmarks = landmark_tables(walkable, 50, 50, 4)
+            self.assertEqual(len(landmarks), 4)
+            floor = [(idx % 50, idx // 50) for idx, cell in enumerate(walkable) if cell]
+            rng = random.Random(seed)
+            finder = GridPathfinder(50, 50)
+            for _ in range(20):
+                start, goal = rng.choice(floor), rng.choice(floor)
+                plain = finder.search(start, goal, walkable=walkable)
+                plain_expanded += finder.expanded
+                alt = finder.search(start, goal, walkable=walkable, landmarks=landmarks)
+                alt_expanded += finder.expanded
+                self.assertEqual(len(alt), len(plain))
+        self.assertLess(alt_expanded * 2, plain_expanded)
+
+    def test_cooperative_paths_wait_in_a_bay_instead_of_meeting_head_on(self) -> None:
+        # A one-cell corridor along y=1 with a single bay at (6, 2).
+        width, height = 10, 4
+        walkable = bytearray(width * height)
+        for x in range(1, 9):
+            walkable[width + x] = 1
+        walkable[2 * width + 6] = 1
+
+        first, second = cooperative_paths(
+            width=width,
+            height=height,
+            jobs=[((1, 1), (8, 1)), ((8, 1), (1, 1))],
+            walkable=walkable,
+        )
+
+        self.assertEqual(first, [(x, 1) for x in range(2, 9)])
+        assert second is not None
+        self.assertIn((6, 2), second)
+        self.assertEqual(second[-1], (1, 1))
+        # Replay both with the engine's stepping order: the first agent moves first.
+        positions = [(1, 1), (8, 1)]
+        for tick in range(max(len(first), len(second))):
+            for agent, path in enumerate((first, second)):
+                if tick < len(path):
+                    self.assertNotIn(path[tick], [pos for other, pos in enumerate(positions) if other != agent])
+                    positions[agent] = path[tick]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+
+from app.services.portal_graph import ChunkPortals, RouteLeg, plan_route
+
+
+def _mask(rows):
+    # Rows are given top (highest y) first, as the chunk would be drawn.
+    return bytearray(1 if ch == "." else 0 for row in reversed(rows) for ch in row)
+
+
+WEST = _mask(
+    [
+        "######",
+        "#....#",
+        "..##..",
+        "..##..",
+        "#....#",
+        "######",
+    ]
+)
+EAST = _mask(
+    [
+        "######",
+        "#....#",
+        "...#.#",
+        "...#.#",
+        "#....#",
+        "######",
+    ]
+)
+
+
+class ChunkPortalsTests(unittest.TestCase):
+    def test_contiguous_crossable_cells_form_one_portal(self) -> None:
+        portals = ChunkPortals(WEST, 6, 6)
+        east = portals.portals("E", "east", EAST)
+        self.assertEqual(len(east), 1)
+        self.assertEqual((east[0].edge, east[0].stand, east[0].arrival), ((5, 3), (4, 3), (0, 3)))
+        self.assertEqual(portals.portals("N", "north", EAST), [])
+        self.assertIs(portals.portals("E", "east", EAST), east)
+        self.assertEqual(portals.edge_stand((5, 3)), (4, 3))
+        self.assertIsNone(portals.edge_stand((4, 3)))
+
+    def test_distances_stay_inside_the_border(self) -> None:
+        portals = ChunkPortals(WEST, 6, 6)
+        self.assertEqual(portals.distances((1, 1), [(4, 2), (5, 2)]), {(4, 2): 4, (5, 2): 5})
+        self.assertEqual(portals.stand_distances((0, 2)), {(1, 2): 1, (1, 3): 2, (4, 2): 6, (4, 3): 7})
+        self.assertIn((0, 2), portals._stand_distances)
+
+    def test_descend_follows_the_stand_field_around_blocked_cells(self) -> None:
+        portals = ChunkPortals(WEST, 6, 6)
+        field = portals.stand_field((4, 3))
+        self.assertIs(portals.stand_field((4, 3)), field)
+        self.assertEqual(portals.field_bytes(), 2 * 36)
+
+        # The start is a border cell, as right after a handoff.
+        self.assertEqual(portals.descend((0, 2), (4, 3)), [(1, 2), (1, 3), (1, 4), (2, 4), (3, 4), (4, 4), (4, 3)])
+        blocked = bytearray(36)
+        blocked[3 * 6 + 1] = 1
+        self.assertEqual(portals.descend((0, 2), (4, 3), blocked=blocked)[:3], [(1, 2), (1, 1), (2, 1)])
+        # Every shortest continuation from (1, 3) is blocked: the caller searches instead.
+        blocked = bytearray(36)
+        blocked[4 * 6 + 1] = 1
+        self.assertIsNone(portals.descend((1, 3), (4, 3), blocked=blocked))
+        self.assertEqual(portals.descend((4, 3), (4, 3)), [])
+
+    def test_plan_route_crosses_through_portals(self) -> None:
+        chunks = {"west": ChunkPortals(WEST, 6, 6), "east": ChunkPortals(EAST, 6, 6)}
+        walkable = {"west": WEST, "east": EAST}
+        links = {"west": {"E": "east"}, "east": {"W": "west"}}
+
+        def exits_of(chunk_id):
+            for direction, neighbor_id in links[chunk_id].items():
+                yield neighbor_id, chunks[chunk_id].portals(direction, neighbor_id, walkable[neighbor_id])
+
+        route = plan_route(
+            start_chunk_id="west",
+            start=(1, 1),
+            goal_chunk_id="east",
+            goal=(4, 2),
+            portals_of=chunks.get,
+            exits_of=exits_of,
+        )
+        self.assertEqual(route, [RouteLeg(waypoint=(4, 3), edge=(5, 3)), RouteLeg(waypoint=(4, 2), edge=None)])
+
+        links["west"] = {}
+        self.assertIsNone(
+            plan_route(
+                start_chunk_id="west",
+                start=(1, 1),
+                goal_chunk_id="east",
+                goal=(4, 2),
+                portals_of=chunks.get,
+                exits_of=exits_of,
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,28 @@
+import asyncio
+import concurrent.futures
+import gc
+import json
+import threading
 import unittest
+from unittest import mock
 
-from app.services.tick_engine import InMemoryTickEngine
+from app.services import tick_engine
+from app.services.tick_engine import InMemoryTickEngine, TickEngineError
+
+
+class _ManualExecutor(concurrent.futures.Executor):
+    def __init__(self) -> None:
+        self.jobs = []
+
+    def submit(self, fn, /, *args, **kwargs):
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self.jobs.append((future, fn, args, kwargs))
+        return future
+
+    def run_all(self) -> None:
+        for future, fn, args, kwargs in self.jobs:
+            if not future.done():
+                future.set_result(fn(*args, **kwargs))
 
 
 class TickEngineTests(unittest.IsolatedAsyncioTestCase):
@@ -36,6 +58,20 @@ class TickEngineTests(unittest.IsolatedAsyncioTestCase):
         pos = {a["id"]: (a["x"], a["y"]) for a in delta["agents"]}
         self.assertEqual(pos["a1"], (3, 1))
 
+    async def test_jps_path_mode_moves_along_shortest_path(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10, path_mode="jps")
+        agent = await engine.ensure_agent("a1")
+        await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-jps", target_x=8, target_y=8)
+        cmd = engine._agent_active_cmd["a1"]
+        self.assertEqual(len(cmd.path), 14)
+
+        for _ in range(len(cmd.path)):
+            await engine.tick_once()
+        self.assertEqual((agent.x, agent.y), (8, 8))
+
+        with self.assertRaises(ValueError):
+            InMemoryTickEngine(tick_hz=5, width=10, height=10, path_mode="dijkstra")
+
     async def test_move_command_fails_when_blocked(self) -> None:
         engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
         q1 = await engine.register_listener("a1")
@@ -362,6 +398,932 @@ class TickEngineTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(demo_entries[0].get("name"), "You")
         self.assertEqual((demo_entries[0]["x"], demo_entries[0]["y"]), (26, 25))
 
+    async def test_reads_on_other_chunk_do_not_wait_for_busy_chunk(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=6, height=6)
+        await engine.ensure_agent("a1")
+        await engine.submit_move_command(
+            agent_id="a1",
+            server_cmd_id="cmd-lock-transition",
+            target_x=5,
+            target_y=1,
+        )
+        for _ in range(5):
+            await engine.tick_once()
+        state = await engine.agent_state("a1")
+        assert state is not None
+        other_chunk_id = state.chunk_id
+        self.assertNotEqual(other_chunk_id, "chunk-0")
+
+        root = engine._chunks["chunk-0"]
+        async with engine._world_lock, root.lock:
+            snapshot = await asyncio.wait_for(
+                engine.chunk_snapshot_payload(chunk_id=other_chunk_id),
+                timeout=0.5,
+            )
+            self.assertEqual(snapshot["chunk_static"]["chunk_id"], other_chunk_id)
+            started = await asyncio.wait_for(
+                engine.submit_move_command(
+                    agent_id="a1",
+                    server_cmd_id="cmd-lock-other",
+                    target_x=1,
+                    target_y=1,
+                ),
+                timeout=0.5,
+            )
+            self.assertEqual(started, engine.tick + 1)
+
+            blocked_read = asyncio.create_task(engine.chunk_snapshot_payload(chunk_id="chunk-0"))
+            await asyncio.sleep(0.01)
+            self.assertFalse(blocked_read.done())
+        await asyncio.wait_for(blocked_read, timeout=0.5)
+
+    async def test_tick_waits_only_for_chunks_it_touches(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        await engine.ensure_agent("a1")
+        await engine.submit_move_command(
+            agent_id="a1",
+            server_cmd_id="cmd-lock-tick",
+            target_x=3,
+            target_y=1,
+        )
+
+        root = engine._chunks["chunk-0"]
+        async with root.lock:
+            tick_task = asyncio.create_task(engine.tick_once())
+            await asyncio.sleep(0.01)
+            self.assertFalse(tick_task.done())
+        await asyncio.wait_for(tick_task, timeout=0.5)
+
+        state = await engine.agent_state("a1")
+        assert state is not None
+        self.assertEqual((state.x, state.y), (2, 1))
+
+    async def test_chunk_agent_index_stays_sorted(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        for agent_id in ("c", "a", "d", "b"):
+            await engine.ensure_agent(agent_id)
+        root = engine._chunks["chunk-0"]
+        self.assertEqual(root.agent_order, ["a", "b", "c", "d"])
+
+        await engine.remove_agent("b")
+        self.assertEqual(root.agent_order, ["a", "c", "d"])
+
+        delta = await engine.chunk_delta_payload(chunk_id="chunk-0")
+        self.assertEqual([item["id"] for item in delta["agents"]], ["a", "c", "d"])
+
+    async def test_tick_rebuilds_only_dirty_agent_rows(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=20, height=20)
+        for idx in range(30):
+            await engine.ensure_agent(f"bulk-{idx:02d}")
+        mover = await engine.ensure_agent("mover")
+        before = await engine.chunk_delta_payload(chunk_id="chunk-0")
+        root = engine._chunks["chunk-0"]
+        target = next(
+            (mover.x + dx, mover.y + dy)
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+            if engine._is_walkable(root, mover.x + dx, mover.y + dy)
+            and (mover.x + dx, mover.y + dy) not in root.occupancy
+        )
+        await engine.submit_move_command(
+            agent_id="mover",
+            server_cmd_id="cmd-dirty",
+            target_x=target[0],
+            target_y=target[1],
+        )
+
+        with mock.patch.object(
+            engine,
+            "_agent_snapshot_from_entity",
+            wraps=engine._agent_snapshot_from_entity,
+        ) as snapshot:
+            await engine.tick_once()
+            after = await engine.chunk_delta_payload(chunk_id="chunk-0")
+        self.assertEqual(snapshot.call_count, 1)
+
+        rows_before = {item["id"]: item for item in before["agents"]}
+        rows_after = {item["id"]: item for item in after["agents"]}
+        self.assertEqual((rows_after["mover"]["x"], rows_after["mover"]["y"]), target)
+        self.assertEqual(len(rows_before), len(rows_after))
+        for agent_id, row in rows_before.items():
+            if agent_id != "mover":
+                self.assertIs(rows_after[agent_id], row)
+
+    async def test_chunk_static_is_cached_and_patches_dynamic_fields(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=6, height=6)
+        await engine.ensure_agent("a1")
+
+        first = await engine.chunk_static_payload(chunk_id="chunk-0")
+        self.assertEqual(json.loads(await engine.chunk_static_json(chunk_id="chunk-0")), first)
+
+        await engine.submit_move_command(
+            agent_id="a1",
+            server_cmd_id="cmd-static-cache",
+            target_x=5,
+            target_y=1,
+        )
+        for _ in range(5):
+            await engine.tick_once()
+
+        second = await engine.chunk_static_payload(chunk_id="chunk-0")
+        self.assertIs(second["grid"], first["grid"])
+        self.assertIs(second["tiles"], first["tiles"])
+        self.assertNotEqual(second["neighbors"]["E"], None)
+        self.assertEqual(second["tick_base"], engine.tick)
+        self.assertEqual(json.loads(await engine.chunk_static_json(chunk_id="chunk-0")), second)
+
+    async def test_events_are_encoded_once_and_shared_by_listeners(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        agent_q = await engine.register_listener("a1")
+        await engine.ensure_agent("a1")
+        owner_q = await engine.register_owner_listener("a1")
+        feeds = [
+            await engine.open_spectator_feed(chunk_id="chunk-0", last_event_id=None)
+            for _ in range(3)
+        ]
+
+        await engine.submit_move_command(
+            agent_id="a1",
+            server_cmd_id="cmd-shared-frame",
+            target_x=2,
+            target_y=1,
+        )
+        await engine.tick_once()
+
+        spectator_frames = [feed["queue"].get_nowait() for feed in feeds]
+        self.assertIs(spectator_frames[0], spectator_frames[1])
+        self.assertIs(spectator_frames[1], spectator_frames[2])
+        self.assertEqual(spectator_frames[0]["event"], "chunk_delta")
+        sse_lines = spectator_frames[0].sse.decode("utf-8").splitlines()
+        self.assertEqual(sse_lines[0], f"id: {spectator_frames[0]['id']}")
+        self.assertEqual(json.loads(sse_lines[2][len("data: "):]), spectator_frames[0]["data"])
+
+        agent_events = [agent_q.get_nowait() for _ in range(agent_q.qsize())]
+        owner_events = [owner_q.get_nowait() for _ in range(owner_q.qsize())]
+        self.assertEqual(len(agent_events), len(owner_events))
+        for agent_event, owner_event in zip(agent_events, owner_events):
+            self.assertIs(agent_event, owner_event)
+            self.assertEqual(
+                json.loads(agent_event.ws_text),
+                {"type": agent_event["type"], "payload": agent_event["payload"]},
+            )
+        delta = next(event for event in agent_events if event["type"] == "chunk_delta")
+        self.assertEqual(delta["payload"]["agents"], spectator_frames[0]["data"]["agents"])
+
+    def test_owner_sse_frame_carries_the_ws_envelope(self) -> None:
+        # A payload with its own "type" key must not produce a duplicate key.
+        frame = tick_engine.AgentFrame("chunk_delta", {"type": "inner", "tick": 3})
+        event_line, data_line = frame.sse.decode("utf-8").splitlines()[:2]
+        self.assertEqual(event_line, "event: chunk_delta")
+        data_json = data_line[len("data: "):]
+        self.assertEqual(data_json, frame.ws_text)
+        pairs = json.loads(data_json, object_pairs_hook=lambda items: items)
+        self.assertEqual([key for key, _value in pairs], ["type", "payload"])
+
+    async def test_agent_steps_into_a_cell_vacated_by_an_edge_crossing(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=6, height=6)
+        queues = {agent_id: await engine.register_listener(agent_id) for agent_id in ("a1", "a2")}
+        a1 = await engine.ensure_agent("a1")
+        a2 = await engine.ensure_agent("a2")
+        chunk = engine._chunks["chunk-0"]
+        for x in range(3, 6):
+            chunk.walkable[6 + x] = 1
+        engine._move_agent(chunk, a2, (4, 1))
+        engine._move_agent(chunk, a1, (3, 1))
+
+        # a2 steps first and crosses east; a1 follows into the cell it left.
+        await engine.submit_move_command(agent_id="a2", server_cmd_id="cmd-a2", target_x=5, target_y=1)
+        await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-a1", target_x=4, target_y=1)
+        await engine.tick_once()
+
+        results = {
+            agent_id: [
+                event["payload"]["status"]
+                for event in [queue.get_nowait() for _ in range(queue.qsize())]
+                if event["type"] == "command_result"
+            ]
+            for agent_id, queue in queues.items()
+        }
+        self.assertEqual(results, {"a1": ["completed"], "a2": ["completed"]})
+        self.assertEqual((a1.chunk_id, a1.x, a1.y), ("chunk-0", 4, 1))
+        self.assertEqual(a2.chunk_id, "chunk-1")
+        self.assertEqual(engine._executing, {})
+
+    async def test_executing_commands_stay_in_accept_order(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        for agent_id in ("c", "a", "b"):
+            agent = await engine.ensure_agent(agent_id)
+            await engine.submit_move_command(
+                agent_id=agent_id,
+                server_cmd_id=f"cmd-{agent_id}",
+                target_x=agent.x,
+                target_y=7,
+            )
+        await engine.tick_once()
+        self.assertEqual(list(engine._executing), ["cmd-c", "cmd-a", "cmd-b"])
+
+    async def test_remove_agent_tombstones_pending_and_drops_executing_command(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        for agent_id in ("a1", "a2", "a3"):
+            await engine.ensure_agent(agent_id)
+            await engine.register_listener(agent_id)
+        await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-a1", target_x=1, target_y=7)
+        await engine.tick_once()
+        await engine.submit_move_command(agent_id="a2", server_cmd_id="cmd-a2", target_x=2, target_y=7)
+        await engine.submit_move_command(agent_id="a3", server_cmd_id="cmd-a3", target_x=3, target_y=7)
+
+        await engine.remove_agent("a1")
+        await engine.remove_agent("a2")
+
+        self.assertEqual(list(engine._executing), [])
+        self.assertEqual([cmd.server_cmd_id for cmd in engine._pending], ["cmd-a2", "cmd-a3"])
+        self.assertTrue(engine._pending[0].cancelled)
+        self.assertFalse(await engine.has_active_command("a2"))
+
+        await engine.tick_once()
+        self.assertEqual(len(engine._pending), 0)
+        self.assertEqual(list(engine._executing), ["cmd-a3"])
+        self.assertTrue(await engine.has_active_command("a3"))
+
+    async def test_remove_agent_fails_queued_plan_without_unretrieved_error(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        await engine.ensure_agent("a1")
+        loop = asyncio.get_running_loop()
+        errors = []
+        loop.set_exception_handler(lambda _loop, context: errors.append(context))
+        self.addCleanup(loop.set_exception_handler, None)
+
+        # A queued plan whose submitter already went away with its connection.
+        engine._planning["a1"] = tick_engine.PlanRequest(
+            agent_id="a1",
+            server_cmd_id="cmd-1",
+            target_x=1,
+            target_y=7,
+            target_chunk_id=None,
+            future=loop.create_future(),
+        )
+        await engine.remove_agent("a1")
+
+        self.assertFalse(await engine.has_active_command("a1"))
+        gc.collect()
+        self.assertEqual(errors, [])
+
+    async def test_cancelled_submit_frees_agent_once_planner_runs(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        await engine.ensure_agent("a1")
+
+        with mock.patch.object(engine, "_is_running", return_value=True):
+            submit = asyncio.ensure_future(
+                engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-1", target_x=1, target_y=7)
+            )
+            await asyncio.sleep(0)
+            submit.cancel()
+            await asyncio.gather(submit, return_exceptions=True)
+            await engine._plan_task
+            await engine.tick_once()
+
+        self.assertFalse(await engine.has_active_command("a1"))
+        self.assertEqual(engine._executing, {})
+
+    async def test_chunk_gc_only_visits_chunks_whose_deadline_passed(self) -> None:
+        now = [1_700_000_000.0]
+        engine = InMemoryTickEngine(
+            tick_hz=5,
+            width=6,
+            height=6,
+            chunk_gc_ttl_seconds=10,
+            clock=lambda: now[0],
+        )
+        await engine.ensure_agent("a1")
+        middle_id = engine._get_or_create_neighbor(source_chunk_id="chunk-0", direction="E")
+        leaf_id = engine._get_or_create_neighbor(source_chunk_id=middle_id, direction="E")
+
+        with mock.patch.object(engine, "_chunk_degree", wraps=engine._chunk_degree) as degree:
+            now[0] += 5
+            await engine.tick_once()
+            self.assertEqual(degree.call_count, 0)
+
+            now[0] += 6
+            await engine.tick_once()
+            self.assertEqual(degree.call_count, 2)
+        self.assertFalse(await engine.has_chunk(leaf_id))
+        self.assertTrue(await engine.has_chunk(middle_id))
+
+        # The middle chunk was re-armed when its leaf neighbor was collected.
+        await engine.tick_once()
+        self.assertFalse(await engine.has_chunk(middle_id))
+        self.assertEqual(engine._gc_heap, [])
+
+    async def test_neighbor_is_pregenerated_off_tick_and_agent_waits_only_if_unfinished(self) -> None:
+        executor = _ManualExecutor()
+        engine = InMemoryTickEngine(
+            tick_hz=5,
+            width=10,
+            height=10,
+            pregeneration_band=3,
+            chunk_executor=executor,
+        )
+        q = await engine.register_listener("a1")
+        await engine.ensure_agent("a1")
+        await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-east", target_x=9, target_y=1)
+
+        for _ in range(9):
+            await engine.tick_once()
+            await asyncio.sleep(0)
+        # chunk-0's component labels, then the neighbor's tiles.
+        self.assertEqual(
+            [job[1].func for job in executor.jobs],
+            [tick_engine.component_labels, tick_engine._pregenerate_chunk],
+        )
+        self.assertEqual(executor.jobs[1][1].keywords["required_edges"], {"W"})
+        state = await engine.agent_state("a1")
+        assert state is not None
+        # Held next to the edge while the neighbor is still generating.
+        self.assertEqual((state.chunk_id, state.x, state.y), ("chunk-0", 8, 1))
+        self.assertTrue(await engine.has_active_command("a1"))
+        self.assertEqual(await engine.chunk_count(), 1)
+
+        executor.run_all()
+        await asyncio.sleep(0)
+        # The worker labeled the neighbor's floor regions along with its tiles.
+        with mock.patch.object(tick_engine, "component_labels") as labels:
+            await engine.tick_once()
+        labels.assert_not_called()
+        self.assertEqual(len(engine._chunks["chunk-1"].components), 100)
+
+        state = await engine.agent_state("a1")
+        assert state is not None
+        self.assertEqual((state.chunk_id, state.x, state.y), ("chunk-1", 0, 1))
+        events = [q.get_nowait()["type"] for _ in range(q.qsize())]
+        self.assertIn("chunk_transition", events)
+        self.assertEqual(events.count("command_result"), 1)
+
+    async def test_stop_closes_the_chunk_cache(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        with mock.patch.object(engine._chunk_cache, "close") as close:
+            await engine.start()
+            await engine.stop()
+        close.assert_called_once()
+
+    async def test_revisited_neighbor_reuses_cached_layout(self) -> None:
+        now = [1_700_000_000.0]
+        engine = InMemoryTickEngine(
+            tick_hz=5,
+            width=30,
+            height=30,
+            chunk_gc_ttl_seconds=10,
+            clock=lambda: now[0],
+        )
+        await engine.ensure_agent("a1")
+        first_id = engine._get_or_create_neighbor(source_chunk_id="chunk-0", direction="E")
+        assert first_id is not None
+        first_mask = bytes(engine._chunks[first_id].walkable)
+        misses = engine.chunk_cache_stats()["misses"]
+
+        now[0] += 11
+        await engine.tick_once()
+        self.assertFalse(await engine.has_chunk(first_id))
+
+        second_id = engine._get_or_create_neighbor(source_chunk_id="chunk-0", direction="E")
+        assert second_id is not None
+        self.assertNotEqual(first_id, second_id)
+        self.assertEqual(bytes(engine._chunks[second_id].walkable), first_mask)
+        self.assertEqual(engine.chunk_cache_stats()["misses"], misses)
+        self.assertGreaterEqual(engine.chunk_cache_stats()["hits"], 1)
+
+        north_id = engine._get_or_create_neighbor(source_chunk_id="chunk-0", direction="N")
+        assert north_id is not None
+        self.assertNotEqual(engine._chunks[north_id].seed, engine._chunks[second_id].seed)
+
+    async def test_move_to_other_chunk_plans_route_and_refines_per_chunk(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        q = await engine.register_listener("a1")
+        agent = await engine.ensure_agent("a1")
+        middle_id = engine._get_or_create_neighbor(source_chunk_id="chunk-0", direction="W")
+        assert middle_id is not None
+        far_id = engine._get_or_create_neighbor(source_chunk_id=middle_id, direction="W")
+        assert far_id is not None
+
+        with self.assertRaises(TickEngineError) as ctx:
+            await engine.submit_move_command(
+                agent_id="a1", server_cmd_id="cmd-missing", target_x=5, target_y=5, target_chunk_id="chunk-99"
+            )
+        self.assertEqual(ctx.exception.reason, "chunk_not_found")
+
+        with mock.patch.object(tick_engine, "plan_paths") as plan_paths:
+            await engine.submit_move_command(
+                agent_id="a1", server_cmd_id="cmd-far", target_x=5, target_y=5, target_chunk_id=far_id
+            )
+        # The first leg heads for a portal and is read off its distance field.
+        plan_paths.assert_not_called()
+        cmd = engine._agent_active_cmd["a1"]
+        # Only the first chunk is planned in cells; it ends with the west crossing.
+        self.assertEqual(cmd.path[-1][0], 0)
+        self.assertEqual(len(cmd.legs), 2)
+        self.assertIsNone(cmd.legs[-1].edge)
+
+        with mock.patch.object(engine, "_leg_path", wraps=engine._leg_path) as leg_path, mock.patch.object(
+            tick_engine, "astar_path", wraps=tick_engine.astar_path
+        ) as astar:
+            for _ in range(60):
+                if not await engine.has_active_command("a1"):
+                    break
+                await engine.tick_once()
+        self.assertEqual([call.args[0].chunk_id for call in leg_path.call_args_list], [middle_id, far_id])
+        # Only the last leg, whose goal is not a portal, is searched.
+        self.assertEqual(astar.call_count, 1)
+        self.assertTrue(engine._chunks[middle_id].portals._stand_fields)
+        self.assertEqual((agent.chunk_id, agent.x, agent.y), (far_id, 5, 5))
+
+        messages = [q.get_nowait() for _ in range(q.qsize())]
+        self.assertEqual([m["type"] for m in messages].count("chunk_transition"), 2)
+        results = [m["payload"] for m in messages if m["type"] == "command_result"]
+        self.assertEqual([(r["server_cmd_id"], r["status"]) for r in results], [("cmd-far", "completed")])
+        self.assertTrue(engine._chunks[middle_id].portals._stand_distances)
+
+    async def test_same_chunk_move_onto_an_edge_cell_descends_the_stand_field(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        agent = await engine.ensure_agent("a1")
+        chunk = engine._chunks["chunk-0"]
+
+        with mock.patch.object(tick_engine, "plan_paths") as plan_paths:
+            await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-east", target_x=9, target_y=3)
+        plan_paths.assert_not_called()
+        self.assertIn((8, 3), chunk.portals._stand_fields)
+        cmd = engine._agent_active_cmd["a1"]
+        self.assertEqual(len(cmd.path), 10)
+        self.assertEqual(cmd.path[-2:], [(8, 3), (9, 3)])
+        self.assertEqual((cmd.exit_step, cmd.exit_direction), (9, "E"))
+
+        for _ in range(10):
+            await engine.tick_once()
+        self.assertEqual((agent.chunk_id, agent.x, agent.y), ("chunk-1", 0, 3))
+        self.assertFalse(await engine.has_active_command("a1"))
+
+    async def test_moves_are_planned_as_one_batch_and_committed_by_the_next_tick(self) -> None:
+        planning_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(planning_executor.shutdown)
+        engine = InMemoryTickEngine(
+            tick_hz=5,
+            width=10,
+            height=10,
+            planning_executor=planning_executor,
+            planning_pool_min_batch=3,
+        )
+        agents = [await engine.ensure_agent(f"a{idx}") for idx in range(1, 5)]
+
+        with mock.patch.object(engine, "_is_running", return_value=True), mock.patch.object(
+            InMemoryTickEngine, "PLAN_SLICE_SIZE", 2
+        ), mock.patch("app.services.tick_engine.plan_paths", wraps=tick_engine.plan_paths) as planner:
+            submits = [
+                asyncio.create_task(
+                    engine.submit_move_command(
+                        agent_id=agent.agent_id,
+                        server_cmd_id=f"cmd-{agent.agent_id}",
+                        target_x=agent.x,
+                        target_y=7,
+                    )
+                )
+                for agent in agents
+            ]
+            await asyncio.sleep(0)
+            self.assertFalse(any(task.done() for task in submits))
+            self.assertTrue(await engine.has_active_command("a1"))
+            with self.assertRaises(TickEngineError):
+                await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-again", target_x=1, target_y=2)
+
+            # Planning runs off the tick; the next tick commits whatever is ready.
+            await engine._plan_task
+            await engine.tick_once()
+            started = await asyncio.gather(*submits)
+
+        self.assertEqual(started, [1, 1, 1, 1])
+        self.assertEqual([len(call.kwargs["jobs"]) for call in planner.call_args_list], [2, 2])
+        commands = [engine._agent_active_cmd[agent.agent_id] for agent in agents]
+        self.assertEqual([cmd.accepted_order for cmd in commands], sorted(cmd.accepted_order for cmd in commands))
+        # Committed at the start of tick 1 and stepped in that same tick.
+        self.assertEqual([(agent.x, agent.y) for agent in agents], [(agent.x, 2) for agent in agents])
+
+    async def test_stale_plan_is_retried_and_ticks_do_not_wait_for_planning(self) -> None:
+        executor = _ManualExecutor()
+        engine = InMemoryTickEngine(
+            tick_hz=5,
+            width=10,
+            height=10,
+            planning_executor=executor,
+            planning_pool_min_batch=1,
+        )
+        mover = await engine.ensure_agent("a1")
+        other = await engine.ensure_agent("a2")
+        chunk = engine._chunks["chunk-0"]
+
+        with mock.patch.object(engine, "_is_running", return_value=True):
+            submit = asyncio.create_task(
+                engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-up", target_x=1, target_y=7)
+            )
+            for _ in range(5):
+                await asyncio.sleep(0)
+            self.assertEqual(len(executor.jobs), 1)
+
+            # The tick runs while the batch is still being planned.
+            await engine.tick_once()
+            self.assertFalse(submit.done())
+
+            # Someone steps onto the planned path before the plan is committed.
+            engine._move_agent(chunk, other, (1, 4))
+            executor.run_all()
+            await engine._plan_task
+            await engine.tick_once()
+            for _ in range(5):
+                await asyncio.sleep(0)
+            self.assertFalse(submit.done())
+            self.assertEqual(len(executor.jobs), 2)
+
+            # Occupancy changes off the new path do not invalidate it.
+            executor.run_all()
+            await engine._plan_task
+            engine._move_agent(chunk, other, (8, 8))
+            await engine.tick_once()
+            started = await submit
+
+        self.assertEqual(started, 3)
+        cmd = engine._agent_active_cmd["a1"]
+        self.assertNotIn((1, 4), cmd.path)
+        self.assertEqual(cmd.path[-1], (1, 7))
+        self.assertNotEqual((mover.x, mover.y), (1, 1))
+
+    async def test_plan_that_keeps_going_stale_is_rejected_without_searching_in_the_tick(self) -> None:
+        executor = _ManualExecutor()
+        engine = InMemoryTickEngine(
+            tick_hz=5,
+            width=10,
+            height=10,
+            planning_executor=executor,
+            planning_pool_min_batch=1,
+        )
+        await engine.ensure_agent("a1")
+        other = await engine.ensure_agent("a2")
+        chunk = engine._chunks["chunk-0"]
+
+        with mock.patch.object(engine, "_is_running", return_value=True), mock.patch.object(
+            InMemoryTickEngine, "MAX_STALE_PLANS", 0
+        ):
+            submit = asyncio.create_task(
+                engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-up", target_x=1, target_y=7)
+            )
+            for _ in range(5):
+                await asyncio.sleep(0)
+            executor.run_all()
+            await engine._plan_task
+            engine._move_agent(chunk, other, (1, 4))
+
+            with mock.patch.object(tick_engine, "plan_paths", wraps=tick_engine.plan_paths) as planner:
+                await engine.tick_once()
+            with self.assertRaises(TickEngineError) as caught:
+                await submit
+
+        self.assertEqual(caught.exception.reason, "stale_plan")
+        planner.assert_not_called()
+        self.assertEqual(len(executor.jobs), 1)
+        self.assertFalse(await engine.has_active_command("a1"))
+
+    async def test_batches_below_the_pool_size_are_planned_off_the_event_loop(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        await engine.ensure_agent("a1")
+        release = threading.Event()
+        plan_paths = tick_engine.plan_paths
+        planned_on = []
+
+        def slow_plan_paths(**kwargs):
+            planned_on.append(threading.get_ident())
+            release.wait(5)
+            return plan_paths(**kwargs)
+
+        with mock.patch.object(engine, "_is_running", return_value=True), mock.patch.object(
+            tick_engine, "plan_paths", side_effect=slow_plan_paths
+        ):
+            submit = asyncio.create_task(
+                engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-1", target_x=1, target_y=7)
+            )
+            for _ in range(5):
+                await asyncio.sleep(0)
+            # The search is stuck on a worker thread, yet the tick still runs.
+            await asyncio.wait_for(engine.tick_once(), timeout=1)
+            self.assertFalse(submit.done())
+
+            release.set()
+            await engine._plan_task
+            await engine.tick_once()
+            self.assertEqual(await submit, 2)
+        self.assertNotIn(threading.get_ident(), planned_on)
+
+    async def test_solver_failure_fails_the_batch_and_keeps_planning(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        agents = [await engine.ensure_agent(agent_id) for agent_id in ("a1", "a2")]
+
+        with mock.patch.object(engine, "_is_running", return_value=True):
+            with mock.patch.object(tick_engine, "plan_paths", side_effect=RuntimeError("solver crashed")):
+                submits = [
+                    asyncio.create_task(
+                        engine.submit_move_command(
+                            agent_id=agent.agent_id,
+                            server_cmd_id=f"cmd-{agent.agent_id}",
+                            target_x=agent.x,
+                            target_y=7,
+                        )
+                    )
+                    for agent in agents
+                ]
+                results = await asyncio.wait_for(asyncio.gather(*submits, return_exceptions=True), timeout=1)
+            for result in results:
+                self.assertIsInstance(result, TickEngineError)
+                self.assertEqual(result.reason, "planning_failed")
+            self.assertFalse(await engine.has_active_command("a1"))
+
+            # The planner is still usable for the next submit.
+            submit = asyncio.create_task(
+                engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-retry", target_x=agents[0].x, target_y=7)
+            )
+            for _ in range(5):
+                await asyncio.sleep(0)
+            await engine._plan_task
+            await engine.tick_once()
+            self.assertEqual(await submit, 1)
+
+    async def test_whca_mode_routes_around_reserved_slots_instead_of_blocking(self) -> None:
+        async def run(path_mode: str):
+            engine = InMemoryTickEngine(tick_hz=5, width=10, height=10, path_mode=path_mode)
+            queues = {agent_id: await engine.register_listener(agent_id) for agent_id in ("a1", "a2")}
+            first = await engine.ensure_agent("a1")
+            second = await engine.ensure_agent("a2")
+            chunk = engine._chunks["chunk-0"]
+            # A one-cell corridor along y=1 with a single bay at (6, 2).
+            chunk.walkable[:] = bytes(100)
+            for x in range(1, 9):
+                chunk.walkable[10 + x] = 1
+            chunk.walkable[26] = 1
+            engine._move_agent(chunk, first, (1, 1))
+            engine._move_agent(chunk, second, (8, 1))
+
+            await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-a1", target_x=8, target_y=1)
+            await engine.submit_move_command(agent_id="a2", server_cmd_id="cmd-a2", target_x=1, target_y=1)
+            for _ in range(15):
+                await engine.tick_once()
+            return {
+                agent_id: [
+                    event["payload"]["status"]
+                    for event in [queue.get_nowait() for _ in range(queue.qsize())]
+                    if event["type"] == "command_result"
+                ]
+                for agent_id, queue in queues.items()
+            }, engine
+
+        results, _engine = await run("astar")
+        self.assertIn(["failed"], results.values())
+
+        results, engine = await run("whca")
+        self.assertEqual(results, {"a1": ["completed"], "a2": ["completed"]})
+        self.assertEqual(len(engine._chunks["chunk-0"].reservations), 0)
+
+    async def test_blocked_step_waits_for_a_moving_agent(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10, block_wait_ticks=2)
+        q1 = await engine.register_listener("a1")
+        a1 = await engine.ensure_agent("a1")
+        a2 = await engine.ensure_agent("a2")
+        chunk = engine._chunks["chunk-0"]
+        engine._move_agent(chunk, a2, (5, 5))
+        await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-a1", target_x=4, target_y=1)
+        engine._move_agent(chunk, a2, (2, 1))
+        await engine.submit_move_command(agent_id="a2", server_cmd_id="cmd-a2", target_x=2, target_y=4)
+        # a1 steps first and finds a2 still in place; it holds instead of failing.
+        await engine.tick_once()
+        self.assertEqual((a1.x, a1.y), (1, 1))
+        self.assertEqual(engine._agent_active_cmd["a1"].blocked_ticks, 1)
+
+        for _ in range(3):
+            await engine.tick_once()
+        results = [msg for msg in [q1.get_nowait() for _ in range(q1.qsize())] if msg["type"] == "command_result"]
+        self.assertEqual([msg["payload"]["status"] for msg in results], ["completed"])
+        self.assertEqual((a1.x, a1.y), (4, 1))
+
+    async def test_blocked_step_detours_around_a_resting_agent(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10, block_wait_ticks=2, block_detour_steps=3)
+        q1 = await engine.register_listener("a1")
+        a1 = await engine.ensure_agent("a1")
+        a2 = await engine.ensure_agent("a2")
+        chunk = engine._chunks["chunk-0"]
+        engine._move_agent(chunk, a2, (5, 5))
+
+        await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-a1", target_x=6, target_y=1)
+        cmd = engine._agent_active_cmd["a1"]
+        self.assertEqual(cmd.path[:2], [(2, 1), (3, 1)])
+        # An idle agent steps into the path after it was planned.
+        engine._move_agent(chunk, a2, (3, 1))
+
+        for _ in range(8):
+            await engine.tick_once()
+        results = [msg for msg in [q1.get_nowait() for _ in range(q1.qsize())] if msg["type"] == "command_result"]
+        self.assertEqual([msg["payload"]["status"] for msg in results], ["completed"])
+        self.assertEqual((a1.x, a1.y), (6, 1))
+        self.assertNotIn((3, 1), cmd.path)
+        self.assertEqual(len(cmd.path), 7)
+
+    async def test_detour_never_rejoins_a_path_along_the_chunk_border(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10, block_detour_steps=3)
+        q1 = await engine.register_listener("a1")
+        a1 = await engine.ensure_agent("a1")
+        a2 = await engine.ensure_agent("a2")
+        chunk = engine._chunks["chunk-0"]
+        engine._move_agent(chunk, a2, (5, 5))
+        engine._move_agent(chunk, a1, (0, 1))
+
+        await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-a1", target_x=0, target_y=6)
+        self.assertEqual(engine._agent_active_cmd["a1"].path, [(0, y) for y in range(2, 7)])
+        engine._move_agent(chunk, a2, (0, 3))
+
+        for _ in range(8):
+            await engine.tick_once()
+        messages = [q1.get_nowait() for _ in range(q1.qsize())]
+        self.assertNotIn("chunk_transition", [msg["type"] for msg in messages])
+        results = [msg["payload"] for msg in messages if msg["type"] == "command_result"]
+        self.assertEqual([(r["status"], r["reason"]) for r in results], [("failed", "blocked")])
+        self.assertEqual((a1.chunk_id, a1.x, a1.y), ("chunk-0", 0, 2))
+        self.assertEqual(await engine.chunk_count(), 1)
+
+    async def test_component_labels_are_built_off_the_loop_after_the_first_same_chunk_move(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        chunk = engine._chunks["chunk-0"]
+        self.assertEqual(len(chunk.components), 0)
+        await engine.ensure_agent("a1")
+        await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-1", target_x=1, target_y=7)
+        self.assertEqual(len(chunk.components), 0)
+        assert chunk.component_build is not None
+        await chunk.component_build
+        self.assertEqual(len(chunk.components), 100)
+
+    async def test_boxed_in_start_is_rejected_but_a_blocked_corridor_is_searched(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        a1 = await engine.ensure_agent("a1")
+        resting = await engine.ensure_agent("r1")
+        chunk = engine._chunks["chunk-0"]
+        # An L-shaped one-cell corridor from (1, 1) east to (8, 1), then south to (8, 8).
+        chunk.walkable[:] = bytes(100)
+        for x in range(1, 9):
+            chunk.walkable[10 + x] = 1
+        for y in range(1, 9):
+            chunk.walkable[y * 10 + 8] = 1
+        chunk.components = tick_engine.component_labels(chunk.walkable, 10, 10)
+        engine._move_agent(chunk, a1, (1, 1))
+
+        engine._move_agent(chunk, resting, (2, 1))
+        with mock.patch.object(tick_engine, "plan_paths") as plan_paths:
+            with self.assertRaises(TickEngineError) as raised:
+                await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-boxed", target_x=8, target_y=8)
+        self.assertEqual(raised.exception.reason, "unreachable")
+        plan_paths.assert_not_called()
+
+        # Further down the corridor the start is not boxed in; only a search can tell.
+        engine._move_agent(chunk, resting, (5, 1))
+        with mock.patch.object(tick_engine, "plan_paths", wraps=tick_engine.plan_paths) as plan_paths:
+            with self.assertRaises(TickEngineError) as raised:
+                await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-corridor", target_x=8, target_y=8)
+        self.assertEqual(raised.exception.reason, "unreachable")
+        plan_paths.assert_called_once()
+
+    async def test_unreachable_targets_are_rejected_without_a_search(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10)
+        a1 = await engine.ensure_agent("a1")
+        chunk = engine._chunks["chunk-0"]
+        # Wall off the right half of the chunk.
+        for y in range(10):
+            chunk.walkable[y * 10 + 5] = 0
+        chunk.components = tick_engine.component_labels(chunk.walkable, 10, 10)
+
+        with mock.patch.object(tick_engine, "plan_paths") as plan_paths:
+            with self.assertRaises(TickEngineError) as raised:
+                await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-far", target_x=7, target_y=3)
+            self.assertEqual(raised.exception.reason, "unreachable")
+
+            # A target boxed in by resting agents is rejected the same way.
+            for idx, cell in enumerate([(2, 3), (4, 3), (3, 2), (3, 4)]):
+                blocker = await engine.ensure_agent(f"b{idx}")
+                engine._move_agent(chunk, blocker, cell)
+            with self.assertRaises(TickEngineError) as raised:
+                await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-boxed", target_x=3, target_y=3)
+            self.assertEqual(raised.exception.reason, "unreachable")
+            plan_paths.assert_not_called()
+        self.assertNotIn("a1", engine._planning)
+
+        # Once one of them has a command of its own, the planner decides.
+        await engine.submit_move_command(agent_id="b0", server_cmd_id="cmd-b0", target_x=2, target_y=6)
+        with mock.patch.object(tick_engine, "plan_paths", wraps=tick_engine.plan_paths) as plan_paths:
+            with self.assertRaises(TickEngineError):
+                await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-near", target_x=3, target_y=3)
+            plan_paths.assert_called_once()
+        self.assertEqual((a1.x, a1.y), (1, 1))
+
+    async def test_flow_mode_shares_one_field_per_goal_and_steps_around_agents(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10, path_mode="flow", flow_field_ttl_ticks=3)
+        queues = {agent_id: await engine.register_listener(agent_id) for agent_id in ("a1", "a2")}
+        a1 = await engine.ensure_agent("a1")
+        a2 = await engine.ensure_agent("a2")
+        resting = await engine.ensure_agent("r1")
+        chunk = engine._chunks["chunk-0"]
+        engine._move_agent(chunk, a2, (7, 7))
+        engine._move_agent(chunk, resting, (2, 1))
+
+        with mock.patch.object(tick_engine, "plan_paths") as plan_paths:
+            await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-a1", target_x=4, target_y=4)
+            await engine.submit_move_command(agent_id="a2", server_cmd_id="cmd-a2", target_x=4, target_y=4)
+        plan_paths.assert_not_called()
+        first, second = engine._agent_active_cmd["a1"], engine._agent_active_cmd["a2"]
+        self.assertIs(first.flow, second.flow)
+        self.assertEqual(len(engine._flow_fields), 1)
+
+        # (2, 1) is the first step down the field; the agent resting there is
+        # passed on the equally short (1, 2) instead.
+        await engine.tick_once()
+        self.assertEqual((a1.x, a1.y), (1, 2))
+
+        for _ in range(10):
+            await engine.tick_once()
+        statuses = {
+            agent_id: [
+                msg["payload"] for msg in [q.get_nowait() for _ in range(q.qsize())] if msg["type"] == "command_result"
+            ]
+            for agent_id, q in queues.items()
+        }
+        self.assertEqual([r["status"] for r in statuses["a1"]], ["completed"])
+        self.assertEqual([(r["status"], r["reason"]) for r in statuses["a2"]], [("failed", "blocked")])
+        self.assertEqual((a1.x, a1.y), (4, 4))
+        self.assertEqual(engine._flow_fields, {})
+
+    async def test_flow_mode_hands_off_a_step_onto_an_edge_goal(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10, path_mode="flow")
+        q = await engine.register_listener("a1")
+        agent = await engine.ensure_agent("a1")
+        await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-east", target_x=9, target_y=1)
+        self.assertIsNotNone(engine._agent_active_cmd["a1"].flow)
+
+        for _ in range(12):
+            await engine.tick_once()
+        messages = [q.get_nowait() for _ in range(q.qsize())]
+        transitions = [msg["payload"] for msg in messages if msg["type"] == "chunk_transition"]
+        self.assertEqual([(t["from"], t["to"]) for t in transitions], [({"x": 9, "y": 1}, {"x": 0, "y": 1})])
+        results = [msg["payload"]["status"] for msg in messages if msg["type"] == "command_result"]
+        self.assertEqual(results, ["completed"])
+        self.assertEqual((agent.chunk_id, agent.x, agent.y), ("chunk-1", 0, 1))
+
+    async def test_landmark_tables_are_bounded_and_reported(self) -> None:
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10, landmark_count=8, landmark_max_bytes=700)
+        chunk = engine._chunks["chunk-0"]
+        self.assertEqual(chunk.landmarks, [])
+        await engine.ensure_agent("a1")
+        await engine.ensure_agent("a2")
+
+        # The first search starts the build off the loop and runs on Manhattan.
+        with mock.patch.object(tick_engine, "plan_paths", wraps=tick_engine.plan_paths) as plan_paths:
+            await engine.submit_move_command(agent_id="a1", server_cmd_id="cmd-1", target_x=8, target_y=7)
+        self.assertEqual(plan_paths.call_args.kwargs["landmarks"], [])
+        self.assertEqual(len(engine._agent_active_cmd["a1"].path), 13)
+        assert chunk.landmark_build is not None
+        await chunk.landmark_build
+
+        # 200 bytes per table: only three fit the budget.
+        self.assertEqual(len(chunk.landmarks), 3)
+        stats = engine.pathfinding_stats()
+        self.assertEqual(stats["landmarks_per_chunk"], 3)
+        self.assertEqual(stats["landmark_bytes_per_chunk"], 600)
+        with mock.patch.object(tick_engine, "plan_paths", wraps=tick_engine.plan_paths) as plan_paths:
+            await engine.submit_move_command(agent_id="a2", server_cmd_id="cmd-2", target_x=7, target_y=8)
+        self.assertIs(plan_paths.call_args.kwargs["landmarks"], chunk.landmarks)
+        self.assertEqual(InMemoryTickEngine(tick_hz=5, width=10, height=10).pathfinding_stats()["landmark_bytes"], 0)
+
+    async def test_default_landmark_budget_is_sized_from_the_chunk(self) -> None:
+        # 80 KB per table on a 200x200 chunk: a fixed 64 KiB budget fits none.
+        capped = InMemoryTickEngine(tick_hz=5, width=200, height=200, landmark_count=2, landmark_max_bytes=64 * 1024)
+        stats = capped.pathfinding_stats()
+        self.assertEqual((stats["landmarks_requested"], stats["landmarks_per_chunk"]), (2, 0))
+
+        sized = InMemoryTickEngine(tick_hz=5, width=200, height=200, landmark_count=2)
+        stats = sized.pathfinding_stats()
+        self.assertEqual((stats["landmarks_requested"], stats["landmarks_per_chunk"]), (2, 2))
+        self.assertEqual(stats["landmark_max_bytes"], 2 * 2 * 200 * 200)
+
+    async def test_pregenerated_neighbors_arrive_with_landmark_tables(self) -> None:
+        executor = _ManualExecutor()
+        engine = InMemoryTickEngine(tick_hz=5, width=10, height=10, chunk_executor=executor, landmark_count=2)
+        engine._request_neighbor(engine._chunks["chunk-0"], "E")
+        await asyncio.sleep(0)
+        executor.run_all()
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        with mock.patch.object(tick_engine, "landmark_tables") as tables:
+            neighbor_id = engine._get_or_create_neighbor(source_chunk_id="chunk-0", direction="E")
+            assert neighbor_id is not None
+            self.assertEqual(len(engine._chunk_landmarks(engine._chunks[neighbor_id])), 2)
+        tables.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
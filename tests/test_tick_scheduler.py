@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+from typing import List
+
+from app.services.tick_scheduler import (
+    OVERRUN_CATCH_UP,
+    OVERRUN_DEGRADE,
+    OVERRUN_SKIP,
+    FixedTimestepScheduler,
+)
+
+
+class _Stop(Exception):
+    pass
+
+
+class _FakeTime:
+    def __init__(self, durations: List[float]) -> None:
+        self.now = 100.0
+        self.durations = list(durations)
+        self.tick_starts: List[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        await asyncio.sleep(0)
+
+    async def tick(self) -> None:
+        if not self.durations:
+            raise _Stop()
+        self.tick_starts.append(self.now)
+        self.now += self.durations.pop(0)
+
+
+def _scheduler(fake: _FakeTime, policy: str, **kwargs) -> FixedTimestepScheduler:
+    return FixedTimestepScheduler(
+        tick_hz=10,
+        tick=fake.tick,
+        overrun_policy=policy,
+        clock=fake.clock,
+        sleep=fake.sleep,
+        **kwargs,
+    )
+
+
+class FixedTimestepSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    async def _run(self, scheduler: FixedTimestepScheduler) -> None:
+        with self.assertRaises(_Stop):
+            await scheduler.run()
+
+    async def test_ticks_stay_on_grid_without_drift(self) -> None:
+        fake = _FakeTime([0.03, 0.07, 0.01, 0.099, 0.0])
+        scheduler = _scheduler(fake, OVERRUN_CATCH_UP)
+        await self._run(scheduler)
+
+        offsets = [round(start - 100.0, 6) for start in fake.tick_starts]
+        self.assertEqual(offsets, [0.0, 0.1, 0.2, 0.3, 0.4])
+        self.assertEqual(scheduler.stats.late_ticks, 0)
+        self.assertEqual(scheduler.stats.skipped_ticks, 0)
+
+    async def test_catch_up_runs_missed_slots_back_to_back_up_to_bound(self) -> None:
+        fake = _FakeTime([0.55, 0.01, 0.01, 0.01, 0.01])
+        scheduler = _scheduler(fake, OVERRUN_CATCH_UP, max_catch_up_ticks=2)
+        await self._run(scheduler)
+
+        offsets = [round(start - 100.0, 6) for start in fake.tick_starts]
+        # Slots 0.1..0.5 are due when the slow tick ends; two run immediately.
+        self.assertEqual(offsets, [0.0, 0.55, 0.56, 0.6, 0.7])
+        # The first catch-up tick also ends past its successor's deadline.
+        self.assertEqual(scheduler.stats.late_ticks, 2)
+        self.assertEqual(scheduler.stats.skipped_ticks, 3)
+        self.assertAlmostEqual(scheduler.stats.max_overrun_seconds, 0.45)
+
+    async def test_other_tasks_run_between_catch_up_ticks(self) -> None:
+        fake = _FakeTime([0.35, 0.01, 0.01, 0.01])
+        scheduler = _scheduler(fake, OVERRUN_CATCH_UP, max_catch_up_ticks=3)
+        turns = [0]
+        seen: List[int] = []
+        tick = fake.tick
+
+        async def counting_tick() -> None:
+            seen.append(turns[0])
+            await tick()
+
+        async def other_task() -> None:
+            while True:
+                turns[0] += 1
+                await asyncio.sleep(0)
+
+        scheduler._tick = counting_tick
+        other = asyncio.ensure_future(other_task())
+        try:
+            await self._run(scheduler)
+        finally:
+            other.cancel()
+
+        # The three catch-up ticks after the slow one each let the other task in.
+        self.assertEqual(scheduler.stats.skipped_ticks, 0)
+        self.assertTrue(all(later > earlier for earlier, later in zip(seen[1:], seen[2:])))
+
+    async def test_skip_resumes_on_next_slot_boundary(self) -> None:
+        fake = _FakeTime([0.25, 0.01, 0.01])
+        scheduler = _scheduler(fake, OVERRUN_SKIP)
+        await self._run(scheduler)
+
+        offsets = [round(start - 100.0, 6) for start in fake.tick_starts]
+        self.assertEqual(offsets, [0.0, 0.3, 0.4])
+        self.assertEqual(scheduler.stats.skipped_ticks, 2)
+
+    async def test_degrade_reanchors_schedule_after_overrun(self) -> None:
+        fake = _FakeTime([0.25, 0.01, 0.01])
+        scheduler = _scheduler(fake, OVERRUN_DEGRADE)
+        await self._run(scheduler)
+
+        offsets = [round(start - 100.0, 6) for start in fake.tick_starts]
+        self.assertEqual(offsets, [0.0, 0.25, 0.35])
+        self.assertEqual(scheduler.stats.late_ticks, 1)
+        self.assertEqual(scheduler.stats.skipped_ticks, 0)
+
+    async def test_snapshot_reports_effective_rate(self) -> None:
+        fake = _FakeTime([0.01] * 10)
+        scheduler = _scheduler(fake, OVERRUN_CATCH_UP)
+        await self._run(scheduler)
+        fake.now = 101.0
+
+        stats = scheduler.snapshot()
+        self.assertEqual(stats["ticks"], 10)
+        self.assertAlmostEqual(stats["effective_tick_hz"], 10.0)
+        self.assertEqual(stats["late_ticks"], 0)
+        self.assertEqual(stats["target_tick_hz"], 10.0)
+
+    def test_unknown_policy_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            _scheduler(_FakeTime([]), "sometimes")
+
+
+if __name__ == "__main__":
+    unittest.main()